@@ -125,8 +125,10 @@ def run_straddle_analysis():
         logger.info("\n📊 PHASE 1: Récupération des données")
         print("\n📊 Récupération des données de marché...")
         
+        # Seuls les indicateurs lus par la stratégie sont calculés
+        strategy = StraddleStrategy()
         data_manager = DataManager()
-        market_data = data_manager.get_market_data()
+        market_data = data_manager.get_market_data(strategy.required_features())
         
         if market_data.empty:
             logger.error("❌ Aucune donnée récupérée")
@@ -137,7 +139,7 @@ def run_straddle_analysis():
         logger.info(f"✅ Données récupérées: {data_summary}")
         
         # Données pour backtest
-        backtest_data = data_manager.get_backtest_data()
+        backtest_data = data_manager.get_backtest_data(strategy.required_features())
         if backtest_data.empty:
             logger.error("❌ Aucune donnée pour la période de backtest")
             return None
@@ -148,7 +150,6 @@ def run_straddle_analysis():
         logger.info("\n🎯 PHASE 2: Exécution de la stratégie")
         print("\n🎯 Exécution du backtest straddle...")
         
-        strategy = StraddleStrategy()
         results = strategy.run_backtest(backtest_data)
         
         # Phase 3: Analyse des résultats
@@ -0,0 +1,520 @@
+# Backtest groupé de plusieurs configurations en une seule passe sur les barres
+# État des positions en matrices (K configurations x MAX_POSITIONS slots),
+# revalorisation partagée par barre d'entrée et sorties calculées d'avance
+
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Sequence
+
+from .config import *
+from .position_book import (
+    CONFIDENCE_LEVELS, EXIT_REASONS, SECONDS_PER_YEAR,
+    HOLD, TAKE_PROFIT, STOP_LOSS, TIME_DECAY, TIMEOUT, VOL_COLLAPSE
+)
+from .straddle_strategy import StraddleStrategy, TradeResult
+
+# Paramètres pouvant différer entre les configurations d'un même lot
+# (seuil d'entrée et règles de sortie); tous les autres doivent être égaux
+BATCH_PARAMETERS = (
+    'MIN_SIGNAL_QUALITY',
+    'TAKE_PROFIT_MULTIPLIER',
+    'STOP_LOSS_MULTIPLIER',
+    'TRADE_TIMEOUT_HOURS'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def batch_key(config: StrategyConfig) -> StrategyConfig:
+    """Configuration sans les paramètres de lot: égale pour des configurations groupables"""
+    return config.replace(**{name: None for name in BATCH_PARAMETERS})
+
+
+class _EntryPath:
+    """
+    Chemin de prix partagé par les positions ouvertes à une même barre
+
+    Les positions ouvertes à la barre b, quelle que soit leur configuration,
+    ont le même strike (close[b]) et la même échéance: leur prix unitaire
+    sur les barres b+1 à last est calculé une seule fois. Le PnL d'une
+    position n'en dépend plus que par son nombre de contrats, et les règles
+    de sortie de chaque configuration deviennent des seuils sur ce chemin.
+    """
+
+    def __init__(
+        self,
+        strategy: StraddleStrategy,
+        bar: int,
+        last: int,
+        timestamps_ns: np.ndarray,
+        expiry_ns: np.ndarray,
+        close: np.ndarray,
+        volatility: np.ndarray
+    ):
+        config = strategy.config
+        self.bar = bar
+        bars = np.arange(bar + 1, last + 1)
+
+        # Mêmes expressions que la revalorisation barre par barre
+        self.time_to_expiry = np.maximum(0.001, (expiry_ns[bar] - timestamps_ns[bars]) / 1e9 / SECONDS_PER_YEAR)
+        self.elapsed_hours = (timestamps_ns[bars] - timestamps_ns[bar]) / 1e9 / 3600
+        pricing = strategy.price_straddle_book(close[bars], close[bar], volatility[bars], self.time_to_expiry)
+        self.straddle_price = pricing['straddle_price']
+        self.time_value = pricing['time_value']
+        self.low_time_value = (
+            self.time_value / self.straddle_price < 0.3 if config.dynamic_stop_loss else None
+        )
+        self.vol_collapse = volatility[bars] / volatility[bar] < 0.4
+        self.min_time_to_expiry = config.min_time_to_expiry
+
+        # Première barre de hedge (un seul hedge actif par position)
+        self.hedge_bar = np.iinfo(np.int64).max
+        if config.enable_hedging:
+            price_move = (close[bars] - close[bar]) / close[bar]
+            hits = np.flatnonzero(np.abs(price_move) >= config.hedge_threshold)
+            if len(hits):
+                self.hedge_bar = bar + 1 + int(hits[0])
+        self._percentages: Dict[int, np.ndarray] = {}
+
+    def percentage(self, contracts: int, premium: float) -> np.ndarray:
+        """PnL en % d'une position de contracts contrats sur tout le chemin"""
+        if contracts not in self._percentages:
+            values = self.straddle_price * contracts
+            self._percentages[contracts] = ((values - premium) / premium) * 100
+        return self._percentages[contracts]
+
+    def first_exits(
+        self,
+        contracts: int,
+        premium: float,
+        take_profit: np.ndarray,
+        stop_loss: np.ndarray,
+        timeout: np.ndarray,
+        strict: bool,
+        start: int
+    ) -> np.ndarray:
+        """
+        Première barre >= start où une règle de sortie se déclenche
+
+        Une position par configuration (seuils en arrays). Les seuils sont
+        comparés aux extrema cumulés du PnL (recherche dichotomique), avec
+        exactement les expressions de la revalorisation barre par barre.
+
+        Args:
+            contracts, premium: Taille et prime, communes aux positions
+            take_profit, stop_loss: Seuils en % de chaque configuration
+            timeout: Durée maximale en heures (confiance du signal incluse)
+            strict: Stop loss resserré des pertes consécutives
+            start: Première barre évaluée
+
+        Returns:
+            Barres de sortie, last + 1 si aucune règle ne se déclenche
+        """
+        offset = start - self.bar - 1
+        percentage = self.percentage(contracts, premium)[offset:]
+        first = np.searchsorted(np.maximum.accumulate(percentage), take_profit)
+
+        # Stop loss: seuil différent selon la part de valeur temps de la barre
+        if self.low_time_value is None:
+            thresholds = ((stop_loss, None),)
+        else:
+            low_time_value = self.low_time_value[offset:]
+            thresholds = ((stop_loss * 0.8, low_time_value), (stop_loss, ~low_time_value))
+        for threshold, mask in thresholds:
+            if strict and mask is not None:
+                threshold = threshold * 0.7
+            running = percentage if mask is None else np.where(mask, percentage, np.inf)
+            first = np.minimum(first, np.searchsorted(-np.minimum.accumulate(running), -threshold))
+
+        # Time decay et effondrement de la volatilité: communs aux configurations
+        common = np.flatnonzero(
+            ((self.time_to_expiry[offset:] < self.min_time_to_expiry) & (percentage < -30))
+            | self.vol_collapse[offset:]
+        )
+        if len(common):
+            first = np.minimum(first, common[0])
+        first = np.minimum(first, np.searchsorted(self.elapsed_hours[offset:], timeout))
+        return start + first
+
+    def at(self, bar: int) -> int:
+        """Indice de la barre dans le chemin"""
+        return bar - self.bar - 1
+
+
+def run_batch_backtest(data: pd.DataFrame, configs: Sequence[StrategyConfig]) -> List[Dict[str, Any]]:
+    """
+    Backtest de K configurations en une seule passe sur les barres
+
+    Mêmes règles et mêmes résultats que StraddleStrategy.run_backtest pour
+    chaque configuration. Les critères d'entrée et le pricing des entrées
+    sont calculés une fois par barre pour tout le lot. Les positions ouvertes
+    à la même barre partagent strike et échéance: leur revalorisation est un
+    seul chemin de prix (_EntryPath), calculé à l'entrée, sur lequel la
+    première sortie de chaque position se lit par seuils. La boucle ne
+    s'arrête qu'aux sorties prévues et aux barres où une configuration peut
+    entrer (seuil de qualité, place et capital); seules les sorties des
+    configurations concernées y sont évaluées.
+
+    Les configurations ne peuvent différer que par BATCH_PARAMETERS.
+
+    Args:
+        data: Données de marché avec indicateurs (DataManager)
+        configs: Configurations du lot
+
+    Returns:
+        Liste alignée sur configs de dicts avec 'trades' et 'performance_metrics'
+    """
+    configs = list(configs)
+    if not configs:
+        return []
+    base = configs[0]
+    key = batch_key(base)
+    if any(batch_key(config) != key for config in configs[1:]):
+        raise ValueError(f"Configurations non groupables: seuls {BATCH_PARAMETERS} peuvent différer")
+
+    n_configs = len(configs)
+    n_bars = len(data)
+    strategy = StraddleStrategy(base)
+    logger.debug(f"🧮 Backtest groupé de {n_configs} configurations sur {n_bars} barres")
+
+    # Critères d'entrée communs: seul le seuil de qualité dépend de la configuration
+    features = strategy.compute_signal_features(data)
+    signal_quality = features['signal_quality'].to_numpy(dtype=np.float64)
+    confidence_codes = np.array(
+        [CONFIDENCE_LEVELS.index(level) for level in features['confidence']], dtype=np.int8
+    )
+    timestamps_ns = np.ascontiguousarray(data.index.as_unit('ns').asi8, dtype=np.int64)
+    tz = getattr(data.index, 'tz', None)
+    close = np.ascontiguousarray(data['close'].to_numpy(dtype=np.float64))
+    volatility = np.ascontiguousarray(data['volatility'].to_numpy(dtype=np.float64))
+    expiry_ns = timestamps_ns + int(base.default_expiry_days * 86400 * 10**9)
+
+    # Paramètres par configuration
+    min_signal_quality = np.array([config.min_signal_quality for config in configs], dtype=np.float64)
+    take_profit_threshold = (np.array([config.take_profit_multiplier for config in configs]) - 1) * 100
+    stop_loss_threshold = -np.array([config.stop_loss_multiplier for config in configs], dtype=np.float64) * 100
+    timeout_hours = np.array([config.trade_timeout_hours for config in configs], dtype=np.float64)
+    lowest_quality = float(min_signal_quality.min())
+
+    # Paramètres communs au lot
+    initial_capital = base.initial_capital
+    max_risk_per_trade = strategy.max_risk_per_trade
+    max_positions = max(1, base.max_positions)
+    entry_time_to_expiry = base.default_expiry_days / 365.25
+    high_confidence = CONFIDENCE_LEVELS.index('HIGH')
+    # Durée couverte par un chemin: le plus long timeout (confiance haute), plus une barre
+    path_span_ns = int(float(timeout_hours.max()) * 1.5 * 3600 * 10**9) + 1
+
+    # État des configurations
+    capital = np.full(n_configs, initial_capital, dtype=np.float64)
+    consecutive_losses = np.zeros(n_configs, dtype=np.int64)
+    active = np.ones(n_configs, dtype=bool)
+    last_event = np.full(n_configs, -1, dtype=np.int64)
+    next_exit = np.full(n_configs, n_bars, dtype=np.int64)
+    next_entry = np.full(n_configs, n_bars, dtype=np.int64)
+    trades: List[List[TradeResult]] = [[] for _ in range(n_configs)]
+
+    # Positions: slots alignés à gauche dans l'ordre d'ouverture, entry_bar -1 = vide
+    shape = (n_configs, max_positions)
+    entry_bar = np.full(shape, -1, dtype=np.int64)
+    contracts = np.zeros(shape, dtype=np.int64)
+    premium_paid = np.zeros(shape, dtype=np.float64)
+    hedge_count = np.zeros(shape, dtype=np.int64)
+    current_value = np.zeros(shape, dtype=np.float64)
+    unrealized_pnl = np.zeros(shape, dtype=np.float64)
+    pnl_percentage = np.zeros(shape, dtype=np.float64)
+    position_count = np.zeros(n_configs, dtype=np.int64)
+    # Première sortie de chaque position sans et avec le stop loss strict:
+    # un stop loss normal atteint l'est aussi au seuil strict (plus serré),
+    # la sortie normale calculée à l'entrée reste donc valable après un
+    # passage en régime strict
+    normal_exit = np.full(shape, n_bars, dtype=np.int64)
+    position_exit = np.full(shape, n_bars, dtype=np.int64)
+    matrices = (entry_bar, contracts, premium_paid, hedge_count, current_value, unrealized_pnl, pnl_percentage)
+    slot_matrices = matrices + (normal_exit, position_exit)
+    paths: Dict[int, _EntryPath] = {}
+
+    def position_timeout(k, bar):
+        return timeout_hours[k] * 1.5 if confidence_codes[bar] == high_confidence else timeout_hours[k]
+
+    def revalue(rows, slots, bar):
+        """Revalorise des positions à une barre depuis leurs chemins"""
+        bars = entry_bar[rows, slots]
+        unique_bars, inverse = np.unique(bars, return_inverse=True)
+        entry_paths = [paths[b] for b in unique_bars.tolist()]
+        offsets = [path.at(bar) for path in entry_paths]
+        straddle_price = np.array([path.straddle_price[o] for path, o in zip(entry_paths, offsets)])[inverse]
+        time_value = np.array([path.time_value[o] for path, o in zip(entry_paths, offsets)])[inverse]
+        time_to_expiry = np.array([path.time_to_expiry[o] for path, o in zip(entry_paths, offsets)])[inverse]
+        elapsed_hours = np.array([path.elapsed_hours[o] for path, o in zip(entry_paths, offsets)])[inverse]
+        hedge_bar = np.array([path.hedge_bar for path in entry_paths])[inverse]
+
+        values = straddle_price * contracts[rows, slots]
+        pnl = values - premium_paid[rows, slots]
+        percentage = (pnl / premium_paid[rows, slots]) * 100
+        current_value[rows, slots] = values
+        unrealized_pnl[rows, slots] = pnl
+        pnl_percentage[rows, slots] = percentage
+
+        # Hedges déclenchés depuis l'entrée (un seul hedge actif par position)
+        hedged = (hedge_bar <= bar) & (hedge_count[rows, slots] == 0)
+        hedge_count[rows[hedged], slots[hedged]] += 1
+        return bars, straddle_price, time_value, time_to_expiry, elapsed_hours, percentage
+
+    def schedule(k, start):
+        """Prochaine sortie des positions d'une configuration selon son régime de stop loss"""
+        n_open = int(position_count[k])
+        if consecutive_losses[k] >= 2:
+            for slot in range(n_open):
+                path = paths[int(entry_bar[k, slot])]
+                position_exit[k, slot] = path.first_exits(
+                    int(contracts[k, slot]), float(premium_paid[k, slot]),
+                    take_profit_threshold[k:k + 1], stop_loss_threshold[k:k + 1],
+                    np.array([position_timeout(k, path.bar)]), True, start
+                )[0]
+        else:
+            position_exit[k, :n_open] = normal_exit[k, :n_open]
+        next_exit[k] = position_exit[k, :n_open].min() if n_open else n_bars
+
+    # Barres d'entrée possible par seuil de qualité distinct
+    quality_levels, level_of_config = np.unique(min_signal_quality, return_inverse=True)
+    entry_bars = []
+    for level in quality_levels.tolist():
+        bars = np.flatnonzero(signal_quality >= level)
+        entry_bars.append(bars[bars >= 100])
+
+    def schedule_entries(ks, after):
+        """Prochaine barre d'entrée possible (seuil, place et capital) de configurations"""
+        next_entry[ks] = n_bars
+        ks = ks[(position_count[ks] < max_positions) & (capital[ks] > max_risk_per_trade)]
+        for level, bars in enumerate(entry_bars):
+            group = ks[level_of_config[ks] == level]
+            if len(group):
+                following = int(np.searchsorted(bars, after, side='right'))
+                next_entry[group] = bars[following] if following < len(bars) else n_bars
+
+    schedule_entries(np.arange(n_configs), 99)
+    i = 100
+    last_visit = i
+    while i < n_bars:
+        last_visit = i
+        current_ns = int(timestamps_ns[i])
+        current_price = float(close[i])
+        current_vol = float(volatility[i])
+        quality = float(signal_quality[i])
+
+        # Arrêt du trading par configuration (mêmes règles que should_stop_trading);
+        # l'état d'une configuration ne change qu'aux barres visitées
+        daily_loss = (initial_capital - capital) / initial_capital
+        active &= ~(
+            (consecutive_losses >= base.max_consecutive_losses)
+            | (daily_loss > base.max_daily_loss)
+            | (capital < max_risk_per_trade * 2)
+        )
+        if not active.any():
+            break
+
+        # Sorties prévues à cette barre: seules ces configurations sont évaluées
+        touched = np.flatnonzero(active & ((next_exit == i) | (next_entry == i)))
+        due = active & (next_exit == i)
+        rows, slots = np.nonzero((entry_bar >= 0) & due[:, None])
+        if len(rows):
+            bars, straddle_price, time_value, time_to_expiry, elapsed_hours, percentage = revalue(rows, slots, i)
+
+            # Règles de sortie (mêmes priorités que PositionBook.evaluate_exits),
+            # stop loss évalué avec et sans le seuil strict des pertes consécutives
+            take_profit = percentage >= take_profit_threshold[rows]
+            sl_threshold = stop_loss_threshold[rows]
+            if base.dynamic_stop_loss:
+                time_decay_factor = time_value / straddle_price
+                sl_threshold = np.where(time_decay_factor < 0.3, sl_threshold * 0.8, sl_threshold)
+                strict_threshold = sl_threshold * 0.7
+            else:
+                strict_threshold = sl_threshold
+            time_decay = (time_to_expiry < base.min_time_to_expiry) & (percentage < -30)
+            timeout = elapsed_hours >= np.where(
+                confidence_codes[bars] == high_confidence, timeout_hours[rows] * 1.5, timeout_hours[rows]
+            )
+            vol_collapse = current_vol / volatility[bars] < 0.4
+
+            # Sorties hors stop loss communes aux deux seuils (np.where emboîtés,
+            # bien moins coûteux que np.select sur des milliers de positions)
+            other_actions = np.where(time_decay, TIME_DECAY, np.where(
+                timeout, TIMEOUT, np.where(vol_collapse, VOL_COLLAPSE, HOLD)))
+            actions = np.where(take_profit, TAKE_PROFIT, np.where(
+                percentage <= sl_threshold, STOP_LOSS, other_actions))
+            strict_actions = np.where(take_profit, TAKE_PROFIT, np.where(
+                percentage <= strict_threshold, STOP_LOSS, other_actions))
+
+            exit_time = pd.Timestamp(current_ns, tz=tz)
+            for k in np.flatnonzero(due).tolist():
+                start, end = np.searchsorted(rows, [k, k + 1]).tolist()
+                kept = []
+                # Clôtures dans l'ordre d'ouverture: les pertes consécutives
+                # de la configuration choisissent le seuil de stop loss
+                for cell in range(start, end):
+                    action = int(strict_actions[cell] if consecutive_losses[k] >= 2 else actions[cell])
+                    slot = int(slots[cell])
+                    if action == HOLD:
+                        kept.append(slot)
+                        continue
+                    trades[k].append(_close_slot(
+                        capital, consecutive_losses, matrices, k, slot, timestamps_ns, close, tz,
+                        current_price, exit_time, action,
+                        float(elapsed_hours[cell]) if action in (TAKE_PROFIT, STOP_LOSS, TIMEOUT) else 0
+                    ))
+                n_kept = len(kept)
+                for matrix in slot_matrices:
+                    matrix[k, :n_kept] = matrix[k, kept]
+                entry_bar[k, n_kept:] = -1
+                position_count[k] = n_kept
+                last_event[k] = i
+                schedule(k, i + 1)
+
+        # Nouvelles positions: pricing d'entrée commun, sizing par configuration
+        # (hors des barres prévues, aucune configuration ne peut entrer)
+        if quality >= lowest_quality:
+            entering = (
+                active
+                & (quality >= min_signal_quality)
+                & (position_count < max_positions)
+                & (capital > max_risk_per_trade)
+            )
+            if entering.any():
+                straddle_price = strategy.simulate_straddle_price(
+                    current_price, current_price, current_vol, entry_time_to_expiry
+                )['straddle_price']
+                base_contracts = int(max_risk_per_trade / straddle_price)
+                if base.adaptive_position_sizing:
+                    adjustment = np.where(consecutive_losses >= 2, 0.5, 1.2 if quality > 0.85 else 1.0)
+                    sizes = (base_contracts * adjustment).astype(np.int64)
+                else:
+                    sizes = np.full(n_configs, base_contracts, dtype=np.int64)
+                sizes = np.clip(sizes, 1, 20)
+                premiums = straddle_price * sizes
+                entering &= (premiums <= capital) & (premiums <= max_risk_per_trade)
+
+                opened = np.flatnonzero(entering)
+                if len(opened):
+                    slot = position_count[opened]
+                    entry_bar[opened, slot] = i
+                    contracts[opened, slot] = sizes[opened]
+                    premium_paid[opened, slot] = premiums[opened]
+                    hedge_count[opened, slot] = 0
+                    current_value[opened, slot] = premiums[opened]
+                    unrealized_pnl[opened, slot] = 0.0
+                    pnl_percentage[opened, slot] = 0.0
+                    capital[opened] -= premiums[opened]
+                    position_count[opened] += 1
+                    last_event[opened] = i
+
+                    # Chemin de la barre d'entrée et première sortie de chaque position
+                    last = min(n_bars - 1, int(np.searchsorted(timestamps_ns, current_ns + path_span_ns)))
+                    path = paths[i] = _EntryPath(
+                        strategy, i, last, timestamps_ns, expiry_ns, close, volatility
+                    )
+                    timeouts = position_timeout(opened, i)
+                    strict = consecutive_losses[opened] >= 2
+                    for size in np.unique(sizes[opened]).tolist():
+                        group = sizes[opened] == size
+                        premium = float(premiums[opened[group][0]])
+                        normal_exit[opened[group], slot[group]] = path.first_exits(
+                            size, premium, take_profit_threshold[opened[group]],
+                            stop_loss_threshold[opened[group]], timeouts[group], False, i + 1
+                        )
+                        strict_group = group & strict
+                        if strict_group.any():
+                            position_exit[opened[strict_group], slot[strict_group]] = path.first_exits(
+                                size, premium, take_profit_threshold[opened[strict_group]],
+                                stop_loss_threshold[opened[strict_group]], timeouts[strict_group], True, i + 1
+                            )
+                    normal_group = ~strict
+                    position_exit[opened[normal_group], slot[normal_group]] = \
+                        normal_exit[opened[normal_group], slot[normal_group]]
+                    next_exit[opened] = np.minimum(next_exit[opened], position_exit[opened, slot])
+
+        # Prochaine barre visitée: sortie prévue ou entrée possible
+        schedule_entries(touched, i)
+        i = int(min(next_exit[active].min(), next_entry[active].min()))
+
+    # Un changement d'état à la dernière barre visitée n'est constaté qu'à la suivante
+    if last_visit < n_bars - 1:
+        daily_loss = (initial_capital - capital) / initial_capital
+        active &= ~(
+            (consecutive_losses >= base.max_consecutive_losses)
+            | (daily_loss > base.max_daily_loss)
+            | (capital < max_risk_per_trade * 2)
+        )
+
+    # Valeur des positions restantes: à la dernière barre pour les configurations
+    # actives, à leur dernier événement pour celles arrêtées
+    rows, slots = np.nonzero(entry_bar >= 0)
+    valuation_bar = np.where(active, n_bars - 1, last_event)[rows]
+    revalued = valuation_bar > entry_bar[rows, slots]
+    for bar in np.unique(valuation_bar[revalued]).tolist():
+        at_bar = revalued & (valuation_bar == bar)
+        revalue(rows[at_bar], slots[at_bar], bar)
+
+    # Clôture des positions restantes et métriques (comme run_backtest)
+    final_time = data.index[-1]
+    final_price = data.iloc[-1]['close']
+    results = []
+    for k, config in enumerate(configs):
+        n_open = int(position_count[k])
+        for slot in range(n_open):
+            trades[k].append(_close_slot(
+                capital, consecutive_losses, matrices, k, slot, timestamps_ns, close, tz,
+                final_price, final_time, TIMEOUT, 0
+            ))
+        # Les positions clôturées en fin de backtest restent comptées dans le
+        # capital final, comme dans _calculate_final_metrics
+        final_capital = float(capital[k]) + sum(current_value[k, :n_open].tolist())
+        results.append({
+            'trades': trades[k],
+            'performance_metrics': StraddleStrategy(config).compute_performance_metrics(trades[k], final_capital)
+        })
+    return results
+
+
+def _close_slot(
+    capital: np.ndarray,
+    consecutive_losses: np.ndarray,
+    matrices,
+    k: int,
+    slot: int,
+    timestamps_ns: np.ndarray,
+    close: np.ndarray,
+    tz,
+    exit_price: float,
+    exit_time,
+    action: int,
+    holding_time: float
+) -> TradeResult:
+    """Clôture la position d'un slot (mêmes règles que StraddleStrategy._close_position)"""
+    entry_bar, contracts, premium_paid, hedge_count, current_value, unrealized_pnl, pnl_percentage = matrices
+    value = float(current_value[k, slot])
+    pnl = float(unrealized_pnl[k, slot])
+
+    capital[k] += value
+    if pnl > 0:
+        consecutive_losses[k] = 0
+    else:
+        consecutive_losses[k] += 1
+
+    bar = int(entry_bar[k, slot])
+    return TradeResult(
+        entry_time=pd.Timestamp(int(timestamps_ns[bar]), tz=tz),
+        exit_time=exit_time,
+        entry_price=float(close[bar]),
+        exit_price=exit_price,
+        strike=float(close[bar]),
+        premium_paid=float(premium_paid[k, slot]),
+        exit_value=value,
+        pnl=pnl,
+        pnl_percentage=float(pnl_percentage[k, slot]),
+        contracts=int(contracts[k, slot]),
+        exit_reason=EXIT_REASONS[action],
+        holding_time_hours=holding_time,
+        hedge_count=int(hedge_count[k, slot])
+    )
@@ -0,0 +1,39 @@
+# Mode compact des données de marché (StrategyConfig.compact_dtypes)
+# Prix et indicateurs en float32, drapeaux regroupés en bitsets uint8
+
+import numpy as np
+import pandas as pd
+from typing import Sequence
+
+COMPACT_FLOAT = np.dtype(np.float32)
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copie de df avec les colonnes float64 en float32 (moitié de la mémoire)
+
+    Les indicateurs sont calculés en float64 puis seulement stockés en
+    float32 (7 chiffres significatifs): les calculs qui accumulent (capital,
+    PnL, pricing) relisent les colonnes en float64.
+    """
+    return df.astype({name: COMPACT_FLOAT for name, dtype in df.dtypes.items() if dtype == np.float64})
+
+
+def pack_flags(flags: Sequence[np.ndarray]) -> np.ndarray:
+    """Regroupe jusqu'à 8 tableaux booléens dans un bitset uint8 (bit i = flags[i])"""
+    if len(flags) > 8:
+        raise ValueError(f"{len(flags)} drapeaux: 8 au plus par bitset uint8")
+    bits = np.zeros(len(flags[0]) if len(flags) else 0, dtype=np.uint8)
+    for position, flag in enumerate(flags):
+        bits |= np.asarray(flag, dtype=np.uint8) << position
+    return bits
+
+
+def unpack_flag(bits: np.ndarray, position: int) -> np.ndarray:
+    """Drapeau position d'un bitset de pack_flags (tableau booléen)"""
+    return (np.asarray(bits, dtype=np.uint8) >> position) & 1 == 1
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    """Mémoire d'un DataFrame, index et objets Python compris"""
+    return int(df.memory_usage(index=True, deep=True).sum())
@@ -1,15 +1,26 @@
 # Configuration du Bot de Trading Straddle
 # Paramètres optimisés pour rentabilité maximale avec risque contrôlé
 
+import dataclasses
+import hashlib
+
 # =====================================================================================
 # PARAMÈTRES DE BASE
 # =====================================================================================
 
 # Exchange et symbole
-EXCHANGE_ID = 'binance'
+EXCHANGE_ID = 'binance'  # 'fake' / 'fake_binance': exchange local hors ligne (fake_exchange)
 SYMBOL = 'BTC/USDT'
 TIMEFRAME = '1h'
 
+# Paires du mode panel (DataManager.get_panel_data): 20 premières paires USDT
+PANEL_SYMBOLS = (
+    'BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'SOL/USDT', 'XRP/USDT',
+    'DOGE/USDT', 'ADA/USDT', 'TRX/USDT', 'AVAX/USDT', 'LINK/USDT',
+    'DOT/USDT', 'TON/USDT', 'MATIC/USDT', 'LTC/USDT', 'BCH/USDT',
+    'SHIB/USDT', 'UNI/USDT', 'ATOM/USDT', 'XLM/USDT', 'NEAR/USDT'
+)
+
 # =====================================================================================
 # GESTION DES DONNÉES
 # =====================================================================================
@@ -20,6 +31,23 @@ START_DATE = '2023-01-01'
 END_DATE = '2024-12-31'
 DAYS_OF_DATA = 365  # Utilisé si USE_DATE_RANGE=False
 
+# Cache disque des barres OHLCV (seules les barres manquantes sont téléchargées)
+USE_DATA_CACHE = True
+DATA_CACHE_DIR = 'data_cache'
+# Série de base en cache (opt-in, ex: '1m'): TIMEFRAME et ses multiples en
+# sont agrégés localement, sans nouveau téléchargement; None met TIMEFRAME
+# en cache directement (un historique 1m est environ 60 fois plus lourd
+# qu'un historique 1h)
+BASE_TIMEFRAME = None
+
+# Téléchargement de l'historique (fenêtres de 1000 barres en parallèle)
+DOWNLOAD_CONCURRENCY = 8            # Requêtes simultanées maximum
+DOWNLOAD_MAX_RETRIES = 3            # Nouvelles tentatives sur erreur réseau
+
+# Mode compact (opt-in): prix et indicateurs en float32, critères en bitset
+# uint8; capital et PnL restent en float64 (tools/benchmark_compact_dtypes.py)
+COMPACT_DTYPES = False
+
 # Période de backtest (sous-ensemble des données)
 BACKTEST_START_DATE = '2023-06-01'
 BACKTEST_END_DATE = '2024-10-31'
@@ -100,6 +128,7 @@ RSI_FILTER_MAX = 65                # RSI maximum
 # =====================================================================================
 
 OPTIMIZE_PARAMETERS = True         # Optimisation automatique
+BACKTEST_ENGINE = 'numpy'          # Boucle de backtest: 'numpy' (arrays) ou 'pandas' (iloc)
 MAX_SPREAD = 0.002                # Spread maximum autorisé (0.2%)
 MIN_PRICE_MOVEMENT = 0.00005       # Mouvement minimum pour validation
 
@@ -120,27 +149,28 @@ LOGS_DIR = 'logs'                  # Dossier des logs
 # VALIDATION DES PARAMÈTRES
 # =====================================================================================
 
-def validate_config():
-    """Valide la cohérence des paramètres de configuration"""
+def validate_config(config: 'StrategyConfig' = None):
+    """Valide la cohérence des paramètres de configuration (module ou StrategyConfig)"""
+    config = config or StrategyConfig()
     errors = []
     warnings = []
     
     # Vérifications critiques
-    if RISK_PER_TRADE > 0.05:
-        errors.append(f"RISK_PER_TRADE trop élevé: {RISK_PER_TRADE:.1%} > 5%")
+    if config.risk_per_trade > 0.05:
+        errors.append(f"RISK_PER_TRADE trop élevé: {config.risk_per_trade:.1%} > 5%")
     
-    if TAKE_PROFIT_MULTIPLIER <= STOP_LOSS_MULTIPLIER:
+    if config.take_profit_multiplier <= config.stop_loss_multiplier:
         errors.append("TAKE_PROFIT_MULTIPLIER doit être > STOP_LOSS_MULTIPLIER")
     
-    if MAX_POSITIONS < 1:
+    if config.max_positions < 1:
         errors.append("MAX_POSITIONS doit être >= 1")
     
     # Avertissements
-    if VOLATILITY_THRESHOLD < 30:
-        warnings.append(f"VOLATILITY_THRESHOLD très bas: {VOLATILITY_THRESHOLD}%")
+    if config.volatility_threshold < 30:
+        warnings.append(f"VOLATILITY_THRESHOLD très bas: {config.volatility_threshold}%")
     
-    if MAX_HEDGE_RATIO > 0.5:
-        warnings.append(f"MAX_HEDGE_RATIO élevé: {MAX_HEDGE_RATIO:.1%}")
+    if config.max_hedge_ratio > 0.5:
+        warnings.append(f"MAX_HEDGE_RATIO élevé: {config.max_hedge_ratio:.1%}")
     
     return errors, warnings
 
@@ -176,3 +206,112 @@ PROFILES = {
 
 # Profil actuel (changez selon vos préférences de risque)
 CURRENT_PROFILE = 'BALANCED'
+
+# =====================================================================================
+# CONFIGURATION D'UN RUN (IMMUABLE)
+# =====================================================================================
+
+@dataclasses.dataclass(frozen=True)
+class StrategyConfig:
+    """
+    Paramètres d'un run, passés explicitement à StraddleStrategy et DataManager
+
+    Immuable et hashable: plusieurs configurations coexistent dans un même
+    processus (threads, balayages) et digest() sert de clé de cache stable.
+    Les champs reprennent en minuscules les constantes de ce module, qui
+    fournissent les valeurs par défaut.
+    """
+    # Données
+    exchange_id: str = EXCHANGE_ID
+    symbol: str = SYMBOL
+    panel_symbols: tuple = PANEL_SYMBOLS
+    timeframe: str = TIMEFRAME
+    use_date_range: bool = USE_DATE_RANGE
+    start_date: str = START_DATE
+    end_date: str = END_DATE
+    days_of_data: int = DAYS_OF_DATA
+    use_data_cache: bool = USE_DATA_CACHE
+    data_cache_dir: str = DATA_CACHE_DIR
+    base_timeframe: str = BASE_TIMEFRAME
+    download_concurrency: int = DOWNLOAD_CONCURRENCY
+    download_max_retries: int = DOWNLOAD_MAX_RETRIES
+    compact_dtypes: bool = COMPACT_DTYPES
+    backtest_start_date: str = BACKTEST_START_DATE
+    backtest_end_date: str = BACKTEST_END_DATE
+    
+    # Critères d'entrée
+    volatility_threshold: float = VOLATILITY_THRESHOLD
+    min_signal_quality: float = MIN_SIGNAL_QUALITY
+    min_volume_ratio: float = MIN_VOLUME_RATIO
+    max_price_range: float = MAX_PRICE_RANGE
+    
+    # Sorties
+    take_profit_multiplier: float = TAKE_PROFIT_MULTIPLIER
+    stop_loss_multiplier: float = STOP_LOSS_MULTIPLIER
+    trade_timeout_hours: float = TRADE_TIMEOUT_HOURS
+    dynamic_stop_loss: bool = DYNAMIC_STOP_LOSS
+    
+    # Capital et risque
+    initial_capital: float = INITIAL_CAPITAL
+    risk_per_trade: float = RISK_PER_TRADE
+    max_positions: int = MAX_POSITIONS
+    max_daily_loss: float = MAX_DAILY_LOSS
+    max_consecutive_losses: int = MAX_CONSECUTIVE_LOSSES
+    
+    # Hedging
+    enable_hedging: bool = ENABLE_HEDGING
+    hedge_threshold: float = HEDGE_THRESHOLD
+    max_hedge_ratio: float = MAX_HEDGE_RATIO
+    
+    # Options
+    default_expiry_days: int = DEFAULT_EXPIRY_DAYS
+    min_time_to_expiry: float = MIN_TIME_TO_EXPIRY
+    risk_free_rate: float = RISK_FREE_RATE
+    min_volatility: float = MIN_VOLATILITY
+    max_volatility: float = MAX_VOLATILITY
+    
+    # Filtres et sizing
+    adaptive_position_sizing: bool = ADAPTIVE_POSITION_SIZING
+    trend_filter: bool = TREND_FILTER
+    rsi_filter_min: float = RSI_FILTER_MIN
+    rsi_filter_max: float = RSI_FILTER_MAX
+    
+    # Backtest et logging
+    backtest_engine: str = BACKTEST_ENGINE
+    log_level: str = LOG_LEVEL
+    
+    @classmethod
+    def field_names(cls):
+        """Noms des champs, dans l'ordre de déclaration"""
+        return tuple(field.name for field in dataclasses.fields(cls))
+    
+    @classmethod
+    def from_profile(cls, profile: str = None, **overrides) -> 'StrategyConfig':
+        """
+        Configuration d'un profil de PROFILES (CURRENT_PROFILE par défaut)
+        complétée des surcharges du run
+        
+        Les noms de paramètres sont acceptés en minuscules ou comme les
+        constantes du module (TAKE_PROFIT_MULTIPLIER=1.5).
+        """
+        profile = profile or CURRENT_PROFILE
+        if profile not in PROFILES:
+            raise ValueError(f"Profil inconnu: {profile}")
+        return cls().replace(**PROFILES[profile]).replace(**overrides)
+    
+    def replace(self, **overrides) -> 'StrategyConfig':
+        """Copie de la configuration avec des paramètres modifiés"""
+        changes = {name.lower(): value for name, value in overrides.items()}
+        unknown = [name for name in changes if name not in self.field_names()]
+        if unknown:
+            raise ValueError(f"Paramètres de configuration inconnus: {unknown}")
+        return dataclasses.replace(self, **changes)
+    
+    def to_dict(self) -> dict:
+        """Paramètres sous forme de dict {champ: valeur}"""
+        return dataclasses.asdict(self)
+    
+    def digest(self) -> str:
+        """Empreinte stable entre processus et sessions (clé de cache)"""
+        payload = repr(sorted(self.to_dict().items()))
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,179 @@
+# Accumulateur en colonnes des métriques quotidiennes du backtest
+# Remplace la liste de dicts results['daily_pnl'] (un dict par barre)
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator
+
+from .config import *
+
+# Colonnes exportées, dans l'ordre des anciens dicts de results['daily_pnl']
+DAILY_METRICS_COLUMNS = (
+    'timestamp', 'capital', 'positions_value', 'total_value',
+    'total_pnl', 'num_positions', 'num_hedges'
+)
+
+
+class DailyMetrics:
+    """
+    Métriques par barre stockées en arrays NumPy (environ 32 octets par barre)
+
+    Seuls capital, valeur des positions, nombre de positions et de hedges
+    sont stockés; total_value et total_pnl sont recalculés à l'export.
+    Les horodatages sont en int64 nanosecondes UTC avec un fuseau commun.
+
+    Reste compatible avec l'ancienne liste de dicts: len(), itération et
+    indexation renvoient des dicts, et l'égalité avec une liste est permise.
+    """
+
+    def __init__(self, capacity: int = 1024, initial_capital: float = INITIAL_CAPITAL):
+        capacity = max(1, capacity)
+        self.size = 0
+        self.tz = None
+        self.initial_capital = initial_capital
+
+        self.timestamp = np.empty(capacity, dtype=np.int64)
+        self.capital = np.empty(capacity, dtype=np.float64)
+        self.positions_value = np.empty(capacity, dtype=np.float64)
+        self.num_positions = np.empty(capacity, dtype=np.int32)
+        self.num_hedges = np.empty(capacity, dtype=np.int32)
+
+    _COLUMNS = ('timestamp', 'capital', 'positions_value', 'num_positions', 'num_hedges')
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return len(self.timestamp)
+
+    def _reserve(self, size: int):
+        """Agrandit les colonnes (capacité doublée) pour contenir size barres"""
+        capacity = self.capacity
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def append(
+        self,
+        timestamp,
+        capital: float,
+        positions_value: float,
+        num_positions: int,
+        num_hedges: int
+    ):
+        """Ajoute les métriques d'une barre en O(1) amorti"""
+        timestamp = pd.Timestamp(timestamp)
+        if self.size == 0:
+            self.tz = timestamp.tz
+
+        self._reserve(self.size + 1)
+        slot = self.size
+        self.timestamp[slot] = timestamp.value
+        self.capital[slot] = capital
+        self.positions_value[slot] = positions_value
+        self.num_positions[slot] = num_positions
+        self.num_hedges[slot] = num_hedges
+        self.size += 1
+
+    def extend_columns(
+        self,
+        timestamps: np.ndarray,
+        capital: np.ndarray,
+        positions_value: np.ndarray,
+        num_positions: np.ndarray,
+        num_hedges: np.ndarray,
+        tz=None
+    ):
+        """
+        Ajoute un bloc de barres déjà en colonnes (timestamps en int64 ns UTC)
+
+        Utilisé par la boucle d'événements NumPy qui accumule ses propres arrays.
+        """
+        n = len(timestamps)
+        if n == 0:
+            return
+        if self.size == 0:
+            self.tz = tz
+
+        self._reserve(self.size + n)
+        block = slice(self.size, self.size + n)
+        self.timestamp[block] = timestamps
+        self.capital[block] = capital
+        self.positions_value[block] = positions_value
+        self.num_positions[block] = num_positions
+        self.num_hedges[block] = num_hedges
+        self.size += n
+
+    def timestamps(self) -> pd.DatetimeIndex:
+        """Horodatages des barres enregistrées"""
+        index = pd.to_datetime(self.timestamp[:self.size], utc=True)
+        return index.tz_convert(self.tz) if self.tz is not None else index.tz_localize(None)
+
+    def _export_columns(self) -> Dict[str, np.ndarray]:
+        n = self.size
+        total_value = self.capital[:n] + self.positions_value[:n]
+        return {
+            'timestamp': self.timestamps(),
+            'capital': self.capital[:n],
+            'positions_value': self.positions_value[:n],
+            'total_value': total_value,
+            'total_pnl': total_value - self.initial_capital,
+            'num_positions': self.num_positions[:n],
+            'num_hedges': self.num_hedges[:n]
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Exporte les métriques en DataFrame (colonnes DAILY_METRICS_COLUMNS)"""
+        return pd.DataFrame(self._export_columns(), columns=list(DAILY_METRICS_COLUMNS))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        columns = [values.tolist() for values in self._export_columns().values()]
+        for row in zip(*columns):
+            yield dict(zip(DAILY_METRICS_COLUMNS, row))
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(f"Barre {index} hors des métriques ({self.size} barres)")
+
+        capital = float(self.capital[index])
+        positions_value = float(self.positions_value[index])
+        total_value = capital + positions_value
+        return {
+            'timestamp': pd.Timestamp(int(self.timestamp[index]), tz=self.tz),
+            'capital': capital,
+            'positions_value': positions_value,
+            'total_value': total_value,
+            'total_pnl': total_value - self.initial_capital,
+            'num_positions': int(self.num_positions[index]),
+            'num_hedges': int(self.num_hedges[index])
+        }
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DailyMetrics):
+            n = self.size
+            return (
+                n == other.size
+                and self.tz == other.tz
+                and self.initial_capital == other.initial_capital
+                and all(
+                    np.array_equal(getattr(self, name)[:n], getattr(other, name)[:n])
+                    for name in self._COLUMNS
+                )
+            )
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"DailyMetrics({self.size} barres)"
@@ -5,11 +5,20 @@ import ccxt
 import pandas as pd
 import numpy as np
 # import talib  # Remplacé par des calculs pandas/numpy
+import time
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .config import *
+from .ohlcv_cache import OHLCVCache
+from .ohlcv_resampler import can_resample
+from .ohlcv_downloader import download_ohlcv
+from .fake_exchange import create_exchange
+from .indicator_registry import compute_indicators, history_bars, warmup_bars
+from .data_validation import DataQualityReport, validate_ohlcv
+from .compact_dtypes import COMPACT_FLOAT, compact_frame
+from .market_panel import MarketPanel
 
 class DataManager:
     """
@@ -19,64 +28,118 @@ class DataManager:
     - Récupération données historiques
     - Calcul indicateurs techniques
     - Validation et nettoyage des données
-    - Cache pour optimisation
+    - Cache pour optimisation (barres OHLCV conservées sur disque entre
+      les runs, seules les barres manquantes sont téléchargées)
+    - Série de base optionnelle (config.base_timeframe, ex: 1m) en cache:
+      les timeframes plus longs en sont agrégés localement, sans
+      téléchargement; sinon le timeframe de la configuration est en cache
+    - Mode panel (get_panel_data): plusieurs symboles alignés sur une
+      grille commune, indicateurs calculés pour tous en une passe
     """
     
-    def __init__(self):
+    def __init__(self, config: Optional[StrategyConfig] = None):
+        self.config = config or StrategyConfig()
         self._setup_logging()
         self.data_cache = {}
+        self.quality_report: Optional[DataQualityReport] = None
+        self.panel_quality_reports: Dict[str, DataQualityReport] = {}
+        base_timeframe = self.config.base_timeframe
+        self.cache_timeframe = (
+            base_timeframe if base_timeframe and can_resample(base_timeframe, self.config.timeframe)
+            else self.config.timeframe
+        )
+        self.ohlcv_cache = OHLCVCache.shared(
+            self.config.data_cache_dir, self.config.exchange_id, self.config.symbol, self.cache_timeframe
+        ) if self.config.use_data_cache else None
         self.exchange = self._initialize_exchange()
+    
+    def _symbol_cache(self, symbol: str) -> Optional[OHLCVCache]:
+        """Cache disque des barres de symbol (None sans cache)"""
+        if self.ohlcv_cache is None or symbol == self.config.symbol:
+            return self.ohlcv_cache
+        return OHLCVCache.shared(self.config.data_cache_dir, self.config.exchange_id, symbol, self.cache_timeframe)
         
     def _setup_logging(self):
         """Configure le logging"""
         logging.basicConfig(
-            level=getattr(logging, LOG_LEVEL),
+            level=getattr(logging, self.config.log_level),
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         self.logger = logging.getLogger(__name__)
         
     def _initialize_exchange(self) -> Optional[ccxt.Exchange]:
         """
-        Initialise la connexion à l'exchange
+        Initialise la connexion à l'exchange (exchange local hors ligne pour
+        exchange_id 'fake' / 'fake_<exchange>', voir fake_exchange)
         
         Returns:
             ccxt.Exchange: Instance de l'exchange ou None si erreur
         """
         try:
-            exchange = ccxt.binance({
+            exchange = create_exchange(self.config.exchange_id, {
                 'enableRateLimit': True,
                 'timeout': 30000,
                 'options': {
                     'defaultType': 'spot'
                 }
             })
-            self.logger.info(f"✅ Connexion {EXCHANGE_ID} initialisée")
+            self.logger.info(f"✅ Connexion {self.config.exchange_id} initialisée")
             return exchange
         except Exception as e:
             self.logger.error(f"❌ Erreur connexion exchange: {e}")
             return None
     
-    def get_market_data(self) -> pd.DataFrame:
+    def get_market_data(self, features: Optional[Sequence[str]] = None,
+                        start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
         """
         Récupère les données de marché avec indicateurs
         
+        Args:
+            features: Colonnes lues par la stratégie
+                (StraddleStrategy.required_features()): seuls ces
+                indicateurs sont calculés et seule leur chauffe est écartée;
+                tous les indicateurs par défaut
+            start, end: Fenêtre [start, end) à renvoyer, dans la période de
+                la configuration (toute la période par défaut): seules ses
+                barres et les history_bars(features) barres qui la
+                précèdent sont lues, agrégées et passées aux indicateurs
+        
         Returns:
-            pd.DataFrame: Données avec indicateurs techniques
+            pd.DataFrame: Données avec indicateurs techniques (float32 si
+            config.compact_dtypes)
         """
+        # Indicateur inconnu: erreur de l'appelant, signalée avant tout téléchargement
+        warmup = warmup_bars(features)
+        
         try:
-            self.logger.info(f"📊 Récupération données {SYMBOL} ({TIMEFRAME})")
+            self.logger.info(f"📊 Récupération données {self.config.symbol} ({self.config.timeframe})")
             
-            # Récupération des données brutes
-            raw_data = self._fetch_ohlcv_data()
+            # Récupération des données brutes (fenêtre et sa chauffe seulement)
+            start_ts = end_ts = None
+            if start is not None:
+                bar_ms = ccxt.Exchange.parse_timeframe(self.config.timeframe) * 1000
+                start_ts = int(pd.Timestamp(start).timestamp() * 1000) - history_bars(features) * bar_ms
+            if end is not None:
+                end_ts = int(pd.Timestamp(end).timestamp() * 1000)
+            raw_data = self._fetch_ohlcv_data(start_ts=start_ts, end_ts=end_ts)
             if raw_data.empty:
                 return pd.DataFrame()
             
-            # Ajout des indicateurs
-            data = self._add_technical_indicators(raw_data)
+            # Ajout des indicateurs, barres de chauffe écartées
+            data = self._add_technical_indicators(raw_data, features)
+            data = data.iloc[warmup:]
+            if start is not None:
+                data = data.iloc[data.index.searchsorted(pd.Timestamp(start)):]
+            if end is not None:
+                data = data.iloc[:data.index.searchsorted(pd.Timestamp(end))]
             
             # Validation et nettoyage
             data = self._validate_and_clean_data(data)
             
+            # Stockage compact (float32) une fois les indicateurs calculés en float64
+            if self.config.compact_dtypes:
+                data = compact_frame(data)
+            
             self.logger.info(f"✅ {len(data)} barres récupérées et traitées")
             return data
             
@@ -84,62 +147,121 @@ class DataManager:
             self.logger.error(f"❌ Erreur récupération données: {e}")
             return pd.DataFrame()
     
-    def _fetch_ohlcv_data(self) -> pd.DataFrame:
+    def _fetch_ohlcv_data(self, symbol: Optional[str] = None,
+                          start_ts: Optional[int] = None, end_ts: Optional[int] = None) -> pd.DataFrame:
         """
         Récupère les données OHLCV brutes
         
+        Args:
+            symbol: Paire à récupérer (config.symbol par défaut)
+            start_ts, end_ts: Bornes en ms restreignant la période de la
+                configuration (aucune par défaut)
+        
         Returns:
             pd.DataFrame: Données OHLCV brutes
         """
-        if not self.exchange:
+        if not self.exchange and self.ohlcv_cache is None:
             raise Exception("Exchange non initialisé")
         
-        if USE_DATE_RANGE:
-            return self._fetch_date_range_data()
+        symbol = symbol or self.config.symbol
+        if self.config.use_date_range:
+            return self._fetch_date_range_data(symbol, start_ts, end_ts)
         else:
-            return self._fetch_recent_data()
+            return self._fetch_recent_data(symbol, start_ts, end_ts)
     
-    def _fetch_date_range_data(self) -> pd.DataFrame:
+    def _fetch_date_range_data(self, symbol: str, start_ts: Optional[int] = None,
+                               end_ts: Optional[int] = None) -> pd.DataFrame:
         """Récupère les données pour une période spécifique"""
-        start_ts = int(pd.to_datetime(START_DATE).timestamp() * 1000)
-        end_ts = int(pd.to_datetime(END_DATE).timestamp() * 1000)
+        start = int(pd.to_datetime(self.config.start_date).timestamp() * 1000)
+        end = int(pd.to_datetime(self.config.end_date).timestamp() * 1000)
+        start_ts = start if start_ts is None else max(start, start_ts)
+        end_ts = end if end_ts is None else min(end, end_ts)
         
-        all_data = []
-        current_ts = start_ts
+        self.logger.info(f"📅 Récupération période: {pd.to_datetime(start_ts, unit='ms')} → "
+                        f"{pd.to_datetime(end_ts, unit='ms')}")
         
-        self.logger.info(f"📅 Récupération période: {START_DATE} → {END_DATE}")
+        if self.ohlcv_cache is not None:
+            return self._fetch_cached_range(symbol, start_ts, end_ts)
         
-        while current_ts < end_ts:
-            try:
-                chunk = self.exchange.fetch_ohlcv(
-                    SYMBOL, TIMEFRAME, since=current_ts, limit=1000
-                )
-                
-                if not chunk:
-                    break
-                
-                all_data.extend(chunk)
-                current_ts = chunk[-1][0] + 1
-                
-                # Protection contre boucles infinies
-                if len(all_data) > 100000:
-                    self.logger.warning("⚠️ Limite de sécurité atteinte (100k barres)")
-                    break
-                    
-            except Exception as e:
-                self.logger.error(f"❌ Erreur récupération chunk: {e}")
+        all_data, _ = self._download_range(symbol, start_ts, end_ts)
+        return self._convert_to_dataframe(all_data)
+    
+    def _fetch_cached_range(self, symbol: str, start_ts: int, end_ts: int) -> pd.DataFrame:
+        """
+        Récupère une période via le cache disque
+        
+        Seules les plages absentes du cache (fin de période, trous) sont
+        téléchargées puis ajoutées au cache; la barre en cours de formation
+        n'est jamais mise en cache. Sans exchange ou sans réseau, les données
+        déjà en cache sont renvoyées. Le cache contient la série de base
+        (cache_timeframe), agrégée localement vers config.timeframe.
+        """
+        cache = self._symbol_cache(symbol)
+        timeframe_ms = ccxt.Exchange.parse_timeframe(self.config.timeframe) * 1000
+        last_closed_ts = int(time.time() * 1000) // timeframe_ms * timeframe_ms
+        
+        missing = cache.missing_ranges(start_ts, min(end_ts, last_closed_ts))
+        for gap_start, gap_end in missing:
+            if not self.exchange:
+                self.logger.warning("⚠️ Exchange indisponible: utilisation des données en cache uniquement")
+                break
+            self.logger.info(f"🌐 Téléchargement des barres manquantes: "
+                           f"{pd.to_datetime(gap_start, unit='ms')} → {pd.to_datetime(gap_end, unit='ms')}")
+            rows, reached_ts = self._download_range(symbol, gap_start, gap_end, self.cache_timeframe)
+            cache.append(rows, gap_start, reached_ts)
+            if reached_ts < gap_end:
+                self.logger.warning("⚠️ Téléchargement incomplet: utilisation des données en cache")
                 break
         
-        return self._convert_to_dataframe(all_data)
+        if not missing:
+            self.logger.info(f"📂 Période entièrement en cache ({cache.key})")
+        return cache.read(start_ts, end_ts, timeframe=self.config.timeframe)
     
-    def _fetch_recent_data(self) -> pd.DataFrame:
+    def _download_range(self, symbol: str, start_ts: int, end_ts: int,
+                        timeframe: Optional[str] = None) -> Tuple[List[list], int]:
+        """
+        Télécharge les barres de [start_ts, end_ts) par fenêtres de 1000 barres
+        récupérées en parallèle (débit limité, erreurs réseau réessayées),
+        au timeframe de la configuration par défaut
+        
+        Returns:
+            Tuple (barres ccxt, fin en ms de la plage réellement couverte:
+            end_ts sauf interruption)
+        """
+        try:
+            return download_ohlcv(
+                self.exchange, symbol, timeframe or self.config.timeframe, start_ts, end_ts,
+                concurrency=self.config.download_concurrency,
+                max_retries=self.config.download_max_retries
+            )
+        except Exception as e:
+            self.logger.error(f"❌ Erreur récupération données: {e}")
+            return [], start_ts
+    
+    def _fetch_recent_data(self, symbol: str, start_ts: Optional[int] = None,
+                           end_ts: Optional[int] = None) -> pd.DataFrame:
         """Récupère les données récentes"""
-        limit = DAYS_OF_DATA * 24  # Pour timeframe 1h
+        limit = self.config.days_of_data * 24  # Pour timeframe 1h
+        
+        self.logger.info(f"📅 Récupération {self.config.days_of_data} derniers jours")
         
-        self.logger.info(f"📅 Récupération {DAYS_OF_DATA} derniers jours")
+        if self.ohlcv_cache is not None:
+            end = int(time.time() * 1000)
+            start = end - self.config.days_of_data * 86400 * 1000
+            return self._fetch_cached_range(
+                symbol,
+                start if start_ts is None else max(start, start_ts),
+                end if end_ts is None else min(end, end_ts)
+            )
         
-        data = self.exchange.fetch_ohlcv(SYMBOL, TIMEFRAME, limit=limit)
-        return self._convert_to_dataframe(data)
+        data = self._convert_to_dataframe(self.exchange.fetch_ohlcv(symbol, self.config.timeframe, limit=limit))
+        if data.empty:
+            return data
+        if start_ts is not None:
+            data = data[data.index >= pd.to_datetime(start_ts, unit='ms')]
+        if end_ts is not None:
+            data = data[data.index < pd.to_datetime(end_ts, unit='ms')]
+        return data
     
     def _convert_to_dataframe(self, data: list) -> pd.DataFrame:
         """
@@ -159,17 +281,24 @@ class DataManager:
         df.set_index('timestamp', inplace=True)
         
         # Filtrage pour période exacte si demandé
-        if USE_DATE_RANGE:
-            df = df[(df.index >= START_DATE) & (df.index < END_DATE)]
+        if self.config.use_date_range:
+            df = df[(df.index >= self.config.start_date) & (df.index < self.config.end_date)]
         
         return df
     
-    def _add_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_technical_indicators(self, df: pd.DataFrame, features: Optional[Sequence[str]] = None) -> pd.DataFrame:
         """
         Ajoute les indicateurs techniques
         
+        Calcul vectorisé sur tout l'historique; les boucles temps réel
+        utilisent streaming_indicators.StreamingIndicators (mêmes colonnes,
+        mise à jour en O(1) par barre).
+        
         Args:
             df: DataFrame avec données OHLCV
+            features: Colonnes lues par la stratégie (indicator_registry);
+                seules celles-ci et leurs dépendances sont calculées
+                (toutes par défaut)
             
         Returns:
             pd.DataFrame: DataFrame avec indicateurs
@@ -178,70 +307,31 @@ class DataManager:
             return df
         
         self.logger.info("📊 Calcul des indicateurs techniques")
+        return compute_indicators(df, features)
+    
+    def validate_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, DataQualityReport]:
+        """
+        Valide les données en une passe (data_validation.validate_ohlcv)
         
-        # Conversion en arrays numpy pour les calculs
-        high = df['high'].values
-        low = df['low'].values
-        close = df['close'].values
-        volume = df['volume'].values
-        
-        # 1. Volatilité et ATR (Average True Range) - version pandas
-        df['tr1'] = df['high'] - df['low']
-        df['tr2'] = abs(df['high'] - df['close'].shift())
-        df['tr3'] = abs(df['low'] - df['close'].shift())
-        df['true_range'] = df[['tr1', 'tr2', 'tr3']].max(axis=1)
-        df['atr'] = df['true_range'].rolling(14).mean()
-        df.drop(['tr1', 'tr2', 'tr3', 'true_range'], axis=1, inplace=True)
-        
-        df['returns'] = df['close'].pct_change()
-        df['volatility'] = df['returns'].rolling(20).std() * np.sqrt(365 * 24)
-        df['vol_percentile'] = df['volatility'].rolling(100).rank(pct=True) * 100
-        
-        # 2. RSI (Relative Strength Index) - version pandas
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
-        
-        # 3. MACD - version pandas
-        df['ema_12'] = df['close'].ewm(span=12).mean()
-        df['ema_26'] = df['close'].ewm(span=26).mean()
-        df['macd'] = df['ema_12'] - df['ema_26']
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        df['macd_hist'] = df['macd'] - df['macd_signal']
-        
-        # 4. Moyennes mobiles
-        df['sma_20'] = df['close'].rolling(20).mean()
-        df['sma_50'] = df['close'].rolling(50).mean()
-        # EMA déjà calculé pour MACD
-        
-        # 5. Bandes de Bollinger - version pandas
-        df['bb_middle'] = df['close'].rolling(20).mean()
-        std = df['close'].rolling(20).std()
-        df['bb_upper'] = df['bb_middle'] + (std * 2)
-        df['bb_lower'] = df['bb_middle'] - (std * 2)
-        df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle']
-        
-        # 5. Indicateurs de volume
-        df['volume_sma'] = df['volume'].rolling(20).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_sma']
-        
-        # 6. Support et résistance approchés
-        df['support'] = df['low'].rolling(20).min()
-        df['resistance'] = df['high'].rolling(20).max()
-        df['price_position'] = (df['close'] - df['support']) / (df['resistance'] - df['support'])
-        
-        # 7. Indicateurs personnalisés pour straddle
-        df['price_range_pct'] = (df['high'] - df['low']) / df['close']
-        df['volatility_rank'] = df['volatility'].rolling(252).rank(pct=True) * 100
+        Prix non positifs, sauts de plus de 50%, incohérences OHLC, NaN et
+        timestamps dupliqués sont combinés en un seul masque; les trous sont
+        mesurés au timeframe de la configuration.
         
-        return df
+        Args:
+            df: DataFrame à valider
+            
+        Returns:
+            Tuple (DataFrame nettoyé, DataQualityReport)
+        """
+        bar_duration = pd.Timedelta(seconds=ccxt.Exchange.parse_timeframe(self.config.timeframe))
+        return validate_ohlcv(df, bar_duration)
     
     def _validate_and_clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Valide et nettoie les données
         
+        Le rapport de qualité est conservé dans self.quality_report.
+        
         Args:
             df: DataFrame à valider
             
@@ -251,70 +341,109 @@ class DataManager:
         if df.empty:
             return df
         
-        initial_len = len(df)
-        
-        # Suppression des valeurs aberrantes
-        df = self._remove_outliers(df)
-        
-        # Suppression des NaN
-        df = df.dropna()
+        df, report = self.validate_data(df)
+        self.quality_report = report
         
-        # Validation de la cohérence
-        df = self._validate_price_consistency(df)
-        
-        final_len = len(df)
-        removed = initial_len - final_len
-        
-        if removed > 0:
-            self.logger.info(f"🧹 {removed} barres supprimées lors du nettoyage")
-        
-        return df
-    
-    def _remove_outliers(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Supprime les valeurs aberrantes"""
-        # Filtrage des prix négatifs ou nuls
-        price_cols = ['open', 'high', 'low', 'close']
-        for col in price_cols:
-            df = df[df[col] > 0]
-        
-        # Filtrage des mouvements extrêmes (>50% en une barre)
-        df['price_change'] = df['close'].pct_change().abs()
-        df = df[df['price_change'] < 0.5]
-        df = df.drop('price_change', axis=1)
+        if report.n_removed > 0:
+            details = ', '.join(f"{rule}: {count}" for rule, count in report.rejected.items() if count)
+            self.logger.info(f"🧹 {report.n_removed} barres supprimées lors du nettoyage ({details})")
+        if report.gaps:
+            self.logger.warning(f"⚠️ {len(report.gaps)} trous dans les données "
+                              f"({report.missing_bars} barres manquantes)")
         
         return df
     
-    def _validate_price_consistency(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Valide la cohérence des prix OHLC"""
-        # High >= max(Open, Close) et Low <= min(Open, Close)
-        valid_high = df['high'] >= df[['open', 'close']].max(axis=1)
-        valid_low = df['low'] <= df[['open', 'close']].min(axis=1)
-        
-        return df[valid_high & valid_low]
-    
-    def get_backtest_data(self) -> pd.DataFrame:
+    def get_backtest_data(self, features: Optional[Sequence[str]] = None) -> pd.DataFrame:
         """
         Récupère les données spécifiquement pour le backtest
         
+        Args:
+            features: Colonnes lues par la stratégie (voir get_market_data)
+        
         Returns:
-            pd.DataFrame: Données filtrées pour la période de backtest
+            pd.DataFrame: Données de la période de backtest, indicateurs
+            égaux à ceux calculés sur toute la période de la configuration
         """
-        full_data = self.get_market_data()
+        # Seules la période de backtest et la chauffe de ses indicateurs sont
+        # lues et calculées, pas tout l'historique de la configuration
+        backtest_data = self.get_market_data(
+            features, self.config.backtest_start_date, self.config.backtest_end_date
+        )
         
-        if full_data.empty:
+        if backtest_data.empty:
             return pd.DataFrame()
         
-        # Filtrage pour la période de backtest
-        backtest_data = full_data[
-            (full_data.index >= BACKTEST_START_DATE) & 
-            (full_data.index < BACKTEST_END_DATE)
-        ]
-        
         self.logger.info(f"📊 Données backtest: {len(backtest_data)} barres "
-                        f"({BACKTEST_START_DATE} → {BACKTEST_END_DATE})")
+                        f"({self.config.backtest_start_date} → {self.config.backtest_end_date})")
         
         return backtest_data
     
+    def get_panel_data(self, symbols: Optional[Sequence[str]] = None,
+                       features: Optional[Sequence[str]] = None,
+                       start: Optional[str] = None, end: Optional[str] = None) -> MarketPanel:
+        """
+        Récupère plusieurs symboles alignés sur une grille de dates commune
+        
+        Les barres de chaque symbole (cache disque par symbole) sont validées
+        avant l'alignement: une barre rejetée devient une barre manquante
+        (panel.present). Les indicateurs sont ensuite calculés pour tous les
+        symboles en une passe sur les matrices temps x symbole;
+        panel.symbol_frame(symbol) donne à la stratégie les barres prêtes
+        d'un symbole sans copie.
+        
+        Args:
+            symbols: Paires à récupérer (config.panel_symbols par défaut)
+            features: Colonnes lues par la stratégie (voir get_market_data)
+            start, end: Fenêtre utile (voir get_market_data): seules ses
+                barres et la chauffe de ses indicateurs sont lues
+        
+        Returns:
+            MarketPanel (float32 si config.compact_dtypes); un symbole dont
+            la récupération échoue est absent du panel
+        """
+        # Indicateur inconnu: erreur de l'appelant, signalée avant tout téléchargement
+        warmup_bars(features)
+        symbols = list(symbols or self.config.panel_symbols)
+        bar_duration = pd.Timedelta(seconds=ccxt.Exchange.parse_timeframe(self.config.timeframe))
+        start_ts = end_ts = None
+        if start is not None:
+            start_ts = int((pd.Timestamp(start) - history_bars(features) * bar_duration).timestamp() * 1000)
+        if end is not None:
+            end_ts = int(pd.Timestamp(end).timestamp() * 1000)
+        
+        self.logger.info(f"📊 Récupération panel de {len(symbols)} symboles ({self.config.timeframe})")
+        frames = {}
+        for symbol in symbols:
+            try:
+                raw_data = self._fetch_ohlcv_data(symbol, start_ts, end_ts)
+            except Exception as e:
+                self.logger.error(f"❌ Erreur récupération données {symbol}: {e}")
+                continue
+            if raw_data.empty:
+                self.logger.warning(f"⚠️ Aucune donnée pour {symbol}")
+                continue
+            frames[symbol], self.panel_quality_reports[symbol] = validate_ohlcv(raw_data, bar_duration)
+        
+        panel = MarketPanel.from_frames(frames, bar_duration)
+        if len(panel):
+            self.logger.info("📊 Calcul des indicateurs techniques (panel)")
+            panel.compute_indicators(features)
+        
+        # Stockage compact (float32) une fois les indicateurs calculés en float64
+        if self.config.compact_dtypes:
+            panel = panel.astype(COMPACT_FLOAT)
+        
+        missing = sum(panel.missing_bars().values())
+        self.logger.info(f"✅ Panel {len(panel)} barres x {len(panel.symbols)} symboles "
+                        f"({missing} barres manquantes)")
+        return panel
+    
+    def get_backtest_panel(self, symbols: Optional[Sequence[str]] = None,
+                           features: Optional[Sequence[str]] = None) -> MarketPanel:
+        """Panel restreint à la période de backtest (vues sans copie)"""
+        start, end = self.config.backtest_start_date, self.config.backtest_end_date
+        return self.get_panel_data(symbols, features, start, end).window(start, end)
+    
     def get_data_summary(self, df: pd.DataFrame) -> dict:
         """
         Génère un résumé des données
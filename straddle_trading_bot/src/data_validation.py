@@ -0,0 +1,140 @@
+# Validation des données OHLCV en une seule passe
+# Un masque booléen pour toutes les règles, appliqué une fois, et un rapport
+# de qualité (barres rejetées par règle, trous de la série)
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+
+# Règles de rejet, dans l'ordre du rapport
+VALIDATION_RULES = ('nan', 'non_positive_price', 'price_jump', 'ohlc_inconsistent', 'duplicate_timestamp')
+
+# Variation maximale du close d'une barre à la suivante (50%)
+MAX_PRICE_JUMP = 0.5
+
+
+@dataclass
+class DataQualityReport:
+    """
+    Rapport de validate_ohlcv
+
+    rejected compte les barres enfreignant chaque règle (une barre peut en
+    enfreindre plusieurs: n_removed peut être inférieur à la somme). gaps
+    liste les trous de la série renvoyée: (dernière barre avant le trou,
+    première barre après, nombre de barres manquantes).
+    """
+    n_bars: int
+    n_kept: int
+    rejected: Dict[str, int] = field(default_factory=dict)
+    gaps: List[Tuple[pd.Timestamp, pd.Timestamp, int]] = field(default_factory=list)
+
+    @property
+    def n_removed(self) -> int:
+        return self.n_bars - self.n_kept
+
+    @property
+    def missing_bars(self) -> int:
+        return sum(missing for _, _, missing in self.gaps)
+
+    def to_dict(self) -> dict:
+        """Résumé sérialisable (logs, JSON)"""
+        return {
+            'n_bars': self.n_bars,
+            'n_kept': self.n_kept,
+            'n_removed': self.n_removed,
+            'rejected': dict(self.rejected),
+            'n_gaps': len(self.gaps),
+            'missing_bars': self.missing_bars,
+            'gaps': [(str(start), str(end), missing) for start, end, missing in self.gaps]
+        }
+
+
+def rule_masks(df: pd.DataFrame, max_jump: float = MAX_PRICE_JUMP) -> Dict[str, np.ndarray]:
+    """
+    Barres enfreignant chaque règle de VALIDATION_RULES (True = rejetée)
+
+    - nan: valeur manquante dans une colonne quelconque (indicateurs compris)
+    - non_positive_price: open, high, low ou close <= 0
+    - price_jump: close à plus de max_jump du close valide précédent (les
+      barres à prix manquant ou non positif ne servent pas de référence)
+    - ohlc_inconsistent: high < max(open, close) ou low > min(open, close)
+    - duplicate_timestamp: timestamp répété (la dernière barre est gardée,
+      comme dans le cache OHLCV)
+    """
+    n_bars = len(df)
+    open_, high, low, close = (df[name].to_numpy(dtype=np.float64) for name in PRICE_COLUMNS)
+
+    nan = np.zeros(n_bars, dtype=bool)
+    for name in df.columns:
+        nan |= df[name].isna().to_numpy()
+
+    non_positive = (open_ <= 0) | (high <= 0) | (low <= 0) | (close <= 0)
+
+    # Close de référence: dernier close exploitable strictement avant la barre
+    usable = ~(non_positive | np.isnan(open_) | np.isnan(high) | np.isnan(low) | np.isnan(close))
+    reference = pd.Series(np.where(usable, close, np.nan)).ffill().shift().to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        jump = np.abs(close / reference - 1) >= max_jump
+
+    # Comparaisons fausses pour NaN: ces barres relèvent de la règle nan
+    inconsistent = (high < np.maximum(open_, close)) | (low > np.minimum(open_, close))
+
+    return {
+        'nan': nan,
+        'non_positive_price': non_positive,
+        'price_jump': jump,
+        'ohlc_inconsistent': inconsistent,
+        'duplicate_timestamp': df.index.duplicated(keep='last')
+    }
+
+
+def find_gaps(index: pd.Index, bar_duration: pd.Timedelta) -> List[Tuple[pd.Timestamp, pd.Timestamp, int]]:
+    """Trous d'un index de dates trié: écart supérieur à bar_duration"""
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return []
+    step = bar_duration.value
+    deltas = np.diff(index.asi8)
+    positions = np.flatnonzero(deltas > step)
+    return [
+        (index[i], index[i + 1], int(deltas[i] // step - (deltas[i] % step == 0)))
+        for i in positions
+    ]
+
+
+def validate_ohlcv(
+    df: pd.DataFrame,
+    bar_duration: Optional[pd.Timedelta] = None,
+    max_jump: float = MAX_PRICE_JUMP
+) -> Tuple[pd.DataFrame, DataQualityReport]:
+    """
+    Valide et nettoie des barres OHLCV (avec ou sans indicateurs)
+
+    Toutes les règles sont évaluées sur les colonnes d'origine et combinées
+    en un seul masque, appliqué une fois: une seule copie des données, et
+    aucune si toutes les barres sont valides.
+
+    Args:
+        df: Barres OHLCV indexées par date (colonnes open, high, low, close)
+        bar_duration: Durée d'une barre, pour la détection des trous (aucune
+            détection si None ou si l'index n'est pas un DatetimeIndex)
+        max_jump: Variation maximale du close entre deux barres
+
+    Returns:
+        Tuple (barres valides, DataQualityReport)
+    """
+    masks = rule_masks(df, max_jump)
+    rejected = np.zeros(len(df), dtype=bool)
+    for mask in masks.values():
+        rejected |= mask
+
+    clean = df[~rejected] if rejected.any() else df
+    report = DataQualityReport(
+        n_bars=len(df),
+        n_kept=len(clean),
+        rejected={rule: int(masks[rule].sum()) for rule in VALIDATION_RULES},
+        gaps=find_gaps(clean.index, bar_duration) if bar_duration is not None else []
+    )
+    return clean, report
@@ -0,0 +1,592 @@
+# Exchange local compatible ccxt pour le rejeu hors ligne et les benchmarks
+# REST (ccxt) et flux d'order book façon websocket (ccxt.pro), sans réseau
+#
+# Module sans dépendance au package (ni config ni import relatif obligatoire)
+# afin de pouvoir être partagé par les prototypes test1/, test2/ et test4/.
+#
+# Sélection par l'identifiant d'exchange: 'fake' ou 'fake_<exchange>'
+# (create_exchange). Les données sont lues dans le répertoire
+# FAKE_EXCHANGE_DATA (ou params['data_dir']):
+#   <SYMBOLE>_<timeframe>.csv     barres timestamp,open,high,low,close,volume
+#   <exchange>_<SYMBOLE>_<tf>.*   cache OHLCV du DataManager (rejeu de
+#                                 'fake_<exchange>')
+#   tickers.json                  {symbole: champs du ticker}
+#   balances.json                 {devise: montant}
+#   order_books/<SYMBOLE>.jsonl   un snapshot {timestamp, bids, asks} par ligne
+# (<SYMBOLE> avec '-' à la place de '/'). Tout ce qui est absent est généré:
+# marché synthétique déterministe, fonction du symbole et de l'horodatage.
+
+import os
+import json
+import time
+import zlib
+import random
+import asyncio
+import logging
+import functools
+import itertools
+import collections
+import ccxt
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from .ohlcv_cache import OHLCVCache
+except ImportError:  # importé hors package (prototypes test1/, test2/ et test4/)
+    from ohlcv_cache import OHLCVCache
+
+FAKE_EXCHANGE_PREFIX = 'fake'
+
+# Méthodes REST simulées (latence, débit et erreurs appliqués à chaque appel)
+REST_METHODS = (
+    'load_markets', 'fetch_ohlcv', 'fetch_ticker', 'fetch_tickers', 'fetch_order_book',
+    'fetch_balance', 'create_order', 'create_market_buy_order', 'create_market_sell_order',
+    'create_limit_buy_order', 'create_limit_sell_order', 'fetch_order', 'fetch_open_orders',
+    'cancel_order', 'cancel_all_orders'
+)
+
+# Prix de départ du marché synthétique (entre 10 et 500, selon le nom, pour les autres actifs)
+BASE_PRICES = {'BTC': 60000.0, 'ETH': 3000.0, 'BNB': 500.0, 'SOL': 150.0}
+
+# Cycles de la tendance synthétique: (période en jours, amplitude du log-prix)
+TREND_CYCLES = ((30, 0.15), (7, 0.05), (1, 0.01), (1 / 6, 0.004))
+
+logger = logging.getLogger(__name__)
+
+
+def is_fake_exchange_id(exchange_id: str) -> bool:
+    """Vrai pour 'fake' et 'fake_<exchange>'"""
+    return exchange_id == FAKE_EXCHANGE_PREFIX or exchange_id.startswith(FAKE_EXCHANGE_PREFIX + '_')
+
+
+def create_exchange(exchange_id: str, params: Optional[Dict[str, Any]] = None, asynchronous: bool = False):
+    """
+    Instancie un exchange d'après son identifiant
+
+    Args:
+        exchange_id: Identifiant ccxt ('binance'...) ou 'fake' / 'fake_<exchange>'
+        params: Paramètres du constructeur ccxt (options de FakeExchange
+            pour un exchange local)
+        asynchronous: Client ccxt.pro (websocket) au lieu du client REST
+
+    Returns:
+        Instance ccxt ou FakeExchange / AsyncFakeExchange
+    """
+    params = dict(params or {})
+    if is_fake_exchange_id(exchange_id):
+        exchange_class = AsyncFakeExchange if asynchronous else FakeExchange
+        return exchange_class({**params, 'id': exchange_id})
+    module = ccxt.pro if asynchronous else ccxt
+    return getattr(module, exchange_id)(params)
+
+
+def _uniform(seed: int, keys: np.ndarray) -> np.ndarray:
+    """Uniformes [0, 1) déterministes par clé entière (hachage splitmix64)"""
+    x = np.asarray(keys, dtype=np.int64).astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    x += np.uint64(seed & 0xFFFFFFFFFFFFFFFF)
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+
+def _normal(seed: int, keys: np.ndarray) -> np.ndarray:
+    """Gaussiennes déterministes par clé entière (Box-Muller)"""
+    keys = np.asarray(keys, dtype=np.int64)
+    u1 = np.maximum(_uniform(seed, 2 * keys), 1e-12)
+    u2 = _uniform(seed, 2 * keys + 1)
+    return np.sqrt(-2 * np.log(u1)) * np.cos(2 * np.pi * u2)
+
+
+def _seed(*parts: str) -> int:
+    return zlib.crc32('|'.join(parts).encode('utf-8'))
+
+
+def _file_key(symbol: str) -> str:
+    return symbol.replace('/', '-').replace(':', '-')
+
+
+class FakeExchange:
+    """
+    Exchange local au comportement d'un client ccxt synchrone
+
+    Sert des barres OHLCV, tickers, soldes et order books enregistrés
+    (répertoire data_dir) ou synthétiques, et exécute les ordres contre
+    l'order book simulé en tenant les soldes à jour. Le marché synthétique
+    est une fonction déterministe du symbole et de l'horodatage: deux runs
+    obtiennent les mêmes barres, et deux exchanges 'fake_a' / 'fake_b'
+    cotent le même actif avec un léger écart.
+
+    Options (dictionnaire du constructeur, clés ccxt inconnues ignorées):
+        id: Identifiant ('fake' par défaut)
+        data_dir: Répertoire des données enregistrées (FAKE_EXCHANGE_DATA)
+        recorded_exchange_id: Exchange du cache OHLCV rejoué
+            ('binance' pour 'fake_binance')
+        latency_ms, latency_jitter_ms: Latence de chaque requête
+        max_requests_per_second: Débit au-delà duquel les requêtes échouent
+            en ccxt.RateLimitExceeded (None: illimité)
+        error_rate: Probabilité d'échec ccxt.NetworkError par requête
+        order_book_updates_per_second: Cadence de watch_order_book
+        ohlcv_limit: Barres maximum par requête fetch_ohlcv
+        balances: Soldes initiaux {devise: montant}
+        fee: Frais taker/maker, prélevés sur la devise de cotation
+        spread_bps, depth: Écart bid/ask et niveaux de l'order book
+        seed: Graine des erreurs simulées
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = dict(config or {})
+        self.id = config.get('id', FAKE_EXCHANGE_PREFIX)
+        self.name = f"Fake ({self.id})"
+        data_dir = config.get('data_dir', os.environ.get('FAKE_EXCHANGE_DATA'))
+        self.data_dir = Path(data_dir) if data_dir else None
+        recorded_id = self.id[len(FAKE_EXCHANGE_PREFIX) + 1:] if self.id.startswith(FAKE_EXCHANGE_PREFIX + '_') else None
+        self.recorded_exchange_id = config.get('recorded_exchange_id', recorded_id)
+
+        self.latency_ms = float(config.get('latency_ms', 0.0))
+        self.latency_jitter_ms = float(config.get('latency_jitter_ms', 0.0))
+        self.max_requests_per_second = config.get('max_requests_per_second')
+        self.error_rate = float(config.get('error_rate', 0.0))
+        self.order_book_updates_per_second = float(config.get('order_book_updates_per_second', 10.0))
+        self.ohlcv_limit = int(config.get('ohlcv_limit', 1000))
+        self.fee = float(config.get('fee', 0.001))
+        self.spread_bps = float(config.get('spread_bps', 2.0))
+        self.depth = int(config.get('depth', 20))
+        # Débit annoncé aux clients (ohlcv_downloader): sans limite, aucune attente
+        self.rateLimit = 1000 / self.max_requests_per_second if self.max_requests_per_second else 0
+        self.enableRateLimit = bool(config.get('enableRateLimit', False))
+        self.timeframes = {tf: tf for tf in ('1m', '5m', '15m', '30m', '1h', '4h', '1d')}
+        self.has = {
+            'fetchOHLCV': True, 'fetchTicker': True, 'fetchTickers': True, 'fetchOrderBook': True,
+            'fetchBalance': True, 'createOrder': True, 'fetchOrder': True, 'fetchOpenOrders': True,
+            'cancelOrder': True, 'cancelAllOrders': True, 'watchOrderBook': False
+        }
+
+        self._random = random.Random(config.get('seed', _seed(self.id)))
+        self._request_times = collections.deque()
+        self._order_ids = itertools.count(1)
+        self._orders: Dict[str, dict] = {}
+        self._recorded_bars: Dict[tuple, Optional[pd.DataFrame]] = {}
+        self._recorded_books: Dict[str, list] = {}
+        self._tickers = self._read_json('tickers.json') or {}
+        balances = config.get('balances') or self._read_json('balances.json') or {'USDT': 10000.0}
+        self.balances = {currency: {'free': float(amount), 'used': 0.0} for currency, amount in balances.items()}
+        self.markets: Dict[str, dict] = {}
+        for symbol in config.get('symbols', ('BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'SOL/USDT')):
+            self.market(symbol)
+
+    # ---------------------------------------------------------------- ccxt
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.markets)
+
+    @staticmethod
+    def milliseconds() -> int:
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def iso8601(timestamp: Optional[int]) -> Optional[str]:
+        return ccxt.Exchange.iso8601(timestamp)
+
+    @staticmethod
+    def parse_timeframe(timeframe: str) -> int:
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
+    def market(self, symbol: str) -> dict:
+        """Marché spot de symbol, créé à la demande pour tout symbole BASE/QUOTE"""
+        if symbol not in self.markets:
+            if '/' not in symbol:
+                raise ccxt.BadSymbol(f"{self.id} ne connaît pas le marché {symbol}")
+            base, quote = symbol.split(':')[0].split('/')
+            tick = 10 ** np.floor(np.log10(self._base_price(base) * 1e-5))
+            self.markets[symbol] = {
+                'id': base + quote, 'symbol': symbol, 'base': base, 'quote': quote,
+                'type': 'spot', 'spot': True, 'active': True,
+                'taker': self.fee, 'maker': self.fee, 'feeSide': 'quote',
+                'precision': {'amount': 1e-6, 'price': float(tick)},
+                'limits': {'amount': {'min': 1e-5, 'max': None}, 'price': {'min': float(tick), 'max': None},
+                           'cost': {'min': 5.0, 'max': None}}
+            }
+            for currency in (base, quote):
+                self.balances.setdefault(currency, {'free': 0.0, 'used': 0.0})
+        return self.markets[symbol]
+
+    def close(self):
+        """Aucune connexion à fermer (compatibilité ccxt.pro)"""
+
+    # ---------------------------------------------------- requêtes simulées
+    def _throttle(self) -> float:
+        """
+        Applique débit et erreurs simulés à une requête
+
+        Returns:
+            Latence à attendre en secondes
+        """
+        if self.max_requests_per_second:
+            now = time.monotonic()
+            while self._request_times and now - self._request_times[0] >= 1.0:
+                self._request_times.popleft()
+            if len(self._request_times) >= self.max_requests_per_second:
+                raise ccxt.RateLimitExceeded(f"{self.id}: plus de {self.max_requests_per_second} requêtes/s")
+            self._request_times.append(now)
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise ccxt.NetworkError(f"{self.id}: erreur réseau simulée")
+        return max(0.0, self.latency_ms + self._random.uniform(-1, 1) * self.latency_jitter_ms) / 1000
+
+    def _call(self, method, *args, **kwargs):
+        time.sleep(self._throttle())
+        return method(*args, **kwargs)
+
+    def load_markets(self, reload: bool = False, params: Optional[dict] = None) -> Dict[str, dict]:
+        return self._call(lambda: self.markets)
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: Optional[int] = None,
+                    limit: Optional[int] = None, params: Optional[dict] = None) -> List[list]:
+        return self._call(self._ohlcv, symbol, timeframe, since, limit)
+
+    def fetch_ticker(self, symbol: str, params: Optional[dict] = None) -> dict:
+        return self._call(self._ticker, symbol)
+
+    def fetch_tickers(self, symbols: Optional[List[str]] = None, params: Optional[dict] = None) -> Dict[str, dict]:
+        return self._call(lambda: {symbol: self._ticker(symbol) for symbol in (symbols or self.symbols)})
+
+    def fetch_order_book(self, symbol: str, limit: Optional[int] = None, params: Optional[dict] = None) -> dict:
+        return self._call(self._order_book, symbol, limit)
+
+    def fetch_balance(self, params: Optional[dict] = None) -> dict:
+        return self._call(self._balance)
+
+    def create_order(self, symbol: str, type: str, side: str, amount: float,
+                     price: Optional[float] = None, params: Optional[dict] = None) -> dict:
+        return self._call(self._create_order, symbol, type, side, amount, price)
+
+    def create_market_buy_order(self, symbol: str, amount: float, params: Optional[dict] = None) -> dict:
+        return self._call(self._create_order, symbol, 'market', 'buy', amount, None)
+
+    def create_market_sell_order(self, symbol: str, amount: float, params: Optional[dict] = None) -> dict:
+        return self._call(self._create_order, symbol, 'market', 'sell', amount, None)
+
+    def create_limit_buy_order(self, symbol: str, amount: float, price: float, params: Optional[dict] = None) -> dict:
+        return self._call(self._create_order, symbol, 'limit', 'buy', amount, price)
+
+    def create_limit_sell_order(self, symbol: str, amount: float, price: float, params: Optional[dict] = None) -> dict:
+        return self._call(self._create_order, symbol, 'limit', 'sell', amount, price)
+
+    def fetch_order(self, id: str, symbol: Optional[str] = None, params: Optional[dict] = None) -> dict:
+        return self._call(self._get_order, id)
+
+    def fetch_open_orders(self, symbol: Optional[str] = None, since: Optional[int] = None,
+                          limit: Optional[int] = None, params: Optional[dict] = None) -> List[dict]:
+        return self._call(lambda: [
+            dict(order) for order in self._orders.values()
+            if order['status'] == 'open' and symbol in (None, order['symbol'])
+        ])
+
+    def cancel_order(self, id: str, symbol: Optional[str] = None, params: Optional[dict] = None) -> dict:
+        return self._call(self._cancel_order, id)
+
+    def cancel_all_orders(self, symbol: Optional[str] = None, params: Optional[dict] = None) -> List[dict]:
+        return self._call(lambda: [
+            self._cancel_order(order['id']) for order in list(self._orders.values())
+            if order['status'] == 'open' and symbol in (None, order['symbol'])
+        ])
+
+    # ------------------------------------------------------- données servies
+    def _read_json(self, name: str):
+        if self.data_dir is None or not (self.data_dir / name).exists():
+            return None
+        return json.loads((self.data_dir / name).read_text(encoding='utf-8'))
+
+    def _recorded_ohlcv(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Barres enregistrées (CSV puis cache OHLCV), colonne timestamp en ms"""
+        key = (symbol, timeframe)
+        if key not in self._recorded_bars:
+            bars = None
+            if self.data_dir is not None:
+                csv_path = self.data_dir / f"{_file_key(symbol)}_{timeframe}.csv"
+                if csv_path.exists():
+                    bars = pd.read_csv(csv_path).sort_values('timestamp', ignore_index=True)
+                elif self.recorded_exchange_id:
+                    cache = OHLCVCache(self.data_dir, self.recorded_exchange_id, symbol, timeframe)
+                    if cache.manifest['n_bars']:
+                        bars = cache.load()
+            self._recorded_bars[key] = bars
+        return self._recorded_bars[key]
+
+    def _base_price(self, base: str) -> float:
+        return BASE_PRICES.get(base, 10 + _seed(base) % 490)
+
+    def _synthetic_prices(self, symbol: str, timestamps: np.ndarray, resolution_ms: int) -> np.ndarray:
+        """
+        Prix synthétiques aux instants timestamps (ms)
+
+        Tendance commune à tous les exchanges (cycles de TREND_CYCLES) et
+        bruit propre à l'exchange, tiré par pas de resolution_ms: deux
+        requêtes au même instant et à la même résolution renvoient le même prix.
+        """
+        market = self.market(symbol)
+        t_days = np.asarray(timestamps, dtype=np.float64) / 86_400_000
+        trend_seed = _seed(market['base'], market['quote'])
+        phases = _uniform(trend_seed, np.arange(len(TREND_CYCLES))) * 2 * np.pi
+        log_price = np.zeros_like(t_days)
+        for (period, amplitude), phase in zip(TREND_CYCLES, phases):
+            log_price += amplitude * np.sin(2 * np.pi * t_days / period + phase)
+
+        venue_seed = _seed(self.id, symbol)
+        basis = (_uniform(venue_seed, np.array([-1]))[0] - 0.5) * 1e-3
+        sigma = 0.001 * np.sqrt(max(resolution_ms, 1000) / 60_000)
+        noise = sigma * _normal(venue_seed, np.asarray(timestamps, dtype=np.int64) // resolution_ms)
+        return self._base_price(market['base']) * np.exp(log_price + basis + noise)
+
+    def _ohlcv(self, symbol: str, timeframe: str, since: Optional[int], limit: Optional[int]) -> List[list]:
+        limit = min(limit or 500, self.ohlcv_limit)
+        bar_ms = int(self.parse_timeframe(timeframe) * 1000)
+        now = self.milliseconds()
+
+        recorded = self._recorded_ohlcv(symbol, timeframe)
+        if recorded is not None:
+            timestamps = recorded['timestamp'].to_numpy()
+            start = np.searchsorted(timestamps, since) if since is not None else max(0, len(recorded) - limit)
+            window = recorded.iloc[start:start + limit]
+            return window[['timestamp', 'open', 'high', 'low', 'close', 'volume']].values.tolist()
+
+        last_bar = now // bar_ms * bar_ms
+        first_bar = -(-since // bar_ms) * bar_ms if since is not None else last_bar - (limit - 1) * bar_ms
+        opens = np.arange(first_bar, min(first_bar + limit * bar_ms, last_bar + 1), bar_ms, dtype=np.int64)
+        if not len(opens):
+            return []
+
+        # Ouverture et clôture aux bornes de la barre: close[k] == open[k + 1]
+        edges = self._synthetic_prices(symbol, np.append(opens, opens[-1] + bar_ms), bar_ms)
+        open_, close = edges[:-1], edges[1:]
+        venue_seed = _seed(self.id, symbol, timeframe)
+        wick = 0.002 * np.sqrt(bar_ms / 60_000)
+        high = np.maximum(open_, close) * (1 + wick * _uniform(venue_seed, 3 * (opens // bar_ms)))
+        low = np.minimum(open_, close) * (1 - wick * _uniform(venue_seed, 3 * (opens // bar_ms) + 1))
+        notional = 2e5 * bar_ms / 60_000 * (0.5 + _uniform(venue_seed, 3 * (opens // bar_ms) + 2))
+        volume = notional / close
+        return [[int(ts), float(o), float(h), float(l), float(c), float(v)]
+                for ts, o, h, l, c, v in zip(opens, open_, high, low, close, volume)]
+
+    def _order_book(self, symbol: str, limit: Optional[int] = None, snapshot: Optional[int] = None) -> dict:
+        """
+        Order book enregistré (snapshot suivant du fichier, en boucle) ou
+        synthétique autour du prix courant
+        """
+        books = self._recorded_order_books(symbol)
+        if books:
+            index = snapshot if snapshot is not None else self.milliseconds() // 1000
+            book = dict(books[index % len(books)])
+        else:
+            now = self.milliseconds()
+            mid = float(self._synthetic_prices(symbol, np.array([now]), 1000)[0])
+            tick = self.market(symbol)['precision']['price']
+            half_spread = max(mid * self.spread_bps / 2e4, tick)
+            levels = np.arange(self.depth)
+            seed = _seed(self.id, symbol, 'book')
+            # Quantités de 5k à 100k en devise de cotation par niveau
+            notional = 5e3 + 9.5e4 * _uniform(seed, now // 1000 * 2 * self.depth + np.arange(2 * self.depth))
+            sizes = notional / mid
+            bid_prices = np.floor((mid - half_spread - levels * tick * 5) / tick) * tick
+            ask_prices = np.ceil((mid + half_spread + levels * tick * 5) / tick) * tick
+            book = {
+                'timestamp': now,
+                'bids': [[float(p), float(a)] for p, a in zip(bid_prices, sizes[:self.depth])],
+                'asks': [[float(p), float(a)] for p, a in zip(ask_prices, sizes[self.depth:])]
+            }
+        timestamp = book.get('timestamp') or self.milliseconds()
+        return {
+            'symbol': symbol, 'timestamp': timestamp, 'datetime': self.iso8601(timestamp), 'nonce': None,
+            'bids': book['bids'][:limit], 'asks': book['asks'][:limit]
+        }
+
+    def _recorded_order_books(self, symbol: str) -> list:
+        if symbol not in self._recorded_books:
+            books = []
+            if self.data_dir is not None:
+                path = self.data_dir / 'order_books' / f"{_file_key(symbol)}.jsonl"
+                if path.exists():
+                    with open(path, encoding='utf-8') as f:
+                        books = [json.loads(line) for line in f if line.strip()]
+            self._recorded_books[symbol] = books
+        return self._recorded_books[symbol]
+
+    def _ticker(self, symbol: str) -> dict:
+        book = self._order_book(symbol, 1)
+        now = book['timestamp']
+        bid, ask = book['bids'][0][0], book['asks'][0][0]
+        day = self._ohlcv(symbol, '1h', now - 86_400_000, 24)
+        ticker = {
+            'symbol': symbol, 'timestamp': now, 'datetime': self.iso8601(now),
+            'bid': bid, 'bidVolume': book['bids'][0][1], 'ask': ask, 'askVolume': book['asks'][0][1],
+            'last': (bid + ask) / 2, 'close': (bid + ask) / 2,
+            'open': day[0][1] if day else None,
+            'high': max(row[2] for row in day) if day else None,
+            'low': min(row[3] for row in day) if day else None,
+            'baseVolume': sum(row[5] for row in day) if day else None
+        }
+        if ticker['open']:
+            ticker['change'] = ticker['last'] - ticker['open']
+            ticker['percentage'] = ticker['change'] / ticker['open'] * 100
+        ticker.update(self._tickers.get(symbol, {}))
+        return ticker
+
+    def _balance(self) -> dict:
+        balance = {'info': {}, 'free': {}, 'used': {}, 'total': {}}
+        for currency, account in self.balances.items():
+            total = account['free'] + account['used']
+            balance[currency] = {'free': account['free'], 'used': account['used'], 'total': total}
+            balance['free'][currency] = account['free']
+            balance['used'][currency] = account['used']
+            balance['total'][currency] = total
+        return balance
+
+    # ---------------------------------------------------------------- ordres
+    def _create_order(self, symbol: str, type: str, side: str, amount: float, price: Optional[float]) -> dict:
+        market = self.market(symbol)
+        if amount <= 0:
+            raise ccxt.InvalidOrder(f"{self.id}: quantité invalide {amount}")
+        if side not in ('buy', 'sell') or type not in ('market', 'limit'):
+            raise ccxt.InvalidOrder(f"{self.id}: ordre {type} {side} non supporté")
+        if type == 'limit' and not price:
+            raise ccxt.InvalidOrder(f"{self.id}: prix requis pour un ordre limit")
+
+        now = self.milliseconds()
+        order = {
+            'id': str(next(self._order_ids)), 'clientOrderId': None, 'timestamp': now,
+            'datetime': self.iso8601(now), 'lastTradeTimestamp': None, 'symbol': symbol,
+            'type': type, 'side': side, 'price': price, 'average': None, 'amount': amount,
+            'filled': 0.0, 'remaining': amount, 'cost': 0.0, 'status': 'open',
+            'fee': {'cost': 0.0, 'currency': market['quote']}, 'trades': [], 'info': {}
+        }
+
+        book = self._order_book(symbol)
+        levels = book['asks'] if side == 'buy' else book['bids']
+        marketable = type == 'market' or (levels and (
+            levels[0][0] <= price if side == 'buy' else levels[0][0] >= price
+        ))
+        if marketable:
+            # Exécution sur les niveaux de l'order book (prix limite respecté)
+            filled, cost = 0.0, 0.0
+            for level_price, level_amount in levels:
+                if type == 'limit' and (level_price > price if side == 'buy' else level_price < price):
+                    break
+                take = min(level_amount, amount - filled)
+                filled += take
+                cost += take * level_price
+                if filled >= amount:
+                    break
+            if filled < amount and type == 'market':
+                raise ccxt.InvalidOrder(f"{self.id}: liquidité insuffisante pour {amount} {market['base']}")
+            self._settle(market, side, filled, cost)
+            order.update(filled=filled, remaining=amount - filled, cost=cost, average=cost / filled,
+                         lastTradeTimestamp=now, status='closed' if filled >= amount else 'open')
+            order['fee']['cost'] = cost * self.fee
+            if order['price'] is None:
+                order['price'] = order['average']
+
+        if order['status'] == 'open':
+            self._reserve(market, side, order['remaining'], price)
+        self._orders[order['id']] = order
+        logger.debug(f"🧪 {self.id}: ordre {type} {side} {amount} {symbol} {order['status']}")
+        return dict(order)
+
+    def _settle(self, market: dict, side: str, filled: float, cost: float):
+        base, quote = self.balances[market['base']], self.balances[market['quote']]
+        fee = cost * self.fee
+        if side == 'buy':
+            if quote['free'] < cost + fee:
+                raise ccxt.InsufficientFunds(f"{self.id}: solde {market['quote']} insuffisant")
+            quote['free'] -= cost + fee
+            base['free'] += filled
+        else:
+            if base['free'] < filled:
+                raise ccxt.InsufficientFunds(f"{self.id}: solde {market['base']} insuffisant")
+            base['free'] -= filled
+            quote['free'] += cost - fee
+
+    def _reserve(self, market: dict, side: str, amount: float, price: float, release: bool = False):
+        """Bloque (ou libère) les fonds d'un ordre limit ouvert"""
+        currency, locked = (market['quote'], amount * price * (1 + self.fee)) if side == 'buy' else (market['base'], amount)
+        account = self.balances[currency]
+        if release:
+            account['used'] -= locked
+            account['free'] += locked
+            return
+        if account['free'] < locked:
+            raise ccxt.InsufficientFunds(f"{self.id}: solde {currency} insuffisant")
+        account['free'] -= locked
+        account['used'] += locked
+
+    def _get_order(self, id: str) -> dict:
+        if id not in self._orders:
+            raise ccxt.OrderNotFound(f"{self.id}: ordre {id} inconnu")
+        return dict(self._orders[id])
+
+    def _cancel_order(self, id: str) -> dict:
+        order = self._orders.get(id)
+        if order is None or order['status'] != 'open':
+            raise ccxt.OrderNotFound(f"{self.id}: aucun ordre ouvert {id}")
+        self._reserve(self.market(order['symbol']), order['side'], order['remaining'], order['price'], release=True)
+        order['status'] = 'canceled'
+        return dict(order)
+
+
+class AsyncFakeExchange(FakeExchange):
+    """
+    Version asynchrone de FakeExchange (ccxt.async_support / ccxt.pro)
+
+    Les méthodes REST sont des coroutines (latence attendue avec
+    asyncio.sleep) et watch_order_book renvoie les mises à jour de l'order
+    book à la cadence order_book_updates_per_second.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        super().__init__(config)
+        self.has['watchOrderBook'] = True
+        self._book_updates: Dict[str, float] = {}
+        self._book_snapshots: Dict[str, int] = {}
+
+    async def _call(self, method, *args, **kwargs):
+        await asyncio.sleep(self._throttle())
+        return method(*args, **kwargs)
+
+    async def watch_order_book(self, symbol: str, limit: Optional[int] = None, params: Optional[dict] = None) -> dict:
+        """Prochaine mise à jour de l'order book de symbol"""
+        interval = 1 / self.order_book_updates_per_second if self.order_book_updates_per_second else 0
+        next_update = self._book_updates.get(symbol, 0.0) + interval
+        delay = max(0.0, next_update - time.monotonic())
+        await asyncio.sleep(delay + self._throttle())
+        self._book_updates[symbol] = time.monotonic()
+        snapshot = self._book_snapshots.get(symbol, -1) + 1
+        self._book_snapshots[symbol] = snapshot
+        return self._order_book(symbol, limit, snapshot=snapshot)
+
+    async def close(self):
+        """Aucune connexion à fermer"""
+
+
+def _coroutine_method(name: str):
+    method = getattr(FakeExchange, name)
+
+    @functools.wraps(method)
+    async def coroutine(self, *args, **kwargs):
+        return await method(self, *args, **kwargs)
+    return coroutine
+
+
+def _camel_case(name: str) -> str:
+    first, *rest = name.split('_')
+    return first + ''.join('OHLCV' if part == 'ohlcv' else part.capitalize() for part in rest)
+
+
+for _name in REST_METHODS:
+    setattr(AsyncFakeExchange, _name, _coroutine_method(_name))
+for _exchange_class in (FakeExchange, AsyncFakeExchange):
+    for _name in REST_METHODS + ('watch_order_book',):
+        if hasattr(_exchange_class, _name):
+            setattr(_exchange_class, _camel_case(_name), getattr(_exchange_class, _name))
@@ -0,0 +1,283 @@
+# Registre des indicateurs techniques du DataManager
+# Entrées et barres de chauffe déclarées: seuls les indicateurs demandés par
+# la stratégie (et leurs dépendances) sont calculés, une fois chacun
+#
+# Les calculs acceptent des Series (un symbole) comme des DataFrames
+# temps x symbole (market_panel): mêmes opérations, colonne par colonne.
+
+import math
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """
+    Colonne calculée à partir de colonnes OHLCV ou d'autres indicateurs
+
+    warmup est le nombre de barres NaN que le calcul ajoute en tête de ses
+    entrées (fenêtre - 1 pour une moyenne mobile); la chauffe totale d'une
+    colonne cumule celle de ses entrées (voir warmup_bars). history est le
+    nombre de barres, au-delà de la chauffe, dont la valeur dépend encore
+    (moyennes exponentielles, voir history_bars). Un indicateur internal
+    est un intermédiaire supprimé après calcul.
+    """
+    name: str
+    inputs: tuple
+    warmup: int
+    compute: Callable[[Mapping[str, pd.DataFrame]], pd.Series]
+    internal: bool = False
+    history: int = 0
+
+
+# Ordre d'enregistrement = ordre des colonnes (dépendances toujours avant)
+INDICATORS: Dict[str, Indicator] = {}
+
+
+def indicator(name: str, inputs: Iterable[str], warmup: int = 0, internal: bool = False, history: int = 0):
+    """Décorateur: enregistre la fonction de calcul de la colonne name"""
+    def register(compute: Callable[[pd.DataFrame], pd.Series]):
+        INDICATORS[name] = Indicator(name, tuple(inputs), warmup, compute, internal, history)
+        return compute
+    return register
+
+
+def ewm_history(span: float) -> int:
+    """Barres après lesquelles le poids du passé dans ewm(span=span) passe sous l'epsilon float64"""
+    return math.ceil(math.log(np.finfo(np.float64).eps) / math.log(1 - 2 / (span + 1)))
+
+
+# 1. Volatilité et ATR (Average True Range)
+@indicator('true_range', ('high', 'low', 'close'), internal=True)
+def _true_range(df):
+    # fmax ignore les NaN comme max(axis=1): close précédent absent -> high - low
+    return np.fmax(np.fmax(
+        df['high'] - df['low'],
+        abs(df['high'] - df['close'].shift())),
+        abs(df['low'] - df['close'].shift())
+    )
+
+
+@indicator('atr', ('true_range',), warmup=13)
+def _atr(df):
+    return df['true_range'].rolling(14).mean()
+
+
+@indicator('returns', ('close',), warmup=1)
+def _returns(df):
+    # Sans report du close précédent: rendement NaN après une barre
+    # manquante, comme StreamingIndicators
+    return df['close'].pct_change(fill_method=None)
+
+
+@indicator('volatility', ('returns',), warmup=19)
+def _volatility(df):
+    return df['returns'].rolling(20).std() * np.sqrt(365 * 24)
+
+
+@indicator('vol_percentile', ('volatility',), warmup=99)
+def _vol_percentile(df):
+    return df['volatility'].rolling(100).rank(pct=True) * 100
+
+
+# 2. RSI (Relative Strength Index)
+@indicator('rsi', ('close',), warmup=13)
+def _rsi(df):
+    delta = df['close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+# 3. MACD
+@indicator('ema_12', ('close',), history=ewm_history(12))
+def _ema_12(df):
+    return df['close'].ewm(span=12).mean()
+
+
+@indicator('ema_26', ('close',), history=ewm_history(26))
+def _ema_26(df):
+    return df['close'].ewm(span=26).mean()
+
+
+@indicator('macd', ('ema_12', 'ema_26'))
+def _macd(df):
+    return df['ema_12'] - df['ema_26']
+
+
+@indicator('macd_signal', ('macd',), history=ewm_history(9))
+def _macd_signal(df):
+    return df['macd'].ewm(span=9).mean()
+
+
+@indicator('macd_hist', ('macd', 'macd_signal'))
+def _macd_hist(df):
+    return df['macd'] - df['macd_signal']
+
+
+# 4. Moyennes mobiles
+@indicator('sma_20', ('close',), warmup=19)
+def _sma_20(df):
+    return df['close'].rolling(20).mean()
+
+
+@indicator('sma_50', ('close',), warmup=49)
+def _sma_50(df):
+    return df['close'].rolling(50).mean()
+
+
+# 5. Bandes de Bollinger (milieu = SMA 20, calculée une seule fois)
+@indicator('bb_middle', ('sma_20',))
+def _bb_middle(df):
+    return df['sma_20']
+
+
+@indicator('bb_std', ('close',), warmup=19, internal=True)
+def _bb_std(df):
+    return df['close'].rolling(20).std()
+
+
+@indicator('bb_upper', ('bb_middle', 'bb_std'))
+def _bb_upper(df):
+    return df['bb_middle'] + (df['bb_std'] * 2)
+
+
+@indicator('bb_lower', ('bb_middle', 'bb_std'))
+def _bb_lower(df):
+    return df['bb_middle'] - (df['bb_std'] * 2)
+
+
+@indicator('bb_width', ('bb_upper', 'bb_lower', 'bb_middle'))
+def _bb_width(df):
+    return (df['bb_upper'] - df['bb_lower']) / df['bb_middle']
+
+
+# 6. Indicateurs de volume
+@indicator('volume_sma', ('volume',), warmup=19)
+def _volume_sma(df):
+    return df['volume'].rolling(20).mean()
+
+
+@indicator('volume_ratio', ('volume', 'volume_sma'))
+def _volume_ratio(df):
+    return df['volume'] / df['volume_sma']
+
+
+# 7. Support et résistance approchés
+@indicator('support', ('low',), warmup=19)
+def _support(df):
+    return df['low'].rolling(20).min()
+
+
+@indicator('resistance', ('high',), warmup=19)
+def _resistance(df):
+    return df['high'].rolling(20).max()
+
+
+@indicator('price_position', ('close', 'support', 'resistance'))
+def _price_position(df):
+    return (df['close'] - df['support']) / (df['resistance'] - df['support'])
+
+
+# 8. Indicateurs personnalisés pour straddle
+@indicator('price_range_pct', ('high', 'low', 'close'))
+def _price_range_pct(df):
+    return (df['high'] - df['low']) / df['close']
+
+
+@indicator('volatility_rank', ('volatility',), warmup=251)
+def _volatility_rank(df):
+    return df['volatility'].rolling(252).rank(pct=True) * 100
+
+
+def resolve_indicators(features: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Indicateurs à calculer pour features, dépendances comprises, dans
+    l'ordre du registre (tous les indicateurs si features est None)
+    """
+    if features is None:
+        return list(INDICATORS)
+
+    needed = set()
+    pending = [name for name in features if name not in OHLCV_COLUMNS]
+    while pending:
+        name = pending.pop()
+        if name in needed:
+            continue
+        if name not in INDICATORS:
+            raise ValueError(f"Indicateur inconnu: {name}")
+        needed.add(name)
+        pending.extend(i for i in INDICATORS[name].inputs if i not in OHLCV_COLUMNS)
+    return [name for name in INDICATORS if name in needed]
+
+
+def warmup_bars(features: Optional[Iterable[str]] = None) -> int:
+    """Barres de chauffe des indicateurs de features (NaN en tête des colonnes)"""
+    total: Dict[str, int] = {}
+    for name in resolve_indicators(features):
+        spec = INDICATORS[name]
+        total[name] = spec.warmup + max((total[i] for i in spec.inputs if i in total), default=0)
+    return max(total.values(), default=0)
+
+
+def history_bars(features: Optional[Iterable[str]] = None) -> int:
+    """
+    Barres à lire avant une période pour que les indicateurs de features y
+    égalent, à l'arrondi près, le calcul sur tout l'historique: chauffe
+    plus convergence des moyennes exponentielles
+    """
+    total: Dict[str, int] = {}
+    for name in resolve_indicators(features):
+        spec = INDICATORS[name]
+        total[name] = spec.warmup + spec.history + max((total[i] for i in spec.inputs if i in total), default=0)
+    return max(total.values(), default=0)
+
+
+def compute_indicators(df: pd.DataFrame, features: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Ajoute à df (modifié en place) les indicateurs de features et leurs
+    dépendances, tous les indicateurs du registre si features est None
+
+    Returns:
+        df, colonnes OHLCV puis indicateurs dans l'ordre du registre
+        (intermédiaires internes supprimés)
+    """
+    names = resolve_indicators(features)
+    for name in names:
+        df[name] = INDICATORS[name].compute(df)
+    internal = [name for name in names if INDICATORS[name].internal]
+    if internal:
+        df.drop(internal, axis=1, inplace=True)
+    return df
+
+
+def compute_indicator_panel(
+    fields: Mapping[str, pd.DataFrame],
+    features: Optional[Iterable[str]] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Indicateurs de features pour tous les symboles à la fois
+
+    Chaque calcul porte sur un DataFrame temps x symbole (une colonne par
+    symbole, NaN aux barres manquantes): une passe vectorisée par
+    indicateur au lieu d'une par symbole. Une fenêtre glissante qui
+    recouvre une barre manquante donne NaN.
+
+    Args:
+        fields: Colonnes OHLCV, DataFrames temps x symbole de même forme
+        features: Colonnes lues par la stratégie (tous les indicateurs si None)
+
+    Returns:
+        Dictionnaire {indicateur: DataFrame temps x symbole}, dans l'ordre
+        du registre (intermédiaires internes exclus)
+    """
+    names = resolve_indicators(features)
+    columns = dict(fields)
+    for name in names:
+        columns[name] = INDICATORS[name].compute(columns)
+    return {name: columns[name] for name in names if not INDICATORS[name].internal}
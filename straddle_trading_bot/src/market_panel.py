@@ -0,0 +1,159 @@
+# Panel multi-symboles: barres de plusieurs paires alignées sur une grille
+# de dates commune, une matrice temps x symbole par colonne
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from .indicator_registry import OHLCV_COLUMNS, compute_indicator_panel
+
+
+class MarketPanel:
+    """
+    Barres OHLCV et indicateurs de plusieurs symboles sur une grille commune
+
+    Chaque colonne (close, rsi...) est une matrice temps x symbole en ordre
+    Fortran: la série d'un symbole est contiguë, ce qui permet de lui
+    donner un DataFrame sans copie (symbol_frame). Les barres absentes d'un
+    symbole valent NaN et sont marquées False dans present; ready marque en
+    plus les barres dont tous les indicateurs sont définis (chauffe et
+    fenêtres recouvrant une barre manquante exclues).
+    """
+
+    def __init__(
+        self,
+        index: pd.DatetimeIndex,
+        symbols: Iterable[str],
+        fields: Mapping[str, np.ndarray],
+        present: np.ndarray
+    ):
+        self.index = index
+        self.symbols: List[str] = list(symbols)
+        self.fields: Dict[str, np.ndarray] = dict(fields)
+        self.present = present
+        self.ready = self._ready_mask()
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Mapping[str, pd.DataFrame],
+        bar_duration: Optional[pd.Timedelta] = None,
+        columns: Iterable[str] = OHLCV_COLUMNS
+    ) -> 'MarketPanel':
+        """
+        Aligne des DataFrames OHLCV (un par symbole, index trié sans doublon)
+
+        Args:
+            frames: {symbole: barres}
+            bar_duration: Pas de la grille; grille régulière de la première à
+                la dernière barre (les barres absentes de tous les symboles
+                y figurent aussi). Union des index si None.
+            columns: Colonnes reprises dans le panel
+
+        Returns:
+            MarketPanel sans indicateurs (voir compute_indicators)
+        """
+        columns = tuple(columns)
+        symbols = list(frames)
+        non_empty = [frame.index for frame in frames.values() if len(frame)]
+        if not non_empty:
+            index = pd.DatetimeIndex([])
+        elif bar_duration is not None:
+            index = pd.date_range(min(i[0] for i in non_empty), max(i[-1] for i in non_empty), freq=bar_duration)
+        else:
+            index = non_empty[0].append(non_empty[1:]).unique().sort_values()
+        if non_empty:
+            index = index.rename(non_empty[0].name)
+
+        shape = (len(index), len(symbols))
+        fields = {name: np.full(shape, np.nan, order='F') for name in columns}
+        present = np.zeros(shape, dtype=bool, order='F')
+        for j, frame in enumerate(frames.values()):
+            rows = index.get_indexer(frame.index)
+            # Barres hors grille (pas irrégulier): ignorées plutôt que décalées
+            on_grid = rows >= 0
+            rows = rows[on_grid]
+            present[rows, j] = True
+            for name in columns:
+                fields[name][rows, j] = frame[name].to_numpy(dtype=np.float64)[on_grid]
+        return cls(index, symbols, fields, present)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.fields)
+
+    def field(self, name: str) -> pd.DataFrame:
+        """Colonne name en DataFrame temps x symbole (vue sans copie)"""
+        return pd.DataFrame(self.fields[name], index=self.index, columns=self.symbols, copy=False)
+
+    def compute_indicators(self, features: Optional[Iterable[str]] = None) -> 'MarketPanel':
+        """
+        Ajoute les indicateurs de features pour tous les symboles en une passe
+        (indicator_registry.compute_indicator_panel), tous si features est None
+
+        Returns:
+            self (ready recalculé)
+        """
+        ohlcv = {name: self.field(name) for name in OHLCV_COLUMNS}
+        for name, values in compute_indicator_panel(ohlcv, features).items():
+            self.fields[name] = np.asfortranarray(np.asarray(values, dtype=self.fields['close'].dtype))
+        self.ready = self._ready_mask()
+        return self
+
+    def _ready_mask(self) -> np.ndarray:
+        """Barres présentes dont toutes les colonnes sont définies"""
+        ready = self.present.copy(order='F')
+        for values in self.fields.values():
+            ready &= ~np.isnan(values)
+        return ready
+
+    def symbol_frame(self, symbol: str) -> pd.DataFrame:
+        """
+        Barres prêtes d'un symbole, colonnes OHLCV puis indicateurs
+
+        Vue sans copie des matrices du panel quand les barres prêtes sont
+        contiguës (cas sans trou); sinon seules les barres prêtes sont
+        copiées, comme le nettoyage de DataManager.get_market_data.
+        """
+        j = self.symbols.index(symbol)
+        ready = self.ready[:, j]
+        rows = np.flatnonzero(ready)
+        if len(rows) == 0:
+            return pd.DataFrame(columns=self.columns, index=self.index[:0])
+        start, end = rows[0], rows[-1] + 1
+        if len(rows) == end - start:
+            selection = slice(start, end)
+        else:
+            selection = rows
+        return pd.DataFrame(
+            {name: values[selection, j] for name, values in self.fields.items()},
+            index=self.index[selection], copy=False
+        )
+
+    def window(self, start, end) -> 'MarketPanel':
+        """Panel restreint à [start, end) (vues sans copie)"""
+        first, last = self.index.searchsorted([pd.Timestamp(start), pd.Timestamp(end)])
+        return MarketPanel(
+            self.index[first:last], self.symbols,
+            {name: values[first:last] for name, values in self.fields.items()},
+            self.present[first:last]
+        )
+
+    def astype(self, dtype) -> 'MarketPanel':
+        """Copie du panel aux colonnes en dtype (float32 du mode compact)"""
+        return MarketPanel(
+            self.index, self.symbols,
+            {name: np.asfortranarray(values, dtype=dtype) for name, values in self.fields.items()},
+            self.present
+        )
+
+    def missing_bars(self) -> Dict[str, int]:
+        """Barres manquantes de chaque symbole entre sa première et sa dernière barre"""
+        counts = {}
+        for j, symbol in enumerate(self.symbols):
+            rows = np.flatnonzero(self.present[:, j])
+            counts[symbol] = int(rows[-1] - rows[0] + 1 - len(rows)) if len(rows) else 0
+        return counts
@@ -0,0 +1,306 @@
+# Cache disque des données OHLCV brutes, partagé entre les runs
+# Une colonne binaire mappée en mémoire par champ + un manifeste JSON par
+# (exchange, symbole, timeframe)
+
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .ohlcv_resampler import resample_ohlcv
+except ImportError:  # importé hors package via fake_exchange (prototypes)
+    from ohlcv_resampler import resample_ohlcv
+
+# Colonnes binaires brutes lues par np.memmap; les caches 'parquet' / 'npz'
+# des versions précédentes restent lisibles et sont convertis à la prochaine écriture
+CACHE_FORMAT = 'mmap'
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+COLUMN_DTYPES = {'timestamp': np.dtype('<i8'), **{name: np.dtype('<f8') for name in OHLCV_COLUMNS}}
+
+logger = logging.getLogger(__name__)
+
+# Caches ouverts dans le processus, par manifeste (OHLCVCache.shared)
+_shared_caches: Dict[Path, 'OHLCVCache'] = {}
+
+
+class OHLCVCache:
+    """
+    Barres OHLCV d'un marché conservées sur disque entre les runs
+
+    Les barres sont stockées en colonnes (timestamp en int64 ms puis OHLCV en
+    float64), triées et sans doublons, un fichier binaire brut par colonne
+    mappé en mémoire: ouvrir un historique de plusieurs années ne lit rien
+    du disque, read() localise la période par recherche dichotomique sur
+    les timestamps et renvoie des vues sans copie. Seules les pages lues
+    occupent la mémoire (cache du système, partagé entre processus), d'où
+    des historiques plus grands que la RAM. Le manifeste JSON décrit les
+    plages [début, fin) déjà téléchargées: seules les plages manquantes
+    (fin de période, trous) doivent être récupérées, et le cache se lit
+    hors ligne.
+
+    Le manifeste fait foi (nombre de barres, génération des fichiers): les
+    barres ajoutées en fin de série sont écrites à la suite des colonnes
+    existantes, toute autre écriture produit une nouvelle génération de
+    fichiers; le manifeste n'est remplacé (renommage atomique) qu'ensuite,
+    de sorte qu'un run interrompu ne laisse jamais un cache partiel.
+
+    read(..., timeframe=...) agrège localement la série vers un timeframe
+    plus long (une série 1m sert 5m, 1h, 1d...); ces vues sont mémorisées
+    jusqu'au prochain ajout de barres.
+    """
+
+    def __init__(self, cache_dir: str, exchange_id: str, symbol: str, timeframe: str):
+        self.cache_dir = Path(cache_dir)
+        self.exchange_id = exchange_id
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.key = '_'.join(
+            part.replace('/', '-').replace(':', '-') for part in (exchange_id, symbol, timeframe)
+        )
+        self.manifest_path = self.cache_dir / f"{self.key}.json"
+        self.manifest = self._read_manifest()
+        self._bars: Optional[pd.DataFrame] = None
+        self._views: Dict[Tuple[str, int, int], pd.DataFrame] = {}
+
+    @classmethod
+    def shared(cls, cache_dir: str, exchange_id: str, symbol: str, timeframe: str) -> 'OHLCVCache':
+        """
+        Instance partagée dans le processus: barres chargées et vues agrégées
+        réutilisées d'un DataManager à l'autre (changement de timeframe,
+        balayages multi-timeframes). Rouverte si le manifeste sur disque a
+        changé (autre processus).
+        """
+        cache = cls(cache_dir, exchange_id, symbol, timeframe)
+        path = cache.manifest_path.resolve()
+        previous = _shared_caches.get(path)
+        if previous is not None and previous.manifest == cache.manifest:
+            return previous
+        _shared_caches[path] = cache
+        return cache
+
+    @property
+    def data_path(self) -> Path:
+        """Fichier des barres (répertoire des colonnes en format 'mmap')"""
+        return self.cache_dir / f"{self.key}.{self.manifest['format']}"
+
+    def _column_path(self, name: str, generation: int) -> Path:
+        return self.cache_dir / f"{self.key}.mmap" / f"{name}.{generation}.bin"
+
+    def _empty_manifest(self) -> dict:
+        return {
+            'exchange_id': self.exchange_id,
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'format': CACHE_FORMAT,
+            'n_bars': 0,
+            'generation': 0,
+            'first_timestamp': None,
+            'last_timestamp': None,
+            'covered': [],
+            'updated_at': None
+        }
+
+    def _read_manifest(self) -> dict:
+        if not self.manifest_path.exists():
+            return self._empty_manifest()
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Manifeste de cache illisible ({self.manifest_path}): {e}")
+            return self._empty_manifest()
+
+        market = (manifest.get('exchange_id'), manifest.get('symbol'), manifest.get('timeframe'))
+        if market != (self.exchange_id, self.symbol, self.timeframe):
+            logger.warning(f"⚠️ Manifeste de cache d'un autre marché ignoré: {self.manifest_path}")
+            return self._empty_manifest()
+        return manifest
+
+    def covered_ranges(self) -> List[Tuple[int, int]]:
+        """Plages [début, fin) en ms déjà téléchargées"""
+        return [(int(start), int(end)) for start, end in self.manifest['covered']]
+
+    def missing_ranges(self, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        """Plages [début, fin) de [start_ms, end_ms) absentes du cache"""
+        missing = []
+        cursor = start_ms
+        for covered_start, covered_end in self.covered_ranges():
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end_ms:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end_ms:
+            missing.append((cursor, end_ms))
+        return missing
+
+    def load(self) -> pd.DataFrame:
+        """
+        Toutes les barres du cache (colonnes timestamp en ms puis OHLCV)
+
+        En format 'mmap', les colonnes sont des vues sur les fichiers mappés
+        (copie à l'écriture: modifier le DataFrame ne modifie pas le cache).
+        """
+        if self._bars is not None:
+            return self._bars
+        bars = None
+        if self.manifest['n_bars'] and self.data_path.exists():
+            try:
+                if self.manifest['format'] == 'mmap':
+                    bars = pd.DataFrame({
+                        name: np.memmap(
+                            self._column_path(name, self.manifest['generation']), dtype=dtype,
+                            mode='c', shape=(self.manifest['n_bars'],)
+                        ).view(np.ndarray)
+                        for name, dtype in COLUMN_DTYPES.items()
+                    }, copy=False)
+                elif self.manifest['format'] == 'parquet':
+                    bars = pd.read_parquet(self.data_path)
+                else:
+                    with np.load(self.data_path) as columns:
+                        bars = pd.DataFrame({name: columns[name] for name in ('timestamp',) + OHLCV_COLUMNS})
+            except Exception as e:
+                logger.warning(f"⚠️ Cache OHLCV illisible ({self.data_path}), reconstruit: {e}")
+                self.manifest = self._empty_manifest()
+        self._bars = bars if bars is not None else _empty_bars()
+        return self._bars
+
+    def read(self, start_ms: int, end_ms: int, timeframe: Optional[str] = None) -> pd.DataFrame:
+        """
+        Barres du cache sur [start_ms, end_ms)
+
+        Args:
+            start_ms: Début de la période
+            end_ms: Fin exclue de la période
+            timeframe: Timeframe plus long agrégé localement (celui du cache
+                par défaut); seules les barres dont la période est
+                entièrement téléchargée sont renvoyées
+
+        Returns:
+            pd.DataFrame OHLCV indexé par timestamp (datetime), comme
+            DataManager._convert_to_dataframe; sans agrégation, les colonnes
+            sont des vues sur le cache (seul l'index est construit)
+        """
+        if timeframe is not None and timeframe != self.timeframe:
+            key = (timeframe, start_ms, end_ms)
+            if key not in self._views:
+                bars = self.load()
+                parts = [
+                    resample_ohlcv(bars, timeframe, self.timeframe, max(start_ms, covered_start), min(end_ms, covered_end))
+                    for covered_start, covered_end in self.covered_ranges()
+                    if covered_start < end_ms and covered_end > start_ms
+                ]
+                self._views[key] = pd.concat(parts) if parts else resample_ohlcv(bars.iloc[:0], timeframe, self.timeframe)
+            return self._views[key].copy()
+
+        bars = self.load()
+        timestamps = bars['timestamp'].to_numpy()
+        lo, hi = np.searchsorted(timestamps, [start_ms, end_ms])
+        return pd.DataFrame(
+            {name: bars[name].to_numpy()[lo:hi] for name in OHLCV_COLUMNS},
+            index=pd.DatetimeIndex(pd.to_datetime(timestamps[lo:hi], unit='ms'), name='timestamp'),
+            copy=False
+        )
+
+    def append(self, rows: Iterable, start_ms: int, end_ms: int):
+        """
+        Ajoute des barres téléchargées et marque [start_ms, end_ms) comme couverte
+
+        Args:
+            rows: Barres ccxt [timestamp, open, high, low, close, volume]
+            start_ms: Début de la plage téléchargée
+            end_ms: Fin (exclue) de la plage réellement couverte
+        """
+        new_bars = pd.DataFrame(list(rows), columns=('timestamp',) + OHLCV_COLUMNS)
+        new_bars = new_bars.astype({'timestamp': np.int64, **{name: np.float64 for name in OHLCV_COLUMNS}})
+        new_bars = new_bars[(new_bars['timestamp'] >= start_ms) & (new_bars['timestamp'] < end_ms)]
+        if end_ms <= start_ms and new_bars.empty:
+            return
+        new_bars = new_bars.drop_duplicates('timestamp', keep='last').sort_values('timestamp', ignore_index=True)
+
+        bars = self.load()
+        self.manifest['covered'] = _merge_ranges(self.covered_ranges() + [(start_ms, max(start_ms, end_ms))])
+        if (self.manifest['format'] == CACHE_FORMAT and len(bars)
+                and (new_bars.empty or new_bars['timestamp'].iloc[0] > self.manifest['last_timestamp'])):
+            self._append_columns(new_bars)
+            return
+
+        bars = pd.concat([bars, new_bars], ignore_index=True)
+        bars = bars.drop_duplicates('timestamp', keep='last').sort_values('timestamp', ignore_index=True)
+        self._write(bars)
+
+    def _append_columns(self, new_bars: pd.DataFrame):
+        """Écrit des barres postérieures à la dernière à la suite des colonnes"""
+        n_bars = self.manifest['n_bars']
+        for name, dtype in COLUMN_DTYPES.items():
+            with open(self._column_path(name, self.manifest['generation']), 'r+b') as f:
+                # Octets d'un ajout interrompu (absent du manifeste) écrasés
+                f.truncate(n_bars * dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                new_bars[name].to_numpy(dtype=dtype).tofile(f)
+        if len(new_bars):
+            self.manifest['last_timestamp'] = int(new_bars['timestamp'].iloc[-1])
+        self._commit(n_bars + len(new_bars))
+
+    def _write(self, bars: pd.DataFrame):
+        """Réécrit toutes les colonnes dans une nouvelle génération de fichiers"""
+        stale = [self.data_path] if self.manifest['format'] != CACHE_FORMAT else [
+            self._column_path(name, self.manifest['generation']) for name in COLUMN_DTYPES
+        ]
+        generation = self.manifest.get('generation', 0) + 1
+        self._column_path('timestamp', generation).parent.mkdir(parents=True, exist_ok=True)
+        for name, dtype in COLUMN_DTYPES.items():
+            bars[name].to_numpy(dtype=dtype).tofile(self._column_path(name, generation))
+
+        self.manifest['format'] = CACHE_FORMAT
+        self.manifest['generation'] = generation
+        self.manifest['first_timestamp'] = int(bars['timestamp'].iloc[0]) if len(bars) else None
+        self.manifest['last_timestamp'] = int(bars['timestamp'].iloc[-1]) if len(bars) else None
+        self._commit(len(bars))
+
+        # Anciens fichiers supprimés une fois le manifeste remplacé (les
+        # vues déjà mappées restent valides)
+        for path in stale:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _commit(self, n_bars: int):
+        """Remplace le manifeste: les barres écrites deviennent visibles"""
+        self.manifest['n_bars'] = n_bars
+        self.manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        tmp_manifest = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        tmp_manifest.write_text(json.dumps(self.manifest, indent=2), encoding='utf-8')
+        os.replace(tmp_manifest, self.manifest_path)
+
+        self._bars = None
+        self._views.clear()
+        logger.debug(f"💾 Cache OHLCV {self.key}: {n_bars} barres")
+
+
+def _empty_bars() -> pd.DataFrame:
+    return pd.DataFrame({
+        'timestamp': np.empty(0, dtype=np.int64),
+        **{name: np.empty(0, dtype=np.float64) for name in OHLCV_COLUMNS}
+    })
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[List[int]]:
+    """Fusionne des plages [début, fin) qui se chevauchent ou se touchent"""
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
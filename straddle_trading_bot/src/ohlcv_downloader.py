@@ -0,0 +1,174 @@
+# Téléchargement concurrent de l'historique OHLCV
+# Fenêtres de temps récupérées en parallèle, débit limité par token bucket
+#
+# Module sans dépendance au package (ni config ni import relatif) afin de
+# pouvoir être partagé par le prototype test4/.
+
+import time
+import asyncio
+import logging
+import ccxt
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadAborted(Exception):
+    """Fenêtre abandonnée après l'échec d'une autre fenêtre"""
+
+
+class TokenBucket:
+    """
+    Limiteur de débit: rate requêtes par seconde, rafales de capacity requêtes
+
+    Un jeton se régénère tous les 1/rate secondes; acquire() attend qu'un
+    jeton soit disponible. rate=None désactive la limite.
+    """
+
+    def __init__(self, rate: Optional[float], capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def timeframe_ms(timeframe: str) -> int:
+    """Durée d'une barre en millisecondes ('1m', '1h', '1d'...)"""
+    return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+
+
+async def download_ohlcv_async(
+    exchange,
+    symbol: str,
+    timeframe: str,
+    start_ms: int,
+    end_ms: int,
+    limit: int = 1000,
+    concurrency: int = 8,
+    requests_per_second: Optional[float] = None,
+    max_retries: int = 5,
+    backoff: float = 0.25
+) -> Tuple[List[list], int]:
+    """
+    Télécharge les barres de [start_ms, end_ms) par fenêtres concurrentes
+
+    La période est découpée en fenêtres de limit barres, récupérées en
+    parallèle (au plus concurrency fenêtres en cours). Une fenêtre dont
+    l'exchange renvoie moins de barres que demandé est complétée par des
+    requêtes successives. Les erreurs réseau (ccxt.NetworkError, dont les
+    limites de débit) sont réessayées avec un backoff exponentiel; dès
+    qu'une fenêtre épuise ses tentatives (exchange injoignable), les autres
+    fenêtres s'arrêtent au lieu de réessayer à leur tour.
+
+    Args:
+        exchange: Client ccxt, asynchrone (ccxt.async_support) ou synchrone
+            (requêtes exécutées dans des threads)
+        symbol: Symbole du marché
+        timeframe: Timeframe ccxt
+        start_ms: Début de la période (ms)
+        end_ms: Fin exclue de la période (ms)
+        limit: Barres par requête
+        concurrency: Requêtes simultanées maximum
+        requests_per_second: Débit maximum (1000 / exchange.rateLimit par défaut)
+        max_retries: Nouvelles tentatives par requête
+        backoff: Délai initial en secondes, doublé à chaque tentative
+
+    Returns:
+        Tuple (barres ccxt triées par timestamp et sans doublons, fin en ms
+        de la plage réellement couverte: end_ms sauf fenêtre en échec)
+    """
+    if end_ms <= start_ms:
+        return [], end_ms
+
+    if requests_per_second is None and getattr(exchange, 'rateLimit', None):
+        requests_per_second = 1000 / exchange.rateLimit
+    bucket = TokenBucket(requests_per_second, capacity=concurrency)
+    in_flight = asyncio.Semaphore(max(1, concurrency))
+    is_async = asyncio.iscoroutinefunction(exchange.fetch_ohlcv)
+    aborted = asyncio.Event()
+
+    async def request(since: int) -> list:
+        for attempt in range(max_retries + 1):
+            if not aborted.is_set():
+                await bucket.acquire()
+            if aborted.is_set():
+                raise DownloadAborted(f"Téléchargement interrompu avant {since}")
+            try:
+                if is_async:
+                    return await exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+                return await asyncio.to_thread(exchange.fetch_ohlcv, symbol, timeframe, since=since, limit=limit)
+            except ccxt.NetworkError as e:
+                if attempt == max_retries:
+                    aborted.set()
+                    raise
+                delay = backoff * 2 ** attempt
+                logger.debug(f"🔁 Requête {since} réessayée dans {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+
+    async def fetch_window(window_start: int, window_end: int) -> list:
+        # Sémaphore par fenêtre et non par requête: seules les fenêtres en
+        # cours attendent un jeton, une requête réessayée ne repasse pas
+        # derrière toutes les autres fenêtres (un millier pour une série 1m)
+        async with in_flight:
+            rows = []
+            since = window_start
+            while since < window_end:
+                chunk = await request(since)
+                if not chunk:
+                    break
+                rows.extend(row for row in chunk if since <= row[0] < window_end)
+                next_since = chunk[-1][0] + bar_ms
+                if next_since <= since or next_since >= window_end:
+                    break
+                since = next_since
+            return rows
+
+    bar_ms = timeframe_ms(timeframe)
+    span = limit * bar_ms
+    windows = [(start, min(start + span, end_ms)) for start in range(start_ms, end_ms, span)]
+    results = await asyncio.gather(
+        *(fetch_window(start, end) for start, end in windows), return_exceptions=True
+    )
+
+    # Assemblage dans l'ordre des fenêtres, jusqu'à la première en échec
+    by_timestamp = {}
+    reached_ms = end_ms
+    for (window_start, _), rows in zip(windows, results):
+        if isinstance(rows, BaseException):
+            logger.error(f"❌ Erreur récupération fenêtre {window_start}: {rows}")
+            reached_ms = window_start
+            break
+        for row in rows:
+            by_timestamp[row[0]] = row
+    return [by_timestamp[ts] for ts in sorted(by_timestamp)], reached_ms
+
+
+def download_ohlcv(exchange, symbol: str, timeframe: str, start_ms: int, end_ms: int, **kwargs) -> Tuple[List[list], int]:
+    """
+    Version synchrone de download_ohlcv_async (mêmes arguments)
+
+    Utilisable aussi depuis une boucle asyncio déjà active (notebook): le
+    téléchargement tourne alors dans un thread dédié.
+    """
+    coroutine = download_ohlcv_async(exchange, symbol, timeframe, start_ms, end_ms, **kwargs)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
@@ -0,0 +1,100 @@
+# Agrégation locale des barres OHLCV vers un timeframe plus long
+# Une seule série de base (1m) en cache, les autres timeframes en sont déduits
+#
+# Sans import relatif: chargé hors package par ohlcv_cache, lui-même importé
+# par fake_exchange depuis les prototypes.
+
+import ccxt
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Les barres hebdomadaires des exchanges s'ouvrent le lundi 00:00 UTC
+# (l'epoch Unix tombe un jeudi)
+WEEK_OFFSET_MS = 4 * 86_400_000
+
+
+def timeframe_ms(timeframe: str) -> int:
+    """Durée fixe d'une barre en ms (ValueError pour les mois, de durée variable)"""
+    if timeframe.endswith('M'):
+        raise ValueError(f"Timeframe {timeframe} de durée variable: agrégation locale impossible")
+    return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+
+
+def can_resample(base_timeframe: str, timeframe: str) -> bool:
+    """Vrai si timeframe se déduit de barres base_timeframe"""
+    try:
+        base_ms, target_ms = timeframe_ms(base_timeframe), timeframe_ms(timeframe)
+    except ValueError:
+        return False
+    return target_ms >= base_ms and target_ms % base_ms == 0
+
+
+def resample_ohlcv(
+    bars: pd.DataFrame,
+    timeframe: str,
+    base_timeframe: str = '1m',
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Agrège des barres base_timeframe en barres timeframe (vectorisé)
+
+    Les barres sont alignées comme celles des exchanges (multiples de la
+    durée depuis l'epoch UTC, lundi pour '1w'). Une barre dont la période
+    déborde de [start_ms, end_ms) est partielle et écartée (barre en cours
+    de formation, bord d'une plage téléchargée). Les trous de la série de
+    base sont conservés: une période sans aucune barre de base ne produit
+    pas de barre, une période incomplète agrège les barres présentes, comme
+    l'exchange le ferait pour une période sans transactions.
+
+    Args:
+        bars: Barres de base, colonnes timestamp (int ms, trié, sans
+            doublons) puis OHLCV, comme OHLCVCache.load()
+        timeframe: Timeframe cible ('5m', '15m', '1h', '4h', '1d', '1w')
+        base_timeframe: Timeframe des barres de base
+        start_ms: Début de la plage couverte (première barre par défaut)
+        end_ms: Fin exclue de la plage couverte (fin de la dernière barre par défaut)
+
+    Returns:
+        pd.DataFrame OHLCV indexé par timestamp (datetime), comme OHLCVCache.read
+    """
+    base_ms, target_ms = timeframe_ms(base_timeframe), timeframe_ms(timeframe)
+    if not can_resample(base_timeframe, timeframe):
+        raise ValueError(f"Timeframe {timeframe} non multiple de {base_timeframe}")
+    offset = WEEK_OFFSET_MS if target_ms == 7 * 86_400_000 else 0
+
+    timestamps = bars['timestamp'].to_numpy(dtype=np.int64)
+    if start_ms is None:
+        start_ms = int(timestamps[0]) if len(timestamps) else 0
+    if end_ms is None:
+        end_ms = int(timestamps[-1]) + base_ms if len(timestamps) else 0
+    # Seules les barres des périodes entièrement comprises dans [start_ms, end_ms)
+    first_bucket = -((offset - start_ms) // target_ms) * target_ms + offset
+    last_bucket_end = (end_ms - offset) // target_ms * target_ms + offset
+    lo, hi = np.searchsorted(timestamps, [first_bucket, last_bucket_end])
+    timestamps = timestamps[lo:hi]
+
+    if not len(timestamps):
+        return pd.DataFrame(
+            {name: np.empty(0) for name in OHLCV_COLUMNS},
+            index=pd.DatetimeIndex([], name='timestamp')
+        )
+
+    buckets = (timestamps - offset) // target_ms * target_ms + offset
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    columns = {name: bars[name].to_numpy(dtype=np.float64)[lo:hi] for name in OHLCV_COLUMNS}
+
+    return pd.DataFrame(
+        {
+            'open': columns['open'][starts],
+            'high': np.maximum.reduceat(columns['high'], starts),
+            'low': np.minimum.reduceat(columns['low'], starts),
+            'close': columns['close'][ends],
+            'volume': np.add.reduceat(columns['volume'], starts)
+        },
+        index=pd.DatetimeIndex(pd.to_datetime(buckets[starts], unit='ms'), name='timestamp')
+    )
@@ -0,0 +1,254 @@
+# Balayage de paramètres de la stratégie straddle en parallèle
+# Backtests répartis sur un pool de processus, une StrategyConfig par run
+
+import os
+import itertools
+import logging
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .config import *
+from .straddle_strategy import StraddleStrategy
+from .batch_backtest import batch_key, run_batch_backtest
+from .shared_market_data import SharedMarketData, SharedMarketDataHandle, attach_market_data
+
+# Paramètres de stratégie modifiables par le balayage (noms des constantes de config.py)
+SWEEP_PARAMETERS = (
+    'VOLATILITY_THRESHOLD',
+    'MIN_SIGNAL_QUALITY',
+    'MIN_VOLUME_RATIO',
+    'MAX_PRICE_RANGE',
+    'TAKE_PROFIT_MULTIPLIER',
+    'STOP_LOSS_MULTIPLIER',
+    'TRADE_TIMEOUT_HOURS',
+    'DYNAMIC_STOP_LOSS',
+    'RISK_PER_TRADE',
+    'MAX_POSITIONS',
+    'MAX_DAILY_LOSS',
+    'MAX_CONSECUTIVE_LOSSES',
+    'ENABLE_HEDGING',
+    'HEDGE_THRESHOLD',
+    'MAX_HEDGE_RATIO',
+    'DEFAULT_EXPIRY_DAYS',
+    'MIN_TIME_TO_EXPIRY',
+    'ADAPTIVE_POSITION_SIZING',
+    'TREND_FILTER',
+    'RSI_FILTER_MIN',
+    'RSI_FILTER_MAX'
+)
+
+# Grille par défaut: seuil d'entrée, TP/SL, risque, hedge et timeout
+DEFAULT_GRID = {
+    'VOLATILITY_THRESHOLD': [40, 55, 70],
+    'TAKE_PROFIT_MULTIPLIER': [1.2, 1.3, 1.5],
+    'STOP_LOSS_MULTIPLIER': [0.5, 0.6, 0.8],
+    'RISK_PER_TRADE': [0.008, 0.012, 0.02],
+    'HEDGE_THRESHOLD': [0.02, 0.03],
+    'TRADE_TIMEOUT_HOURS': [24, 36, 48]
+}
+
+# Données de marché et configuration de base du processus worker, reçues
+# une seule fois à son démarrage
+_worker_data: Optional[pd.DataFrame] = None
+_worker_config: Optional[StrategyConfig] = None
+
+logger = logging.getLogger(__name__)
+
+
+def expand_grid(grid: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    """
+    Développe une grille {paramètre: valeurs} en liste de jeux de paramètres
+
+    Returns:
+        Produit cartésien des valeurs, dans l'ordre des clés de la grille
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def profile_param_sets(names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Jeux de paramètres des profils prédéfinis de config.PROFILES"""
+    names = list(names) if names is not None else list(PROFILES)
+    unknown = [name for name in names if name not in PROFILES]
+    if unknown:
+        raise ValueError(f"Profils inconnus: {unknown}")
+    return {name: dict(PROFILES[name]) for name in names}
+
+
+def validate_param_set(params: Dict[str, Any]):
+    """Vérifie qu'un jeu de paramètres ne contient que des paramètres balayables"""
+    unknown = [name for name in params if name not in SWEEP_PARAMETERS]
+    if unknown:
+        raise ValueError(f"Paramètres non balayables: {unknown}")
+
+
+def run_single_backtest(
+    data: pd.DataFrame,
+    params: Dict[str, Any],
+    engine: str = 'numpy',
+    base_config: Optional[StrategyConfig] = None
+) -> Dict[str, Any]:
+    """
+    Lance un backtest avec un jeu de paramètres appliqué à base_config
+
+    Sans état global: utilisable depuis plusieurs threads à la fois.
+
+    Returns:
+        Paramètres suivis des performance_metrics du backtest
+    """
+    validate_param_set(params)
+    config = (base_config or StrategyConfig()).replace(**params)
+    results = StraddleStrategy(config).run_backtest(data, engine=engine)
+    return {**params, **results['performance_metrics']}
+
+
+def run_batch_group(
+    data: pd.DataFrame,
+    param_sets: List[Dict[str, Any]],
+    base_config: Optional[StrategyConfig] = None
+) -> List[Dict[str, Any]]:
+    """
+    Lance en une seule passe (run_batch_backtest) des jeux de paramètres
+    qui ne diffèrent que par batch_backtest.BATCH_PARAMETERS
+
+    Returns:
+        Lignes paramètres + performance_metrics, dans l'ordre de param_sets
+    """
+    for params in param_sets:
+        validate_param_set(params)
+    base_config = base_config or StrategyConfig()
+    configs = [base_config.replace(**params) for params in param_sets]
+    results = run_batch_backtest(data, configs)
+    return [{**params, **result['performance_metrics']} for params, result in zip(param_sets, results)]
+
+
+def group_param_sets(
+    param_sets: List[Dict[str, Any]],
+    base_config: Optional[StrategyConfig] = None
+) -> List[List[int]]:
+    """Indices des jeux de paramètres regroupés par lot (mêmes paramètres hors lot)"""
+    base_config = base_config or StrategyConfig()
+    groups: Dict[StrategyConfig, List[int]] = {}
+    for index, params in enumerate(param_sets):
+        groups.setdefault(batch_key(base_config.replace(**params)), []).append(index)
+    return list(groups.values())
+
+
+def _init_worker(
+    data: Union[pd.DataFrame, SharedMarketDataHandle],
+    base_config: StrategyConfig,
+    log_level: int
+):
+    """Initialise un worker: données et configuration conservées pour tous ses backtests"""
+    global _worker_data, _worker_config
+    if isinstance(data, SharedMarketDataHandle):
+        data = attach_market_data(data)
+    _worker_data = data
+    _worker_config = base_config
+    logging.getLogger(StraddleStrategy.__module__).setLevel(log_level)
+
+
+def _run_in_worker(task):
+    params, engine = task
+    return run_single_backtest(_worker_data, params, engine, _worker_config)
+
+
+def _run_batch_in_worker(param_sets):
+    return run_batch_group(_worker_data, param_sets, _worker_config)
+
+
+def run_parameter_sweep(
+    data: pd.DataFrame,
+    param_sets: Union[Dict[str, Iterable[Any]], List[Dict[str, Any]]],
+    workers: Optional[int] = None,
+    engine: str = 'numpy',
+    log_level: int = logging.WARNING,
+    shared_memory: bool = True,
+    base_config: Optional[StrategyConfig] = None,
+    batch: bool = False
+) -> pd.DataFrame:
+    """
+    Lance les backtests d'un ensemble de jeux de paramètres sur un pool de processus
+
+    Les données de marché sont publiées une seule fois en mémoire partagée:
+    chaque worker ne reçoit que le handle du segment et lit les colonnes sans
+    copie (shared_memory=False: DataFrame picklé une fois par worker).
+    Chaque run construit sa StrategyConfig à partir de base_config: ni
+    config.py ni les modules ne sont modifiés.
+    
+    En mode batch, les jeux qui ne diffèrent que par le seuil de qualité et
+    les règles de sortie sont regroupés: chaque groupe est une seule passe
+    de run_batch_backtest (signaux et pricing partagés), et les groupes sont
+    répartis sur le pool.
+
+    Args:
+        data: Données de marché avec indicateurs (DataManager)
+        param_sets: Grille {paramètre: valeurs} ou liste de jeux de paramètres
+        workers: Nombre de processus (tous les cœurs par défaut, 1 = en processus)
+        engine: Moteur de backtest
+        log_level: Niveau de log de la stratégie pendant le balayage
+        shared_memory: Partager les données via multiprocessing.shared_memory
+        base_config: Configuration complétée par chaque jeu de paramètres
+            (StrategyConfig() par défaut)
+        batch: Regrouper les jeux de paramètres en backtests groupés
+            (engine ignoré)
+
+    Returns:
+        pd.DataFrame avec une ligne par jeu de paramètres: paramètres puis
+        métriques de performance
+    """
+    if isinstance(param_sets, dict):
+        param_sets = expand_grid(param_sets)
+    for params in param_sets:
+        validate_param_set(params)
+    base_config = base_config or StrategyConfig()
+
+    if batch:
+        groups = group_param_sets(param_sets, base_config)
+        tasks = [[param_sets[index] for index in group] for group in groups]
+    else:
+        tasks = [(params, engine) for params in param_sets]
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(tasks)) or 1
+    logger.info(f"🔁 Balayage de {len(param_sets)} jeux de paramètres "
+                f"({len(tasks)} tâches) sur {workers} processus")
+
+    if workers == 1:
+        strategy_logger = logging.getLogger(StraddleStrategy.__module__)
+        previous_level = strategy_logger.level
+        strategy_logger.setLevel(log_level)
+        try:
+            if batch:
+                outputs = [run_batch_group(data, task, base_config) for task in tasks]
+            else:
+                outputs = [run_single_backtest(data, params, engine, base_config) for params, engine in tasks]
+        finally:
+            strategy_logger.setLevel(previous_level)
+    else:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        shared = SharedMarketData(data) if shared_memory else None
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shared.handle if shared else data, base_config, log_level)
+            ) as executor:
+                outputs = list(executor.map(
+                    _run_batch_in_worker if batch else _run_in_worker, tasks, chunksize=chunksize
+                ))
+        finally:
+            if shared is not None:
+                shared.close()
+
+    if batch:
+        # Lignes remises dans l'ordre des jeux de paramètres
+        rows = [None] * len(param_sets)
+        for group, group_rows in zip(groups, outputs):
+            for index, row in zip(group, group_rows):
+                rows[index] = row
+    else:
+        rows = outputs
+
+    return pd.DataFrame(rows)
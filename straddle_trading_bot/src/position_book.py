@@ -0,0 +1,337 @@
+# Carnet de positions straddle en colonnes (struct-of-arrays)
+# Revalorisation et évaluation des règles de sortie de toutes les positions en une passe
+
+import numpy as np
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import *
+
+# Codes d'action, alignés sur les valeurs de TradeAction
+HOLD = 0
+TAKE_PROFIT = 1
+STOP_LOSS = 2
+TIME_DECAY = 3
+TIMEOUT = 4
+VOL_COLLAPSE = 5
+EXIT_REASONS = ('HOLD', 'TAKE_PROFIT', 'STOP_LOSS', 'TIME_DECAY', 'TIMEOUT', 'VOL_COLLAPSE')
+
+# Codes de confiance du signal d'entrée
+CONFIDENCE_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+class PositionBook:
+    """
+    Positions straddle ouvertes stockées en arrays NumPy parallèles
+
+    Chaque position occupe un slot; l'ajout est en O(1) amorti (capacité
+    doublée au besoin) et la suppression en O(1) par swap-remove: la dernière
+    position prend la place de celle supprimée. L'ordre des slots n'est donc
+    pas l'ordre d'ouverture, conservé dans la colonne seq.
+
+    Les horodatages sont en int64 nanosecondes. Les règles de hedge et de
+    sortie suivent la StrategyConfig du carnet (défauts de config.py).
+    """
+
+    def __init__(self, capacity: int = 8, config: Optional[StrategyConfig] = None):
+        capacity = max(1, capacity)
+        self.config = config or StrategyConfig()
+        self.size = 0
+        self.next_seq = 0
+
+        self.seq = np.empty(capacity, dtype=np.int64)
+        self.entry_time = np.empty(capacity, dtype=np.int64)
+        self.expiry_time = np.empty(capacity, dtype=np.int64)
+        self.entry_price = np.empty(capacity, dtype=np.float64)
+        self.strike = np.empty(capacity, dtype=np.float64)
+        self.contracts = np.empty(capacity, dtype=np.int64)
+        self.premium_paid = np.empty(capacity, dtype=np.float64)
+        self.entry_volatility = np.empty(capacity, dtype=np.float64)
+        self.confidence = np.empty(capacity, dtype=np.int8)
+        self.hedge_active = np.empty(capacity, dtype=bool)
+        self.hedge_count = np.empty(capacity, dtype=np.int64)
+        self.current_value = np.empty(capacity, dtype=np.float64)
+        self.unrealized_pnl = np.empty(capacity, dtype=np.float64)
+        self.pnl_percentage = np.empty(capacity, dtype=np.float64)
+
+    _COLUMNS = (
+        'seq', 'entry_time', 'expiry_time', 'entry_price', 'strike', 'contracts',
+        'premium_paid', 'entry_volatility', 'confidence', 'hedge_active',
+        'hedge_count', 'current_value', 'unrealized_pnl', 'pnl_percentage'
+    )
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return len(self.seq)
+
+    def _grow(self):
+        """Double la capacité de toutes les colonnes"""
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty(2 * len(column), dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def append(
+        self,
+        entry_time: int,
+        expiry_time: int,
+        entry_price: float,
+        strike: float,
+        contracts: int,
+        premium_paid: float,
+        entry_volatility: float,
+        confidence: str = 'MEDIUM'
+    ) -> int:
+        """
+        Ajoute une position en O(1) amorti
+
+        Returns:
+            Numéro de séquence (ordre d'ouverture) de la position
+        """
+        if self.size == self.capacity:
+            self._grow()
+
+        slot = self.size
+        seq = self.next_seq
+        self.seq[slot] = seq
+        self.entry_time[slot] = entry_time
+        self.expiry_time[slot] = expiry_time
+        self.entry_price[slot] = entry_price
+        self.strike[slot] = strike
+        self.contracts[slot] = contracts
+        self.premium_paid[slot] = premium_paid
+        self.entry_volatility[slot] = entry_volatility
+        self.confidence[slot] = CONFIDENCE_LEVELS.index(confidence)
+        self.hedge_active[slot] = False
+        self.hedge_count[slot] = 0
+        self.current_value[slot] = premium_paid
+        self.unrealized_pnl[slot] = 0.0
+        self.pnl_percentage[slot] = 0.0
+
+        self.size += 1
+        self.next_seq += 1
+        return seq
+
+    def swap_remove(self, slot: int):
+        """Supprime la position du slot en O(1) en y déplaçant la dernière"""
+        if not 0 <= slot < self.size:
+            raise IndexError(f"Slot {slot} hors du carnet ({self.size} positions)")
+
+        last = self.size - 1
+        if slot != last:
+            for name in self._COLUMNS:
+                column = getattr(self, name)
+                column[slot] = column[last]
+        self.size = last
+
+    def remove_slots(self, slots):
+        """Supprime plusieurs slots (ordre décroissant pour rester valide)"""
+        for slot in sorted(slots, reverse=True):
+            self.swap_remove(slot)
+
+    def ordered_slots(self) -> np.ndarray:
+        """Slots triés par ordre d'ouverture"""
+        return np.argsort(self.seq[:self.size], kind='stable')
+
+    def total_value(self) -> float:
+        """Valeur totale des positions, sommée dans l'ordre d'ouverture"""
+        if self.size == 0:
+            return 0.0
+        return sum(self.current_value[self.ordered_slots()].tolist())
+
+    def revalue(
+        self,
+        current_price: float,
+        current_time: int,
+        current_volatility: float,
+        pricer: Callable[..., Dict[str, np.ndarray]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Revalorise toutes les positions en un seul appel de pricing
+
+        Args:
+            current_price: Prix actuel du sous-jacent
+            current_time: Horodatage actuel (ns)
+            current_volatility: Volatilité actuelle
+            pricer: Fonction (spot, strikes, volatility, times_to_expiry) -> pricing,
+                typiquement StraddleStrategy.price_straddle_book
+
+        Returns:
+            Pricing du carnet complété de time_to_expiry et elapsed_hours
+        """
+        n = self.size
+        time_to_expiry = np.maximum(0.001, (self.expiry_time[:n] - current_time) / 1e9 / SECONDS_PER_YEAR)
+        elapsed_hours = (current_time - self.entry_time[:n]) / 1e9 / 3600
+
+        pricing = pricer(current_price, self.strike[:n], current_volatility, time_to_expiry)
+
+        current_value = pricing['straddle_price'] * self.contracts[:n]
+        self.current_value[:n] = current_value
+        self.unrealized_pnl[:n] = current_value - self.premium_paid[:n]
+        self.pnl_percentage[:n] = (self.unrealized_pnl[:n] / self.premium_paid[:n]) * 100
+
+        pricing['time_to_expiry'] = time_to_expiry
+        pricing['elapsed_hours'] = elapsed_hours
+        return pricing
+
+    def revalue_path(
+        self,
+        prices: np.ndarray,
+        times: np.ndarray,
+        volatilities: np.ndarray,
+        pricer: Callable[..., Dict[str, np.ndarray]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Revalorise le carnet sur plusieurs barres à venir en un seul appel
+
+        Mêmes calculs que revalue barre par barre, sans modifier le carnet:
+        les arrays renvoyés sont de forme (barres, slots).
+
+        Args:
+            prices, times, volatilities: Prix, horodatages (ns) et volatilités
+                des barres
+            pricer: Voir revalue (doit accepter une volatilité par barre)
+
+        Returns:
+            Pricing complété de time_to_expiry, elapsed_hours, current_value,
+            unrealized_pnl et pnl_percentage
+        """
+        n = self.size
+        times = times[:, None]
+        time_to_expiry = np.maximum(0.001, (self.expiry_time[:n] - times) / 1e9 / SECONDS_PER_YEAR)
+        elapsed_hours = (times - self.entry_time[:n]) / 1e9 / 3600
+
+        pricing = pricer(prices[:, None], self.strike[:n], volatilities[:, None], time_to_expiry)
+
+        current_value = pricing['straddle_price'] * self.contracts[:n]
+        unrealized_pnl = current_value - self.premium_paid[:n]
+        pricing.update(
+            time_to_expiry=time_to_expiry,
+            elapsed_hours=elapsed_hours,
+            current_value=current_value,
+            unrealized_pnl=unrealized_pnl,
+            pnl_percentage=(unrealized_pnl / self.premium_paid[:n]) * 100
+        )
+        return pricing
+
+    def revalue_from_path(self, path_pricing: Dict[str, np.ndarray], row: int) -> Dict[str, np.ndarray]:
+        """
+        Revalorise le carnet avec la barre row d'un chemin de revalue_path
+
+        Équivaut à revalue pour cette barre, le carnet n'ayant pas changé
+        depuis le calcul du chemin.
+        """
+        n = self.size
+        pricing = {key: values[row] for key, values in path_pricing.items()}
+        self.current_value[:n] = pricing.pop('current_value')
+        self.unrealized_pnl[:n] = pricing.pop('unrealized_pnl')
+        self.pnl_percentage[:n] = pricing.pop('pnl_percentage')
+        return pricing
+
+    def _hedge_mask(self, current_price) -> np.ndarray:
+        """Slots (par barre si current_price est une colonne) à couvrir"""
+        n = self.size
+        price_move = (current_price - self.entry_price[:n]) / self.entry_price[:n]
+        return (np.abs(price_move) >= self.config.hedge_threshold) & ~self.hedge_active[:n]
+
+    def hedge_candidates(self, current_price: float) -> np.ndarray:
+        """Slots sans hedge actif dont le mouvement depuis l'entrée dépasse HEDGE_THRESHOLD"""
+        if not self.config.enable_hedging:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self._hedge_mask(current_price))
+
+    def first_event(
+        self,
+        prices: np.ndarray,
+        volatilities: np.ndarray,
+        path_pricing: Dict[str, np.ndarray],
+        consecutive_losses: int
+    ) -> Tuple[int, np.ndarray]:
+        """
+        Première barre d'un chemin (voir revalue_path) où le carnet change
+
+        Une barre est un événement si une position y atteint une règle de
+        sortie ou le seuil de hedge. Avant elle, revalorisation exceptée, les
+        barres n'ont aucun effet sur le carnet ni sur la stratégie.
+
+        Returns:
+            Tuple (indice de la barre dans le chemin, len(prices) si aucune;
+            codes d'action de evaluate_exits par barre et par slot)
+        """
+        actions = self.evaluate_exits(
+            path_pricing, volatilities[:, None], consecutive_losses, path_pricing['pnl_percentage']
+        )
+        events = actions.any(axis=1)
+        if self.config.enable_hedging:
+            events |= self._hedge_mask(prices[:, None]).any(axis=1)
+        hits = np.flatnonzero(events)
+        return (int(hits[0]) if len(hits) else len(prices)), actions
+
+    def evaluate_exits(
+        self,
+        pricing: Dict[str, np.ndarray],
+        current_volatility: float,
+        consecutive_losses: int,
+        pnl_percentage: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Évalue les règles de sortie de toutes les positions
+
+        Mêmes règles et priorités que StraddleStrategy.manage_position:
+        take profit, stop loss (adaptatif), time decay, timeout, effondrement
+        de la volatilité.
+
+        Args:
+            pricing: Résultat de revalue pour l'état actuel du carnet
+            current_volatility: Volatilité actuelle
+            consecutive_losses: Pertes consécutives de la stratégie
+            pnl_percentage: PnL en % à évaluer à la place de celui du carnet
+                (chemin de revalue_path, current_volatility en colonne)
+
+        Returns:
+            Array de codes d'action par slot (HOLD, TAKE_PROFIT, ...), par
+            barre et par slot pour un chemin
+        """
+        n = self.size
+        if pnl_percentage is None:
+            pnl_percentage = self.pnl_percentage[:n]
+
+        # 1. Take Profit
+        take_profit = pnl_percentage >= (self.config.take_profit_multiplier - 1) * 100
+
+        # 2. Stop Loss (adaptatif)
+        sl_threshold = np.full(pnl_percentage.shape, -self.config.stop_loss_multiplier * 100)
+        if self.config.dynamic_stop_loss:
+            time_decay_factor = pricing['time_value'] / pricing['straddle_price']
+            sl_threshold = np.where(time_decay_factor < 0.3, sl_threshold * 0.8, sl_threshold)
+            if consecutive_losses >= 2:
+                sl_threshold = sl_threshold * 0.7
+        stop_loss = pnl_percentage <= sl_threshold
+
+        # 3. Time decay critique
+        time_decay = (pricing['time_to_expiry'] < self.config.min_time_to_expiry) & (pnl_percentage < -30)
+
+        # 4. Timeout (plus de temps pour les signaux excellents)
+        timeout_hours = np.where(
+            self.confidence[:n] == CONFIDENCE_LEVELS.index('HIGH'),
+            self.config.trade_timeout_hours * 1.5,
+            self.config.trade_timeout_hours
+        )
+        timeout = pricing['elapsed_hours'] >= timeout_hours
+
+        # 5. Effondrement de la volatilité
+        vol_collapse = current_volatility / self.entry_volatility[:n] < 0.4
+
+        # Première règle vérifiée dans l'ordre de priorité (np.where imbriqués:
+        # np.select coûte plus cher sur un petit carnet)
+        actions = np.where(vol_collapse, VOL_COLLAPSE, HOLD)
+        actions = np.where(timeout, TIMEOUT, actions)
+        actions = np.where(time_decay, TIME_DECAY, actions)
+        actions = np.where(stop_loss, STOP_LOSS, actions)
+        actions = np.where(take_profit, TAKE_PROFIT, actions)
+        return actions.astype(np.int8)
@@ -0,0 +1,157 @@
+# Noyau de pricing Black-Scholes vectorisé
+# Prix call/put/straddle et greeks pour des arrays de contrats en un seul appel
+#
+# Module sans dépendance au package (ni config ni import relatif) afin de
+# pouvoir être partagé par les prototypes test3/ et test4/.
+
+import math
+import numpy as np
+from typing import Dict
+
+try:
+    from scipy.special import erf as _erf
+except ImportError:  # scipy absent: erf exacte élément par élément (plus lent)
+    _erf = np.vectorize(math.erf, otypes=[np.float64])
+
+SQRT_2 = math.sqrt(2.0)
+SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+
+def norm_cdf(x):
+    """Fonction de répartition de la loi normale centrée réduite (via erf)"""
+    return 0.5 * (1.0 + _erf(np.asarray(x, dtype=np.float64) / SQRT_2))
+
+
+def norm_pdf(x):
+    """Densité de la loi normale centrée réduite"""
+    x = np.asarray(x, dtype=np.float64)
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def price_straddle(
+    spot: float,
+    strike: float,
+    volatility: float,
+    time_to_expiry: float,
+    risk_free_rate: float = 0.0
+) -> Dict[str, float]:
+    """
+    Prix d'un seul straddle en flottants Python (sans greeks)
+
+    Mêmes formules et même ordre des opérations que price_straddles, sans
+    le coût fixe de la conversion en arrays: chemin des appels unitaires
+    (entrée en position). Renvoie les mêmes clés que price_straddles avec
+    greeks=False.
+    """
+    call_intrinsic = max(spot - strike, 0.0)
+    put_intrinsic = max(strike - spot, 0.0)
+    intrinsic_value = call_intrinsic + put_intrinsic
+
+    if time_to_expiry > 0 and volatility > 0:
+        sqrt_t = math.sqrt(time_to_expiry)
+        vol_sqrt_t = volatility * sqrt_t
+        d1 = (math.log(spot / strike)
+              + (risk_free_rate + 0.5 * volatility * volatility) * time_to_expiry) / vol_sqrt_t
+        d2 = d1 - vol_sqrt_t
+
+        discounted_strike = strike * math.exp(-risk_free_rate * time_to_expiry)
+        cdf_d1 = 0.5 * (1.0 + math.erf(d1 / SQRT_2))
+        cdf_d2 = 0.5 * (1.0 + math.erf(d2 / SQRT_2))
+
+        call_price = spot * cdf_d1 - discounted_strike * cdf_d2
+        put_price = discounted_strike * (1.0 - cdf_d2) - spot * (1.0 - cdf_d1)
+    else:
+        call_price, put_price = call_intrinsic, put_intrinsic
+
+    straddle_price = call_price + put_price
+    return {
+        'call_price': call_price,
+        'put_price': put_price,
+        'straddle_price': straddle_price,
+        'intrinsic_value': intrinsic_value,
+        'time_value': max(straddle_price - intrinsic_value, 0.0)
+    }
+
+
+def price_straddles(
+    spot,
+    strike,
+    volatility,
+    time_to_expiry,
+    risk_free_rate: float = 0.0,
+    greeks: bool = True
+) -> Dict[str, np.ndarray]:
+    """
+    Price des straddles (call + put même strike) avec Black-Scholes
+
+    Les entrées sont des scalaires ou des arrays diffusables (broadcasting
+    NumPy). Les contrats avec time_to_expiry <= 0 sont évalués à leur valeur
+    intrinsèque avec des greeks de maturité (gamma, vega, theta nuls).
+
+    Args:
+        spot: Prix du sous-jacent
+        strike: Prix d'exercice
+        volatility: Volatilité implicite annualisée
+        time_to_expiry: Temps jusqu'à expiration (en années)
+        risk_free_rate: Taux sans risque
+        greeks: Calcule aussi les greeks (False: prix seuls, pour les
+            revalorisations à chaque barre)
+
+    Returns:
+        Dict d'arrays: call_price, put_price, straddle_price, intrinsic_value,
+        time_value, et si greeks les greeks du straddle delta, gamma, vega,
+        theta (vega pour 1.00 de volatilité, theta par année)
+    """
+    # Diffusion laissée aux ufuncs: np.broadcast_arrays coûte à lui seul
+    # plus que le calcul sur un petit carnet
+    spot = np.asarray(spot, dtype=np.float64)
+    strike = np.asarray(strike, dtype=np.float64)
+    volatility = np.asarray(volatility, dtype=np.float64)
+    time_to_expiry = np.asarray(time_to_expiry, dtype=np.float64)
+
+    live = (time_to_expiry > 0) & (volatility > 0)
+    # Valeurs neutres pour les contrats expirés afin d'éviter les divisions par zéro
+    t = np.where(live, time_to_expiry, 1.0)
+    vol = np.where(live, volatility, 1.0)
+
+    sqrt_t = np.sqrt(t)
+    vol_sqrt_t = vol * sqrt_t
+    d1 = (np.log(spot / strike) + (risk_free_rate + 0.5 * vol * vol) * t) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+
+    discounted_strike = strike * np.exp(-risk_free_rate * t)
+    cdf_d1 = norm_cdf(d1)
+    cdf_d2 = norm_cdf(d2)
+
+    call_intrinsic = np.maximum(spot - strike, 0.0)
+    put_intrinsic = np.maximum(strike - spot, 0.0)
+    intrinsic_value = call_intrinsic + put_intrinsic
+
+    call_price = np.where(live, spot * cdf_d1 - discounted_strike * cdf_d2, call_intrinsic)
+    put_price = np.where(live, discounted_strike * (1.0 - cdf_d2) - spot * (1.0 - cdf_d1), put_intrinsic)
+    straddle_price = call_price + put_price
+    if intrinsic_value.shape != straddle_price.shape:
+        intrinsic_value = np.broadcast_to(intrinsic_value, straddle_price.shape).copy()
+    pricing = {
+        'call_price': call_price,
+        'put_price': put_price,
+        'straddle_price': straddle_price,
+        'intrinsic_value': intrinsic_value,
+        'time_value': np.maximum(straddle_price - intrinsic_value, 0.0)
+    }
+    if not greeks:
+        return pricing
+
+    # Greeks du straddle (somme call + put)
+    pdf_d1 = norm_pdf(d1)
+    delta = np.where(live, 2.0 * cdf_d1 - 1.0, np.sign(spot - strike))
+    gamma = np.where(live, 2.0 * pdf_d1 / (spot * vol_sqrt_t), 0.0)
+    vega = np.where(live, 2.0 * spot * pdf_d1 * sqrt_t, 0.0)
+    theta = np.where(
+        live,
+        -spot * pdf_d1 * vol / sqrt_t + risk_free_rate * discounted_strike * (1.0 - 2.0 * cdf_d2),
+        0.0
+    )
+
+    pricing.update(delta=delta, gamma=gamma, vega=vega, theta=theta)
+    return pricing
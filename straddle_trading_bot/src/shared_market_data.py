@@ -0,0 +1,126 @@
+# Données de marché en mémoire partagée pour les processus workers
+# Publication unique des colonnes OHLCV + indicateurs, lecture sans copie ni pickle
+#
+# Module sans dépendance au package (ni config ni import relatif) afin de
+# pouvoir être partagé par le prototype test2/.
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+# Segments attachés par ce processus: ils doivent survivre aux DataFrames qui les lisent
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, pd.DataFrame]] = {}
+
+
+@dataclass(frozen=True)
+class SharedMarketDataHandle:
+    """Description picklable (quelques octets) d'un segment publié"""
+    name: str
+    n_bars: int
+    columns: Tuple[str, ...]
+    tz: Any = None
+    index_name: Optional[str] = None
+    dtype: str = 'float64'
+
+
+class SharedMarketData:
+    """
+    Publie un DataFrame de marché dans un segment multiprocessing.shared_memory
+
+    Disposition du segment: horodatages int64 (ns UTC) puis une matrice
+    float64 rangée colonne par colonne, de sorte que chaque colonne soit
+    contiguë. Toutes les colonnes sont converties en float64, sauf données
+    entièrement float32 (mode compact) publiées telles quelles.
+
+    Le processus qui publie possède le segment et doit appeler close()
+    (ou utiliser un bloc with) pour le libérer; les workers reçoivent
+    seulement le handle et appellent attach_market_data.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        if not isinstance(data.index, pd.DatetimeIndex):
+            raise ValueError("Les données partagées doivent être indexées par date")
+
+        n_bars = len(data)
+        columns = tuple(str(column) for column in data.columns)
+        compact = len(columns) > 0 and all(dtype == np.float32 for dtype in data.dtypes)
+        dtype = np.dtype(np.float32 if compact else np.float64)
+        nbytes = max(1, 8 * n_bars + dtype.itemsize * n_bars * len(columns))
+
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.handle = SharedMarketDataHandle(
+            name=self._shm.name,
+            n_bars=n_bars,
+            columns=columns,
+            tz=data.index.tz,
+            index_name=data.index.name,
+            dtype=dtype.name
+        )
+
+        timestamps, values = _views(self._shm, self.handle)
+        timestamps[:] = data.index.as_unit('ns').asi8
+        values[:] = data.to_numpy(dtype=dtype)
+
+    def __enter__(self) -> 'SharedMarketData':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Libère le segment (les workers ne doivent plus le lire)"""
+        if self._shm is None:
+            return
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+
+def _views(shm: shared_memory.SharedMemory, handle: SharedMarketDataHandle) -> Tuple[np.ndarray, np.ndarray]:
+    """Vues NumPy (horodatages, matrice en ordre Fortran) sur un segment"""
+    n_bars, n_columns = handle.n_bars, len(handle.columns)
+    timestamps = np.ndarray((n_bars,), dtype=np.int64, buffer=shm.buf)
+    values = np.ndarray(
+        (n_bars, n_columns), dtype=np.dtype(handle.dtype), buffer=shm.buf, offset=8 * n_bars, order='F'
+    )
+    return timestamps, values
+
+
+def attach_market_data(handle: SharedMarketDataHandle) -> pd.DataFrame:
+    """
+    Attache un segment publié et renvoie un DataFrame en lecture seule
+
+    Les colonnes du DataFrame sont des vues sur la mémoire partagée: aucune
+    copie des valeurs. Les attachements sont mis en cache par processus.
+    """
+    if handle.name in _attached:
+        return _attached[handle.name][1]
+
+    shm = shared_memory.SharedMemory(name=handle.name)
+    timestamps, values = _views(shm, handle)
+    timestamps.flags.writeable = False
+    values.flags.writeable = False
+
+    index = pd.DatetimeIndex(timestamps.view('M8[ns]'), name=handle.index_name, copy=False)
+    if handle.tz is not None:
+        index = index.tz_localize('UTC').tz_convert(handle.tz)
+
+    data = pd.DataFrame(values, index=index, columns=list(handle.columns), copy=False)
+    _attached[handle.name] = (shm, data)
+    return data
+
+
+def detach_market_data(handle: SharedMarketDataHandle):
+    """
+    Détache un segment de ce processus
+
+    Le DataFrame renvoyé par attach_market_data ne doit plus être utilisé
+    (ni référencé: le segment ne peut pas être fermé tant que des vues existent).
+    """
+    entry = _attached.pop(handle.name, None)
+    if entry is not None:
+        shm, data = entry
+        del data, entry
+        shm.close()
@@ -1,6 +1,7 @@
 # Stratégie Straddle Optimisée avec Hedging Dynamique
 # Bot de trading professionnel pour options straddle
 
+import sys
 import pandas as pd
 import numpy as np
 import logging
@@ -10,6 +11,46 @@ from dataclasses import dataclass
 from enum import Enum
 
 from .config import *
+from .pricing import price_straddle, price_straddles
+from .position_book import (
+    PositionBook, CONFIDENCE_LEVELS, EXIT_REASONS, HOLD, TAKE_PROFIT, STOP_LOSS, TIMEOUT
+)
+from .daily_metrics import DailyMetrics
+from .compact_dtypes import COMPACT_FLOAT, pack_flags, unpack_flag
+
+# Enregistrements sans __dict__ (slots des dataclasses disponibles depuis Python 3.10)
+SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Critères d'entrée évalués par calculate_signal_quality / compute_signal_features
+SIGNAL_CRITERIA = (
+    'volatility',
+    'consolidation',
+    'rsi_neutral',
+    'volume',
+    'vol_momentum',
+    'no_strong_trend',
+    'price_position'
+)
+
+# Drapeaux regroupés dans le bitset uint8 'signal_flags' en mode compact
+SIGNAL_FLAGS = SIGNAL_CRITERIA + ('should_enter',)
+
+# Colonnes de données lues par les signaux et le backtest (required_features)
+SIGNAL_FEATURES = ('high', 'low', 'close', 'volume', 'volatility', 'vol_percentile', 'rsi', 'volume_ratio', 'price_position')
+TREND_FEATURES = ('sma_20', 'sma_50')
+
+# Longueur (en barres) des chemins du carnet revalorisés d'avance par le
+# moteur numpy: doublée tant qu'aucun événement n'y survient, divisée par
+# deux sinon
+MIN_PATH_LENGTH = 16
+MAX_PATH_LENGTH = 1024
+
+
+def signal_flag(features: pd.DataFrame, name: str) -> np.ndarray:
+    """Drapeau de compute_signal_features (colonne ou bit de signal_flags)"""
+    if name in features:
+        return features[name].to_numpy(dtype=bool)
+    return unpack_flag(features['signal_flags'].to_numpy(), SIGNAL_FLAGS.index(name))
 
 class TradeAction(Enum):
     """Actions possibles pour une position"""
@@ -26,7 +67,7 @@ class HedgeDirection(Enum):
     SHORT = "SHORT"
     NONE = "NONE"
 
-@dataclass
+@dataclass(**SLOTS)
 class StraddlePosition:
     """Structure d'une position straddle"""
     entry_time: datetime
@@ -46,7 +87,7 @@ class StraddlePosition:
         if self.hedge_positions is None:
             self.hedge_positions = []
 
-@dataclass 
+@dataclass(**SLOTS)
 class HedgePosition:
     """Structure d'une position de hedge"""
     direction: HedgeDirection
@@ -57,9 +98,9 @@ class HedgePosition:
     current_pnl: float = 0.0
     active: bool = True
 
-@dataclass
+@dataclass(frozen=True, **SLOTS)
 class TradeResult:
-    """Résultat d'un trade"""
+    """Résultat d'un trade (immuable)"""
     entry_time: datetime
     exit_time: datetime
     entry_price: float
@@ -81,16 +122,21 @@ class StraddleStrategy:
     - Hedging dynamique Long/Short
     - Optimisation continue des paramètres
     - Black-Scholes pour simulation des prix d'options
+    
+    Les paramètres viennent d'une StrategyConfig (constantes de config.py
+    par défaut), ce qui permet de faire tourner plusieurs configurations
+    dans un même processus.
     """
     
-    def __init__(self):
+    def __init__(self, config: Optional[StrategyConfig] = None):
+        self.config = config or StrategyConfig()
         self.positions: List[StraddlePosition] = []
         self.hedge_positions: List[HedgePosition] = []
         self.trades_history: List[TradeResult] = []
         
         # Gestion du capital
-        self.capital = INITIAL_CAPITAL
-        self.max_risk_per_trade = INITIAL_CAPITAL * RISK_PER_TRADE
+        self.capital = self.config.initial_capital
+        self.max_risk_per_trade = self.config.initial_capital * self.config.risk_per_trade
         
         # Statistiques de performance
         self.consecutive_losses = 0
@@ -110,6 +156,10 @@ class StraddleStrategy:
         """
         Simule le prix d'un straddle avec Black-Scholes
         
+        Chemin scalaire en flottants Python (pricing.price_straddle), mêmes
+        règles que price_straddle_book; les deux chemins ne diffèrent qu'à
+        l'arrondi près (log/exp/erf de math contre ceux de NumPy/SciPy).
+        
         Args:
             spot_price: Prix actuel du sous-jacent
             strike: Prix d'exercice
@@ -117,56 +167,112 @@ class StraddleStrategy:
             time_to_expiry: Temps jusqu'à expiration (en années)
             
         Returns:
-            Dict avec les prix call, put et straddle
+            Dict avec les prix call, put et straddle, valeurs intrinsèque
+            et temps (sans greeks: aucun appelant ne les lit)
         """
+        bounded_volatility = min(self.config.max_volatility, max(self.config.min_volatility, volatility))
+        pricing = price_straddle(
+            float(spot_price), float(strike), bounded_volatility, float(time_to_expiry), self.config.risk_free_rate
+        )
         if time_to_expiry <= 0:
-            call_value = max(0, spot_price - strike)
-            put_value = max(0, strike - spot_price)
-            return {
-                'call_price': call_value,
-                'put_price': put_value,
-                'straddle_price': call_value + put_value,
-                'time_value': 0.0,
-                'intrinsic_value': call_value + put_value
-            }
-        
-        # Ajustement de la volatilité dans les limites
-        volatility = max(MIN_VOLATILITY, min(MAX_VOLATILITY, volatility))
-        
-        # Paramètres Black-Scholes
-        d1 = (np.log(spot_price / strike) + 
-              (RISK_FREE_RATE + 0.5 * volatility**2) * time_to_expiry) / \
-             (volatility * np.sqrt(time_to_expiry))
-        d2 = d1 - volatility * np.sqrt(time_to_expiry)
+            return pricing
+        
+        # Assurer prix positifs avant expiration
+        pricing['call_price'] = max(pricing['call_price'], 0.01)
+        pricing['put_price'] = max(pricing['put_price'], 0.01)
+        pricing['straddle_price'] = pricing['call_price'] + pricing['put_price']
+        pricing['time_value'] = max(pricing['straddle_price'] - pricing['intrinsic_value'], 0.0)
+        return pricing
+    
+    def price_straddle_book(
+        self, 
+        spot_price: float, 
+        strikes, 
+        volatility: float, 
+        times_to_expiry,
+        greeks: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Valorise un ensemble de straddles en un seul appel au noyau Black-Scholes
         
-        # Fonction de distribution normale cumulée (approximation)
-        def norm_cdf(x):
-            return 0.5 * (1 + np.sign(x) * np.sqrt(1 - np.exp(-2 * x**2 / np.pi)))
+        Applique les règles de la stratégie: volatilité bornée à
+        [MIN_VOLATILITY, MAX_VOLATILITY] et prix minimum de 0.01 par jambe
+        avant expiration, valeur intrinsèque seule à l'expiration.
         
-        # Prix du call
-        call_price = (spot_price * norm_cdf(d1) - 
-                     strike * np.exp(-RISK_FREE_RATE * time_to_expiry) * norm_cdf(d2))
+        Args:
+            spot_price: Prix actuel du sous-jacent
+            strikes: Prix d'exercice (scalaire ou array)
+            volatility: Volatilité implicite (scalaire ou array, par barre
+                pour PositionBook.revalue_path)
+            times_to_expiry: Temps jusqu'à expiration en années (scalaire ou array)
+            greeks: Calcule aussi les greeks (voir pricing.price_straddles);
+                les revalorisations du backtest ne lisent que les prix
+            
+        Returns:
+            Dict d'arrays (voir pricing.price_straddles)
+        """
+        times_to_expiry = np.asarray(times_to_expiry, dtype=np.float64)
+        live = times_to_expiry > 0
+        if np.ndim(volatility):
+            bounded_volatility = np.clip(volatility, self.config.min_volatility, self.config.max_volatility)
+        else:
+            bounded_volatility = min(self.config.max_volatility, max(self.config.min_volatility, volatility))
         
-        # Prix du put (parité call-put)
-        put_price = (call_price - spot_price + 
-                    strike * np.exp(-RISK_FREE_RATE * time_to_expiry))
+        pricing = price_straddles(
+            spot_price, strikes, bounded_volatility, times_to_expiry, self.config.risk_free_rate, greeks=greeks
+        )
         
-        # Assurer prix positifs
-        call_price = max(0.01, call_price)
-        put_price = max(0.01, put_price)
+        # Assurer prix positifs avant expiration
+        # (à l'expiration la valeur intrinsèque est déjà >= 0: plancher nul)
+        floor = np.where(live, 0.01, 0.0)
+        call_price = np.maximum(pricing['call_price'], floor)
+        put_price = np.maximum(pricing['put_price'], floor)
         straddle_price = call_price + put_price
         
-        # Valeurs intrinsèque et temporelle
-        intrinsic_value = max(0, abs(spot_price - strike))
-        time_value = max(0, straddle_price - intrinsic_value)
+        pricing['call_price'] = call_price
+        pricing['put_price'] = put_price
+        pricing['straddle_price'] = straddle_price
+        pricing['time_value'] = np.where(
+            live, np.maximum(straddle_price - pricing['intrinsic_value'], 0.0), 0.0
+        )
+        return pricing
+    
+    def reprice_open_positions(
+        self, 
+        current_price: float, 
+        current_time: datetime, 
+        current_volatility: float
+    ) -> List[Dict[str, float]]:
+        """
+        Revalorise toutes les positions ouvertes en un seul appel de pricing
         
-        return {
-            'call_price': call_price,
-            'put_price': put_price,
-            'straddle_price': straddle_price,
-            'time_value': time_value,
-            'intrinsic_value': intrinsic_value
-        }
+        Returns:
+            Liste alignée sur self.positions du pricing de chaque straddle
+        """
+        if not self.positions:
+            return []
+        
+        seconds_per_year = 365.25 * 24 * 3600
+        strikes = [position.strike for position in self.positions]
+        times_to_expiry = [
+            max(0.001, (position.expiry_time - current_time).total_seconds() / seconds_per_year)
+            for position in self.positions
+        ]
+        
+        pricing = self.price_straddle_book(current_price, strikes, current_volatility, times_to_expiry)
+        columns = {key: values.tolist() for key, values in pricing.items()}
+        return [
+            {key: values[j] for key, values in columns.items()}
+            for j in range(len(self.positions))
+        ]
+    
+    def required_features(self) -> Tuple[str, ...]:
+        """
+        Colonnes de données lues par cette configuration de la stratégie, à
+        passer à DataManager.get_backtest_data(features=...): les autres
+        indicateurs ne sont ni calculés ni exigés au nettoyage
+        """
+        return SIGNAL_FEATURES + (TREND_FEATURES if self.config.trend_filter else ())
     
     def calculate_signal_quality(self, data: pd.DataFrame) -> Tuple[bool, Dict[str, Any]]:
         """
@@ -181,6 +287,7 @@ class StraddleStrategy:
         if len(data) < 100:
             return False, {'reason': 'Insufficient data'}
         
+        config = self.config
         latest = data.iloc[-1]
         recent_data = data.tail(20)
         
@@ -188,24 +295,24 @@ class StraddleStrategy:
         criteria = {}
         
         # 1. Volatilité élevée
-        criteria['volatility'] = latest['vol_percentile'] >= VOLATILITY_THRESHOLD
+        criteria['volatility'] = latest['vol_percentile'] >= config.volatility_threshold
         
         # 2. Consolidation de prix (sweet spot pour straddle)
         price_range = (recent_data['high'].max() - recent_data['low'].min()) / latest['close']
-        criteria['consolidation'] = 0.02 < price_range < MAX_PRICE_RANGE
+        criteria['consolidation'] = 0.02 < price_range < config.max_price_range
         
         # 3. RSI neutre (pas de momentum directionnel fort)
-        criteria['rsi_neutral'] = RSI_FILTER_MIN < latest['rsi'] < RSI_FILTER_MAX
+        criteria['rsi_neutral'] = config.rsi_filter_min < latest['rsi'] < config.rsi_filter_max
         
         # 4. Volume exceptionnel
-        criteria['volume'] = latest['volume_ratio'] > MIN_VOLUME_RATIO
+        criteria['volume'] = latest['volume_ratio'] > config.min_volume_ratio
         
         # 5. Volatilité en hausse (momentum)
         vol_trend = latest['volatility'] > data['volatility'].rolling(10).mean().iloc[-1]
         criteria['vol_momentum'] = vol_trend
         
         # 6. Pas de tendance forte (favorable au straddle)
-        if TREND_FILTER:
+        if config.trend_filter:
             sma_ratio = abs(latest['sma_20'] - latest['sma_50']) / latest['close']
             criteria['no_strong_trend'] = sma_ratio < 0.03
         else:
@@ -239,10 +346,111 @@ class StraddleStrategy:
             signal_info['confidence'] = 'LOW'
         
         # Décision d'entrée
-        should_enter = score >= MIN_SIGNAL_QUALITY
+        should_enter = bool(score >= config.min_signal_quality)
         
         return should_enter, signal_info
     
+    def compute_signal_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcule en une passe vectorisée les critères d'entrée de toutes les barres
+        
+        Version vectorisée de calculate_signal_quality: la ligne i du résultat
+        correspond à calculate_signal_quality(data.iloc[:i+1]). Le backtest n'a
+        plus qu'à lire une ligne par barre au lieu de recalculer le préfixe.
+        
+        Args:
+            data: DataFrame avec données historiques et indicateurs
+            
+        Returns:
+            pd.DataFrame indexé comme data avec une colonne booléenne par critère
+            (SIGNAL_CRITERIA), price_range, criteria_met, signal_quality,
+            confidence et should_enter; en mode compact (config.compact_dtypes)
+            les drapeaux SIGNAL_FLAGS sont regroupés dans le bitset uint8
+            signal_flags (voir signal_flag), price_range est en float32 et
+            confidence catégorielle
+        """
+        config = self.config
+        features = pd.DataFrame(index=data.index)
+        close = data['close']
+        
+        # 1. Volatilité élevée
+        features['volatility'] = data['vol_percentile'] >= config.volatility_threshold
+        
+        # 2. Consolidation de prix sur les 20 dernières barres
+        price_range = (data['high'].rolling(20, min_periods=1).max() -
+                       data['low'].rolling(20, min_periods=1).min()) / close
+        features['price_range'] = price_range
+        features['consolidation'] = (price_range > 0.02) & (price_range < config.max_price_range)
+        
+        # 3. RSI neutre
+        features['rsi_neutral'] = (data['rsi'] > config.rsi_filter_min) & (data['rsi'] < config.rsi_filter_max)
+        
+        # 4. Volume exceptionnel
+        features['volume'] = data['volume_ratio'] > config.min_volume_ratio
+        
+        # 5. Volatilité en hausse (momentum)
+        features['vol_momentum'] = data['volatility'] > data['volatility'].rolling(10).mean()
+        
+        # 6. Pas de tendance forte
+        if config.trend_filter:
+            sma_ratio = (data['sma_20'] - data['sma_50']).abs() / close
+            features['no_strong_trend'] = sma_ratio < 0.03
+        else:
+            features['no_strong_trend'] = True
+        
+        # 7. Position dans le range
+        features['price_position'] = (data['price_position'] > 0.2) & (data['price_position'] < 0.8)
+        
+        # Score de qualité et confiance
+        criteria = features[list(SIGNAL_CRITERIA)]
+        features['criteria_met'] = criteria.sum(axis=1).astype(int)
+        features['signal_quality'] = features['criteria_met'] / len(SIGNAL_CRITERIA)
+        features['confidence'] = np.select(
+            [features['signal_quality'] >= 0.85, features['signal_quality'] >= 0.75],
+            ['HIGH', 'MEDIUM'],
+            default='LOW'
+        )
+        
+        # Même garde que calculate_signal_quality: 100 barres minimum
+        enough_data = np.arange(len(data)) >= 99
+        features['should_enter'] = enough_data & (features['signal_quality'] >= config.min_signal_quality)
+        
+        if config.compact_dtypes:
+            features['signal_flags'] = pack_flags([features[name].to_numpy(dtype=bool) for name in SIGNAL_FLAGS])
+            features.drop(columns=list(SIGNAL_FLAGS), inplace=True)
+            features['price_range'] = features['price_range'].astype(COMPACT_FLOAT)
+            features['criteria_met'] = features['criteria_met'].astype(np.uint8)
+            features['confidence'] = features['confidence'].astype('category')
+        
+        return features
+    
+    def _signal_feature_arrays(self, data: pd.DataFrame, features: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Extrait une fois les colonnes nécessaires à _signal_info_from_features"""
+        arrays = {
+            name: features[name].to_numpy()
+            for name in ('price_range', 'criteria_met', 'signal_quality', 'confidence')
+        }
+        for name in SIGNAL_CRITERIA:
+            arrays[name] = signal_flag(features, name)
+        for name in ('vol_percentile', 'rsi', 'volume_ratio', 'volatility'):
+            arrays[name] = data[name].to_numpy()
+        return arrays
+    
+    def _signal_info_from_features(self, arrays: Dict[str, np.ndarray], i: int) -> Dict[str, Any]:
+        """Reconstruit le signal_info de calculate_signal_quality pour la barre i"""
+        return {
+            'signal_quality': arrays['signal_quality'][i],
+            'volatility_percentile': arrays['vol_percentile'][i],
+            'price_range': arrays['price_range'][i],
+            'rsi': arrays['rsi'][i],
+            'volume_ratio': arrays['volume_ratio'][i],
+            'volatility': arrays['volatility'][i],
+            'criteria_met': int(arrays['criteria_met'][i]),
+            'total_criteria': len(SIGNAL_CRITERIA),
+            'criteria_details': {name: bool(arrays[name][i]) for name in SIGNAL_CRITERIA},
+            'confidence': arrays['confidence'][i]
+        }
+    
     def calculate_position_size(self, straddle_price: float, signal_quality: float) -> int:
         """
         Calcule la taille optimale de la position
@@ -257,7 +465,7 @@ class StraddleStrategy:
         # Taille de base basée sur le risque
         base_contracts = int(self.max_risk_per_trade / straddle_price)
         
-        if ADAPTIVE_POSITION_SIZING:
+        if self.config.adaptive_position_sizing:
             # Ajustement selon la performance récente
             if self.consecutive_losses >= 2:
                 adjustment = 0.5  # Réduire après pertes
@@ -288,21 +496,21 @@ class StraddleStrategy:
         Returns:
             Tuple (should_hedge, direction, size_ratio)
         """
-        if not ENABLE_HEDGING:
+        if not self.config.enable_hedging:
             return False, HedgeDirection.NONE, 0.0
         
         # Calcul du mouvement depuis l'entrée
         price_move = (current_price - position.entry_price) / position.entry_price
         
         # Seuil de hedge atteint ?
-        if abs(price_move) < HEDGE_THRESHOLD:
+        if abs(price_move) < self.config.hedge_threshold:
             return False, HedgeDirection.NONE, 0.0
         
         # Direction du hedge (opposée au mouvement)
         direction = HedgeDirection.SHORT if price_move > 0 else HedgeDirection.LONG
         
         # Taille du hedge proportionnelle au mouvement
-        size_ratio = min(MAX_HEDGE_RATIO, abs(price_move) * 2)
+        size_ratio = min(self.config.max_hedge_ratio, abs(price_move) * 2)
         
         return True, direction, size_ratio
     
@@ -327,15 +535,28 @@ class StraddleStrategy:
         Returns:
             Position de hedge créée
         """
+        hedge = self._register_hedge(direction, size_ratio, current_price, current_time, str(id(position)))
+        position.hedge_positions.append(hedge)
+        
+        return hedge
+    
+    def _register_hedge(
+        self, 
+        direction: HedgeDirection, 
+        size_ratio: float, 
+        current_price: float, 
+        current_time: datetime, 
+        parent_position_id: str
+    ) -> HedgePosition:
+        """Crée un hedge et l'ajoute aux hedges de la stratégie"""
         hedge = HedgePosition(
             direction=direction,
             entry_time=current_time,
             entry_price=current_price,
             size_ratio=size_ratio,
-            parent_position_id=str(id(position))
+            parent_position_id=parent_position_id
         )
         
-        position.hedge_positions.append(hedge)
         self.hedge_positions.append(hedge)
         
         self.logger.info(f"🛡️ Hedge {direction.value} exécuté: {size_ratio:.1%} @ ${current_price:,.2f}")
@@ -347,7 +568,8 @@ class StraddleStrategy:
         position: StraddlePosition, 
         current_price: float, 
         current_time: datetime, 
-        current_volatility: float
+        current_volatility: float, 
+        current_straddle: Optional[Dict[str, float]] = None
     ) -> Tuple[TradeAction, Dict[str, Any]]:
         """
         Gère une position existante
@@ -357,6 +579,8 @@ class StraddleStrategy:
             current_price: Prix actuel
             current_time: Timestamp actuel
             current_volatility: Volatilité actuelle
+            current_straddle: Pricing déjà calculé (reprice_open_positions),
+                recalculé si absent
             
         Returns:
             Tuple (action, exit_info)
@@ -366,9 +590,10 @@ class StraddleStrategy:
         time_to_expiry = max(0.001, (position.expiry_time - current_time).total_seconds() / (365.25 * 24 * 3600))
         
         # Mise à jour de la valeur actuelle
-        current_straddle = self.simulate_straddle_price(
-            current_price, position.strike, current_volatility, time_to_expiry
-        )
+        if current_straddle is None:
+            current_straddle = self.simulate_straddle_price(
+                current_price, position.strike, current_volatility, time_to_expiry
+            )
         
         position.current_value = current_straddle['straddle_price'] * position.contracts
         position.unrealized_pnl = position.current_value - position.premium_paid
@@ -382,7 +607,7 @@ class StraddleStrategy:
         # Critères de sortie
         
         # 1. Take Profit
-        tp_threshold = (TAKE_PROFIT_MULTIPLIER - 1) * 100
+        tp_threshold = (self.config.take_profit_multiplier - 1) * 100
         if position.pnl_percentage >= tp_threshold:
             return TradeAction.TAKE_PROFIT, {
                 'reason': f'Take profit atteint: {position.pnl_percentage:.1f}%',
@@ -391,8 +616,8 @@ class StraddleStrategy:
             }
         
         # 2. Stop Loss (adaptatif)
-        sl_threshold = -STOP_LOSS_MULTIPLIER * 100
-        if DYNAMIC_STOP_LOSS:
+        sl_threshold = -self.config.stop_loss_multiplier * 100
+        if self.config.dynamic_stop_loss:
             # SL plus strict si time decay élevé
             time_decay_factor = current_straddle['time_value'] / current_straddle['straddle_price']
             if time_decay_factor < 0.3:  # Peu de valeur temps restante
@@ -411,7 +636,7 @@ class StraddleStrategy:
             }
         
         # 3. Time decay critique
-        if time_to_expiry < MIN_TIME_TO_EXPIRY and position.pnl_percentage < -30:
+        if time_to_expiry < self.config.min_time_to_expiry and position.pnl_percentage < -30:
             return TradeAction.TIME_DECAY, {
                 'reason': 'Time decay critique',
                 'pnl_pct': position.pnl_percentage,
@@ -419,7 +644,7 @@ class StraddleStrategy:
             }
         
         # 4. Timeout
-        timeout_hours = TRADE_TIMEOUT_HOURS
+        timeout_hours = self.config.trade_timeout_hours
         if position.entry_confidence == 'HIGH':
             timeout_hours *= 1.5  # Plus de temps pour signaux excellents
         
@@ -450,13 +675,14 @@ class StraddleStrategy:
             Tuple (should_stop, reason)
         """
         # Arrêt après pertes consécutives
-        if self.consecutive_losses >= MAX_CONSECUTIVE_LOSSES:
+        if self.consecutive_losses >= self.config.max_consecutive_losses:
             return True, f"Trop de pertes consécutives: {self.consecutive_losses}"
         
         # Arrêt si perte quotidienne dépasse le seuil
-        daily_loss = (INITIAL_CAPITAL - self.capital) / INITIAL_CAPITAL
-        if daily_loss > MAX_DAILY_LOSS:
-            return True, f"Perte quotidienne {daily_loss:.1%} > {MAX_DAILY_LOSS:.1%}"
+        initial_capital = self.config.initial_capital
+        daily_loss = (initial_capital - self.capital) / initial_capital
+        if daily_loss > self.config.max_daily_loss:
+            return True, f"Perte quotidienne {daily_loss:.1%} > {self.config.max_daily_loss:.1%}"
         
         # Arrêt si capital insuffisant
         if self.capital < self.max_risk_per_trade * 2:
@@ -464,34 +690,71 @@ class StraddleStrategy:
         
         return False, ""
     
-    def run_backtest(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def run_backtest(
+        self, 
+        data: pd.DataFrame, 
+        precompute_signals: bool = True, 
+        engine: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Lance le backtest complet de la stratégie
         
         Args:
             data: Données historiques
+            precompute_signals: Calculer les signaux en une passe vectorisée
+                (compute_signal_features) au lieu de réévaluer
+                calculate_signal_quality sur le préfixe à chaque barre
+            engine: 'pandas' (lecture des barres via iloc) ou 'numpy' (boucle
+                sur des arrays contigus, signaux toujours pré-calculés).
+                BACKTEST_ENGINE par défaut
             
         Returns:
             Résultats détaillés du backtest
         """
         self.logger.info("🚀 Démarrage backtest stratégie straddle")
         self.logger.info(f"💰 Capital initial: ${self.capital:,.2f}")
-        self.logger.info(f"🎯 Risque par trade: {RISK_PER_TRADE:.1%}")
+        self.logger.info(f"🎯 Risque par trade: {self.config.risk_per_trade:.1%}")
         
         results = {
             'trades': [],
-            'daily_pnl': [],
+            'daily_pnl': DailyMetrics(initial_capital=self.config.initial_capital),
             'positions_log': [],
             'hedge_opportunities': [],
             'performance_metrics': {}
         }
         
+        engine = engine or self.config.backtest_engine
+        if engine not in ('pandas', 'numpy'):
+            raise ValueError(f"Moteur de backtest inconnu: {engine}")
+        
+        if engine == 'numpy':
+            self._run_event_loop_arrays(data, results)
+        else:
+            self._run_event_loop_pandas(data, results, precompute_signals)
+        
+        # Clôturer les positions restantes
+        self._close_remaining_positions(data, results)
+        
+        # Calculer les métriques finales
+        self._calculate_final_metrics(results)
+        
+        self._log_backtest_summary(results)
+        
+        return results
+    
+    def _run_event_loop_pandas(self, data: pd.DataFrame, results: Dict, precompute_signals: bool):
+        """Boucle d'événements historique: lecture barre par barre via pandas"""
+        # Signaux pré-calculés pour toutes les barres
+        if precompute_signals:
+            features = self.compute_signal_features(data)
+            feature_arrays = self._signal_feature_arrays(data, features)
+            should_enter_by_bar = signal_flag(features, 'should_enter')
+        
         # Boucle principale du backtest
         for i in range(100, len(data)):  # Commencer après 100 barres pour les indicateurs
             current_time = data.index[i]
-            current_data = data.iloc[:i+1]
-            current_price = data.iloc[i]['close']
-            current_vol = data.iloc[i]['volatility']
+            current_price = float(data.iloc[i]['close'])
+            current_vol = float(data.iloc[i]['volatility'])
             
             # Vérifier si on doit arrêter le trading
             should_stop, stop_reason = self.should_stop_trading()
@@ -499,12 +762,13 @@ class StraddleStrategy:
                 self.logger.warning(f"⚠️ Arrêt du trading: {stop_reason}")
                 break
             
-            # Gérer les positions existantes
+            # Gérer les positions existantes (revalorisées en un seul appel)
             positions_to_close = []
+            book_pricing = self.reprice_open_positions(current_price, current_time, current_vol)
             
             for j, position in enumerate(self.positions):
                 action, exit_info = self.manage_position(
-                    position, current_price, current_time, current_vol
+                    position, current_price, current_time, current_vol, book_pricing[j]
                 )
                 
                 if action != TradeAction.HOLD:
@@ -518,25 +782,243 @@ class StraddleStrategy:
                 del self.positions[j]
             
             # Chercher de nouvelles opportunités
-            if len(self.positions) < MAX_POSITIONS:
-                should_enter, signal_info = self.calculate_signal_quality(current_data)
+            if len(self.positions) < self.config.max_positions:
+                if precompute_signals:
+                    should_enter = should_enter_by_bar[i]
+                    signal_info = self._signal_info_from_features(feature_arrays, i) if should_enter else {}
+                else:
+                    should_enter, signal_info = self.calculate_signal_quality(data.iloc[:i+1])
                 
                 if should_enter and self.capital > self.max_risk_per_trade:
                     self._open_new_position(current_price, current_time, current_vol, signal_info, results)
             
             # Enregistrer les métriques quotidiennes
             self._record_daily_metrics(current_time, results)
-        
-        # Clôturer les positions restantes
-        self._close_remaining_positions(data, results)
-        
-        # Calculer les métriques finales
-        self._calculate_final_metrics(results)
-        
-        self._log_backtest_summary(results)
-        
-        return results
     
+    def _run_event_loop_arrays(self, data: pd.DataFrame, results: Dict):
+        """
+        Boucle d'événements sur arrays NumPy contigus
+        
+        Les colonnes utiles sont extraites une seule fois (float64, timestamps
+        en int64 ns) pour éviter la construction d'une Series pandas à chaque
+        barre. Les positions ouvertes vivent dans un PositionBook: revalorisation
+        et règles de sortie évaluées pour tout le carnet. Entre deux événements
+        (sortie, hedge, entrée possible) le carnet est revalorisé d'avance sur
+        un chemin de barres (PositionBook.revalue_path) et ces barres calmes ne
+        font qu'enregistrer leurs métriques, sans passer par la boucle. Les
+        métriques quotidiennes sont accumulées en colonnes puis transférées en
+        bloc dans results['daily_pnl'] (DailyMetrics).
+        """
+        features = self.compute_signal_features(data)
+        feature_arrays = self._signal_feature_arrays(data, features)
+        timestamps_ns = np.ascontiguousarray(data.index.as_unit('ns').asi8, dtype=np.int64)
+        tz = getattr(data.index, 'tz', None)
+        close = np.ascontiguousarray(data['close'].to_numpy(dtype=np.float64))
+        volatility = np.ascontiguousarray(data['volatility'].to_numpy(dtype=np.float64))
+        should_enter_by_bar = signal_flag(features, 'should_enter')
+        signal_bars = np.flatnonzero(should_enter_by_bar)
+        
+        n_bars = len(data) - 100 if len(data) > 100 else 0
+        bar_index = np.empty(n_bars, dtype=np.int64)
+        capital = np.empty(n_bars, dtype=np.float64)
+        positions_value = np.empty(n_bars, dtype=np.float64)
+        num_positions = np.empty(n_bars, dtype=np.int64)
+        num_hedges = np.empty(n_bars, dtype=np.int64)
+        
+        # Carnet en colonnes (les positions déjà ouvertes y sont transférées)
+        max_positions = self.config.max_positions
+        max_hedge_ratio = self.config.max_hedge_ratio
+        book = PositionBook(capacity=max(8, max_positions), config=self.config)
+        book_hedges: Dict[int, List[HedgePosition]] = {}
+        for position in self.positions:
+            seq = book.append(
+                position.entry_time.value, position.expiry_time.value, position.entry_price,
+                position.strike, position.contracts, position.premium_paid,
+                position.entry_volatility, position.entry_confidence
+            )
+            book.current_value[book.size - 1] = position.current_value
+            book.hedge_active[book.size - 1] = any(h.active for h in position.hedge_positions)
+            book.hedge_count[book.size - 1] = len(position.hedge_positions)
+            book_hedges[seq] = position.hedge_positions
+        self.positions = []
+        
+        active_hedges = sum(1 for h in self.hedge_positions if h.active)
+        hedges_seen = len(self.hedge_positions)
+        state_changed = True
+        recorded = 0
+        
+        # Barres calmes (revalorisation seule) déjà traitées d'avance par un
+        # chemin du carnet, et première barre d'événement connue
+        quiet_until = event_bar = 0
+        event_row = None
+        path_length = MIN_PATH_LENGTH
+        
+        # Parcours des arrays via des listes Python: accès scalaire sans boxing NumPy
+        for i, current_ns, current_price, current_vol, enter_signal in zip(
+            range(100, len(data)),
+            timestamps_ns[100:].tolist(),
+            close[100:].tolist(),
+            volatility[100:].tolist(),
+            should_enter_by_bar[100:].tolist()
+        ):
+            current_time = None
+            
+            # Vérifier si on doit arrêter le trading (l'état ne change qu'à
+            # l'ouverture ou la clôture d'une position)
+            if state_changed:
+                should_stop, stop_reason = self.should_stop_trading()
+                if should_stop:
+                    self.logger.warning(f"⚠️ Arrêt du trading: {stop_reason}")
+                    break
+                state_changed = False
+            
+            if i < quiet_until:
+                continue
+            
+            # Revaloriser d'avance le carnet sur les barres suivantes: jusqu'au
+            # premier événement (sortie, hedge, entrée possible) rien ne change
+            # hormis la valeur des positions, enregistrée en bloc
+            if book.size and i != event_bar:
+                end = min(len(data), i + path_length)
+                if book.size < max_positions and self.capital > self.max_risk_per_trade:
+                    next_signal = np.searchsorted(signal_bars, i)
+                    if next_signal < len(signal_bars):
+                        end = min(end, int(signal_bars[next_signal]))
+                if end > i:
+                    path = slice(i, end)
+                    path_pricing = book.revalue_path(
+                        close[path], timestamps_ns[path], volatility[path], self.price_straddle_book
+                    )
+                    quiet, path_actions = book.first_event(
+                        close[path], volatility[path], path_pricing, self.consecutive_losses
+                    )
+                    if quiet < end - i:
+                        event_bar, event_row = i + quiet, quiet
+                        path_length = max(MIN_PATH_LENGTH, path_length // 2)
+                    else:
+                        path_length = min(MAX_PATH_LENGTH, path_length * 2)
+                    if quiet:
+                        book.revalue_from_path(path_pricing, quiet - 1)
+                        
+                        # Valeur des positions sommée dans l'ordre d'ouverture (comme total_value)
+                        values = path_pricing['current_value'][:quiet]
+                        order = book.ordered_slots().tolist()
+                        total = values[:, order[0]].copy()
+                        for slot in order[1:]:
+                            total += values[:, slot]
+                        
+                        stored = slice(recorded, recorded + quiet)
+                        bar_index[stored] = np.arange(i, i + quiet)
+                        capital[stored] = self.capital
+                        positions_value[stored] = total
+                        num_positions[stored] = book.size
+                        num_hedges[stored] = active_hedges
+                        recorded += quiet
+                        quiet_until = i + quiet
+                        continue
+            
+            # Gérer les positions existantes (tout le carnet en une passe)
+            if book.size:
+                current_time = pd.Timestamp(current_ns, tz=tz)
+                if i == event_bar and event_row is not None:
+                    # Barre d'événement déjà revalorisée et évaluée par le chemin
+                    book_pricing = book.revalue_from_path(path_pricing, event_row)
+                    actions = path_actions[event_row]
+                    event_row = None
+                else:
+                    book_pricing = book.revalue(current_price, current_ns, current_vol, self.price_straddle_book)
+                    actions = None
+                
+                # Hedges (un seul hedge actif par position)
+                for slot in book.hedge_candidates(current_price).tolist():
+                    price_move = (current_price - book.entry_price[slot]) / book.entry_price[slot]
+                    direction = HedgeDirection.SHORT if price_move > 0 else HedgeDirection.LONG
+                    seq = int(book.seq[slot])
+                    hedge = self._register_hedge(
+                        direction, min(max_hedge_ratio, abs(price_move) * 2),
+                        current_price, current_time, str(seq)
+                    )
+                    book_hedges.setdefault(seq, []).append(hedge)
+                    book.hedge_active[slot] = True
+                    book.hedge_count[slot] += 1
+                
+                if actions is None:
+                    actions = book.evaluate_exits(book_pricing, current_vol, self.consecutive_losses)
+                if actions.any():
+                    slots_to_close = []
+                    strict_stop = self.consecutive_losses >= 2
+                    for slot in book.ordered_slots().tolist():
+                        if actions[slot] == HOLD:
+                            continue
+                        trade_result = self._close_book_position(
+                            book, slot, book_pricing, current_price, current_time, int(actions[slot]), tz
+                        )
+                        results['trades'].append(trade_result)
+                        book_hedges.pop(int(book.seq[slot]), None)
+                        slots_to_close.append(slot)
+                        
+                        # Le stop loss adaptatif dépend des pertes consécutives:
+                        # réévaluer les positions suivantes si le seuil bascule
+                        if (self.consecutive_losses >= 2) != strict_stop:
+                            strict_stop = not strict_stop
+                            actions = book.evaluate_exits(book_pricing, current_vol, self.consecutive_losses)
+                    
+                    book.remove_slots(slots_to_close)
+                state_changed = True
+            
+            # Chercher de nouvelles opportunités
+            if (enter_signal and book.size < max_positions
+                    and self.capital > self.max_risk_per_trade):
+                if current_time is None:
+                    current_time = pd.Timestamp(current_ns, tz=tz)
+                signal_info = self._signal_info_from_features(feature_arrays, i)
+                self._open_new_position(current_price, current_time, current_vol, signal_info, results, book)
+                state_changed = True
+            
+            # Les hedges ne sont recomptés que lorsque leur liste change (ils ne
+            # sont jamais désactivés: seuls les nouveaux sont à compter)
+            if len(self.hedge_positions) != hedges_seen:
+                active_hedges += sum(1 for h in self.hedge_positions[hedges_seen:] if h.active)
+                hedges_seen = len(self.hedge_positions)
+            
+            # Enregistrer les métriques quotidiennes (en colonnes)
+            bar_index[recorded] = i
+            capital[recorded] = self.capital
+            positions_value[recorded] = book.total_value()
+            num_positions[recorded] = book.size
+            num_hedges[recorded] = active_hedges
+            recorded += 1
+        
+        # Transfert en bloc dans l'accumulateur en colonnes
+        results['daily_pnl'].extend_columns(
+            timestamps_ns[bar_index[:recorded]],
+            capital[:recorded],
+            positions_value[:recorded],
+            num_positions[:recorded],
+            num_hedges[:recorded],
+            tz=tz
+        )
+        
+        # Les positions encore ouvertes redeviennent des StraddlePosition
+        # pour la clôture finale et les métriques
+        self.positions = [
+            StraddlePosition(
+                entry_time=pd.Timestamp(int(book.entry_time[slot]), tz=tz),
+                expiry_time=pd.Timestamp(int(book.expiry_time[slot]), tz=tz),
+                entry_price=float(book.entry_price[slot]),
+                strike=float(book.strike[slot]),
+                entry_volatility=float(book.entry_volatility[slot]),
+                contracts=int(book.contracts[slot]),
+                premium_paid=float(book.premium_paid[slot]),
+                current_value=float(book.current_value[slot]),
+                unrealized_pnl=float(book.unrealized_pnl[slot]),
+                pnl_percentage=float(book.pnl_percentage[slot]),
+                hedge_positions=book_hedges.get(int(book.seq[slot]), []),
+                entry_confidence=CONFIDENCE_LEVELS[book.confidence[slot]]
+            )
+            for slot in book.ordered_slots().tolist()
+        ]
+
     def _close_position(
         self, 
         position: StraddlePosition, 
@@ -574,17 +1056,63 @@ class StraddleStrategy:
         
         return trade_result
     
+    def _close_book_position(
+        self, 
+        book: PositionBook, 
+        slot: int, 
+        book_pricing: Dict[str, np.ndarray], 
+        exit_price: float, 
+        exit_time: datetime, 
+        action: int, 
+        tz
+    ) -> TradeResult:
+        """Clôture la position d'un slot du carnet (mêmes règles que _close_position)"""
+        current_value = float(book.current_value[slot])
+        unrealized_pnl = float(book.unrealized_pnl[slot])
+        
+        # Mettre à jour le capital
+        self.capital += current_value
+        
+        # Mettre à jour les statistiques de pertes consécutives
+        if unrealized_pnl > 0:
+            self.consecutive_losses = 0
+        else:
+            self.consecutive_losses += 1
+        
+        # Durée de détention renseignée comme dans manage_position
+        if action in (TAKE_PROFIT, STOP_LOSS, TIMEOUT):
+            holding_time = float(book_pricing['elapsed_hours'][slot])
+        else:
+            holding_time = 0
+        
+        return TradeResult(
+            entry_time=pd.Timestamp(int(book.entry_time[slot]), tz=tz),
+            exit_time=exit_time,
+            entry_price=float(book.entry_price[slot]),
+            exit_price=exit_price,
+            strike=float(book.strike[slot]),
+            premium_paid=float(book.premium_paid[slot]),
+            exit_value=current_value,
+            pnl=unrealized_pnl,
+            pnl_percentage=float(book.pnl_percentage[slot]),
+            contracts=int(book.contracts[slot]),
+            exit_reason=EXIT_REASONS[action],
+            holding_time_hours=holding_time,
+            hedge_count=int(book.hedge_count[slot])
+        )
+    
     def _open_new_position(
         self, 
         current_price: float, 
         current_time: datetime, 
         current_vol: float, 
         signal_info: Dict, 
-        results: Dict
+        results: Dict, 
+        book: Optional[PositionBook] = None
     ):
-        """Ouvre une nouvelle position straddle"""
+        """Ouvre une nouvelle position straddle (dans le carnet s'il est fourni)"""
         strike = current_price
-        time_to_expiry = DEFAULT_EXPIRY_DAYS / 365.25
+        time_to_expiry = self.config.default_expiry_days / 365.25
         
         # Calculer le prix du straddle
         straddle_pricing = self.simulate_straddle_price(
@@ -600,24 +1128,29 @@ class StraddleStrategy:
         
         # Vérifier si on a assez de capital
         if premium_paid <= self.capital and premium_paid <= self.max_risk_per_trade:
-            # Créer la position
-            new_position = StraddlePosition(
-                entry_time=current_time,
-                expiry_time=current_time + timedelta(days=DEFAULT_EXPIRY_DAYS),
-                entry_price=current_price,
-                strike=strike,
-                entry_volatility=current_vol,
-                contracts=contracts,
-                premium_paid=premium_paid,
-                current_value=premium_paid,
-                entry_confidence=signal_info['confidence']
-            )
+            expiry_time = current_time + timedelta(days=self.config.default_expiry_days)
             
             # Débiter le capital
             self.capital -= premium_paid
             
-            # Ajouter à la liste des positions
-            self.positions.append(new_position)
+            # Ajouter la position au carnet ou à la liste des positions
+            if book is not None:
+                book.append(
+                    current_time.value, expiry_time.value, current_price, strike,
+                    contracts, premium_paid, current_vol, signal_info['confidence']
+                )
+            else:
+                self.positions.append(StraddlePosition(
+                    entry_time=current_time,
+                    expiry_time=expiry_time,
+                    entry_price=current_price,
+                    strike=strike,
+                    entry_volatility=current_vol,
+                    contracts=contracts,
+                    premium_paid=premium_paid,
+                    current_value=premium_paid,
+                    entry_confidence=signal_info['confidence']
+                ))
             
             # Logger l'entrée
             results['positions_log'].append({
@@ -635,19 +1168,13 @@ class StraddleStrategy:
     
     def _record_daily_metrics(self, current_time: datetime, results: Dict):
         """Enregistre les métriques quotidiennes"""
-        total_positions_value = sum(pos.current_value for pos in self.positions)
-        total_value = self.capital + total_positions_value
-        daily_pnl = total_value - INITIAL_CAPITAL
-        
-        results['daily_pnl'].append({
-            'timestamp': current_time,
-            'capital': self.capital,
-            'positions_value': total_positions_value,
-            'total_value': total_value,
-            'total_pnl': daily_pnl,
-            'num_positions': len(self.positions),
-            'num_hedges': len([h for h in self.hedge_positions if h.active])
-        })
+        results['daily_pnl'].append(
+            current_time,
+            self.capital,
+            sum(pos.current_value for pos in self.positions),
+            len(self.positions),
+            sum(1 for h in self.hedge_positions if h.active)
+        )
     
     def _close_remaining_positions(self, data: pd.DataFrame, results: Dict):
         """Clôture les positions restantes à la fin du backtest"""
@@ -663,10 +1190,42 @@ class StraddleStrategy:
     
     def _calculate_final_metrics(self, results: Dict):
         """Calcule les métriques finales de performance"""
-        if not results['trades']:
-            return
+        final_capital = self.capital + sum(pos.current_value for pos in self.positions)
+        results['performance_metrics'] = self.compute_performance_metrics(
+            results['trades'], final_capital, results.get('hedge_opportunities', [])
+        )
+    
+    def compute_performance_metrics(
+        self, 
+        trades: List[TradeResult], 
+        final_capital: float, 
+        hedge_opportunities: List = ()
+    ) -> Dict[str, Any]:
+        """
+        Métriques de performance d'une liste de trades clôturés
         
-        trades = results['trades']
+        Args:
+            trades: Trades du backtest
+            final_capital: Capital final (capital + valeur des positions restantes)
+            hedge_opportunities: Opportunités de hedge enregistrées
+            
+        Returns:
+            Dict des performance_metrics du backtest
+        """
+        if not trades:
+            return {
+                'total_trades': 0,
+                'win_rate': 0,
+                'avg_pnl': 0,
+                'max_win': 0,
+                'max_loss': 0,
+                'profit_factor': 0,
+                'total_return': ((final_capital - self.config.initial_capital) / self.config.initial_capital) * 100,
+                'final_capital': final_capital,
+                'sharpe_ratio': 0,
+                'total_hedges': 0,
+                'avg_holding_time': 0
+            }
         
         # Métriques de base
         total_trades = len(trades)
@@ -686,10 +1245,8 @@ class StraddleStrategy:
         total_losses = abs(sum(t.pnl for t in losing_trades))
         profit_factor = total_wins / total_losses if total_losses > 0 else float('inf')
         
-        # Capital final
-        final_positions_value = sum(pos.current_value for pos in self.positions)
-        final_capital = self.capital + final_positions_value
-        total_return = ((final_capital - INITIAL_CAPITAL) / INITIAL_CAPITAL) * 100
+        # Rendement total
+        total_return = ((final_capital - self.config.initial_capital) / self.config.initial_capital) * 100
         
         # Sharpe ratio approximatif
         if len(pnl_percentages) > 1:
@@ -698,9 +1255,9 @@ class StraddleStrategy:
             sharpe_ratio = 0
         
         # Métriques de hedging
-        total_hedges = sum(len(results['hedge_opportunities']) for _ in results.get('hedge_opportunities', []))
+        total_hedges = sum(len(hedge_opportunities) for _ in hedge_opportunities)
         
-        results['performance_metrics'] = {
+        return {
             'total_trades': total_trades,
             'win_rate': win_rate,
             'avg_pnl': avg_pnl,
@@ -102,7 +102,7 @@ class TradingVisualization:
             ax.set_title('💰 Évolution du Capital', color=self.colors['text'])
             return
         
-        df = pd.DataFrame(results['daily_pnl'])
+        df = results['daily_pnl'].to_dataframe()
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         
         # Ligne principale
@@ -275,7 +275,7 @@ class TradingVisualization:
             ax.set_title('📉 Drawdown', color=self.colors['text'])
             return
         
-        df = pd.DataFrame(results['daily_pnl'])
+        df = results['daily_pnl'].to_dataframe()
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         
         # Calcul du drawdown
@@ -375,7 +375,7 @@ class TradingVisualization:
         fig.patch.set_facecolor(self.colors['background'])
         fig.suptitle('🛡️ ANALYSE DES RISQUES', fontsize=16, fontweight='bold', color=self.colors['text'])
         
-        df = pd.DataFrame(results['daily_pnl'])
+        df = results['daily_pnl'].to_dataframe()
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         df['returns'] = df['total_value'].pct_change() * 100
         
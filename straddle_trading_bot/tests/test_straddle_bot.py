@@ -2,18 +2,42 @@
 # Validation des composants principaux
 
 import sys
+import math
+import time
+import dataclasses
 import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 
-# Ajouter le dossier src au path
-sys.path.append(str(Path(__file__).parent.parent / 'src'))
+# Ajouter la racine du projet au path
+sys.path.append(str(Path(__file__).parent.parent))
 
-from config import *
-from data_manager import DataManager
-from straddle_strategy import StraddleStrategy, StraddlePosition, HedgeDirection
+from src.config import *
+from src.data_manager import DataManager
+from src.straddle_strategy import (
+    StraddleStrategy, StraddlePosition, HedgePosition, TradeResult, HedgeDirection, SIGNAL_CRITERIA,
+    SIGNAL_FLAGS, signal_flag
+)
+import src.straddle_strategy as straddle_module
+import src.shared_market_data as shared_module
+from src.pricing import price_straddles, norm_cdf
+from src.position_book import PositionBook, EXIT_REASONS
+from src.daily_metrics import DailyMetrics, DAILY_METRICS_COLUMNS
+from src.parameter_sweep import expand_grid, group_param_sets, profile_param_sets, run_parameter_sweep
+from src.batch_backtest import run_batch_backtest
+from src.shared_market_data import SharedMarketData, attach_market_data, detach_market_data
+from src.ohlcv_downloader import TokenBucket, download_ohlcv
+from src.ohlcv_resampler import resample_ohlcv
+from src.ohlcv_cache import OHLCVCache
+from src.indicator_registry import history_bars, warmup_bars
+from src.compact_dtypes import compact_frame, memory_bytes
+from src.market_panel import MarketPanel
+from src.fake_exchange import FakeExchange, create_exchange
+from src.streaming_indicators import (
+    INDICATOR_COLUMNS, RollingOrderStatistics, StreamingIndicators, rolling_percentile, rolling_rank
+)
 
 class TestConfiguration:
     """Tests de la configuration"""
@@ -33,6 +57,29 @@ class TestConfiguration:
         assert MAX_POSITIONS >= 1
         assert TAKE_PROFIT_MULTIPLIER > STOP_LOSS_MULTIPLIER
     
+    def test_strategy_config(self):
+        """StrategyConfig immuable, hashable et chargée depuis les profils"""
+        config = StrategyConfig()
+        assert config.take_profit_multiplier == TAKE_PROFIT_MULTIPLIER
+        assert hash(config) == hash(StrategyConfig())
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.max_positions = 10
+        
+        aggressive = StrategyConfig.from_profile('AGGRESSIVE', TRADE_TIMEOUT_HOURS=48)
+        assert aggressive.max_positions == PROFILES['AGGRESSIVE']['MAX_POSITIONS']
+        assert aggressive.trade_timeout_hours == 48
+        assert aggressive.digest() != config.digest()
+        assert aggressive.digest() == StrategyConfig.from_profile('AGGRESSIVE', trade_timeout_hours=48).digest()
+        assert len({config, aggressive, StrategyConfig()}) == 2
+        
+        with pytest.raises(ValueError):
+            config.replace(UNKNOWN_PARAMETER=1)
+        with pytest.raises(ValueError):
+            StrategyConfig.from_profile('YOLO')
+        
+        errors, _ = validate_config(config.replace(take_profit_multiplier=0.5))
+        assert len(errors) == 1
+    
     def test_hedging_parameters(self):
         """Test des paramètres de hedging"""
         if ENABLE_HEDGING:
@@ -63,9 +110,10 @@ class TestDataManager:
             'volume': [1000, 1100, 1200]
         })
         
-        # Les données valides doivent passer
-        validated = dm._validate_price_consistency(test_data)
+        # Les données valides doivent passer, sans copie
+        validated, report = dm.validate_data(test_data)
         assert len(validated) == len(test_data)
+        assert validated is test_data and report.n_removed == 0
     
     def test_outlier_removal(self):
         """Test de suppression des outliers"""
@@ -80,9 +128,406 @@ class TestDataManager:
             'volume': [1000, 1100, 1200]
         })
         
-        cleaned = dm._remove_outliers(test_data)
+        cleaned, report = dm.validate_data(test_data)
         # Les outliers doivent être supprimés
         assert len(cleaned) < len(test_data)
+        assert report.rejected['non_positive_price'] == 1
+    
+    def test_quality_report(self):
+        """Un seul masque pour toutes les règles, compteurs et trous rapportés"""
+        dm = DataManager(StrategyConfig(timeframe='1h'))
+        index = pd.date_range('2023-01-01', periods=10, freq='h')
+        index = index[[0, 1, 2, 3, 3, 4, 5, 8, 9, 9]]
+        data = pd.DataFrame({
+            'open':  [100, 101, 102, 103, 103, 104, 160, 106, 107, 108],
+            'high':  [101, 102, 103, 104, 104, 99, 161, 107, 108, 109],
+            'low':   [99, 100, 101, 102, 102, 98, 159, -1, 106, 107],
+            'close': [100.5, 101.5, 102.5, np.nan, 103.5, 104.5, 160.5, 106.5, 107.5, 108.5],
+            'volume': [1.0] * 10
+        }, index=index)
+        
+        cleaned, report = dm.validate_data(data)
+        assert report.rejected == {
+            'nan': 1, 'non_positive_price': 1, 'price_jump': 1,
+            'ohlc_inconsistent': 1, 'duplicate_timestamp': 2
+        }
+        # Barres gardées: 0, 1, 2, 3 (la dernière des doublons), 9 (la dernière)
+        assert list(cleaned['open']) == [100, 101, 102, 103, 108]
+        assert report.n_kept == 5 and report.n_removed == 5
+        assert report.gaps == [(index[4], index[9], 5)]
+        assert report.to_dict()['missing_bars'] == 5
+        
+        dm._validate_and_clean_data(data)
+        assert dm.quality_report == report
+    
+    def test_ohlcv_disk_cache(self, tmp_path):
+        """Le cache disque ne télécharge que la fin manquante et se lit hors ligne"""
+        class CountingExchange:
+            def __init__(self):
+                self.calls = []
+            
+            def fetch_ohlcv(self, symbol, timeframe, since=None, limit=1000):
+                self.calls.append(since)
+                start = -(-since // 3600000) * 3600000
+                return [[ts, 100.0, 101.0, 99.0, 100.5, 10.0]
+                        for ts in range(start, start + limit * 3600000, 3600000)]
+        
+        config = StrategyConfig(
+            data_cache_dir=str(tmp_path), base_timeframe='1h', start_date='2023-01-01', end_date='2023-03-01'
+        )
+        dm = DataManager(config)
+        dm.exchange = CountingExchange()
+        first = dm._fetch_ohlcv_data()
+        assert len(first) == 59 * 24
+        assert len(dm.exchange.calls) == 2
+        
+        # Nouveau run: période en cache, aucun téléchargement
+        dm = DataManager(config)
+        dm.exchange = CountingExchange()
+        pd.testing.assert_frame_equal(dm._fetch_ohlcv_data(), first)
+        assert dm.exchange.calls == []
+        
+        # Période prolongée: seule la fin manquante est téléchargée
+        dm = DataManager(config.replace(end_date='2023-03-15'))
+        dm.exchange = CountingExchange()
+        extended = dm._fetch_ohlcv_data()
+        assert len(extended) == 73 * 24
+        assert dm.exchange.calls == [int(pd.Timestamp('2023-03-01').timestamp() * 1000)]
+        pd.testing.assert_frame_equal(extended.iloc[:len(first)], first)
+        
+        # Hors ligne: données en cache uniquement
+        dm = DataManager(config.replace(end_date='2023-04-01'))
+        dm.exchange = None
+        assert len(dm._fetch_ohlcv_data()) == 73 * 24
+        assert dm.ohlcv_cache.missing_ranges(0, 10) == [(0, 10)]
+
+    def test_indicators_limited_to_strategy_features(self, tmp_path):
+        """Seuls les indicateurs lus par la stratégie sont calculés, chauffe minimale"""
+        config = StrategyConfig(
+            exchange_id='fake', data_cache_dir=str(tmp_path), timeframe='1h',
+            start_date='2023-01-01', end_date='2023-02-01'
+        )
+        features = StraddleStrategy(config).required_features()
+        assert 'sma_50' in features
+        assert 'sma_50' not in StraddleStrategy(config.replace(trend_filter=False)).required_features()
+        assert warmup_bars(features) == 119 and warmup_bars() == 271
+        
+        dm = DataManager(config)
+        full = dm.get_market_data()
+        lean = dm.get_market_data(features)
+        assert 'volatility_rank' not in lean and 'bb_std' not in lean and 'true_range' not in lean
+        assert len(lean) == len(full) + 271 - 119
+        shared = [name for name in lean.columns if name in full.columns]
+        pd.testing.assert_frame_equal(lean.loc[full.index, shared], full[shared])
+        
+        with pytest.raises(ValueError):
+            dm.get_backtest_data(['unknown_indicator'])
+    
+    def test_backtest_data_reads_window_and_warmup_only(self, tmp_path):
+        """Période de backtest: indicateurs calculés sur la fenêtre et sa chauffe, mêmes valeurs"""
+        config = StrategyConfig(
+            exchange_id='fake', data_cache_dir=str(tmp_path), timeframe='1h',
+            start_date='2023-01-01', end_date='2023-05-01',
+            backtest_start_date='2023-03-01', backtest_end_date='2023-03-15'
+        )
+        dm = DataManager(config)
+        full = dm.get_market_data()
+        expected = full[config.backtest_start_date:'2023-03-14 23:00']
+        
+        computed = []
+        add_indicators = dm._add_technical_indicators
+        dm._add_technical_indicators = lambda df, features=None: computed.append(len(df)) or add_indicators(df, features)
+        backtest = dm.get_backtest_data()
+        assert computed == [14 * 24 + history_bars()]
+        pd.testing.assert_frame_equal(backtest, expected, rtol=1e-12)
+    
+    def test_panel_aligned_on_common_grid(self):
+        """Panel multi-symboles: grille commune, barres manquantes masquées, vues sans copie"""
+        config = StrategyConfig(
+            exchange_id='fake', use_data_cache=False, start_date='2023-01-01', end_date='2023-03-01'
+        )
+        features = StraddleStrategy(config).required_features()
+        dm = DataManager(config)
+        frames = {symbol: dm._fetch_ohlcv_data(symbol) for symbol in ('BTC/USDT', 'ETH/USDT', 'SOL/USDT')}
+        frames['ETH/USDT'] = frames['ETH/USDT'].drop(frames['ETH/USDT'].index[[500, 501, 900]])
+        frames['SOL/USDT'] = frames['SOL/USDT'].iloc[300:]
+        
+        panel = MarketPanel.from_frames(frames, pd.Timedelta(hours=1)).compute_indicators(features)
+        assert panel.fields['rsi'].shape == (len(frames['BTC/USDT']), 3)
+        assert panel.missing_bars() == {'BTC/USDT': 0, 'ETH/USDT': 3, 'SOL/USDT': 0}
+        assert not panel.present[500, 1] and not panel.present[:300, 2].any()
+        # Fenêtres glissantes recouvrant un trou: barres non prêtes
+        assert not panel.ready[510, 1] and panel.ready[510, 0]
+        
+        # Symbole sans trou: mêmes valeurs qu'en mono-symbole, sans copie
+        for symbol in ('BTC/USDT', 'SOL/USDT'):
+            single = dm._add_technical_indicators(frames[symbol].copy(), features).dropna()
+            view = panel.symbol_frame(symbol)
+            pd.testing.assert_frame_equal(view, single, check_freq=False)
+            assert np.shares_memory(view['close'].to_numpy(), panel.fields['close'])
+        assert not panel.symbol_frame('ETH/USDT')['rsi'].isna().any()
+        
+        loaded = dm.get_panel_data(['BTC/USDT', 'ETH/USDT'], features)
+        assert loaded.symbols == ['BTC/USDT', 'ETH/USDT'] and len(loaded) == len(frames['BTC/USDT'])
+        assert dm.panel_quality_reports['ETH/USDT'].n_removed == 0
+        assert len(dm.get_backtest_panel(['BTC/USDT'], features)) == 0  # hors période de backtest
+    
+    def test_compact_dtypes(self, tmp_path):
+        """Mode compact: données float32, mêmes barres et mêmes signaux"""
+        config = StrategyConfig(
+            exchange_id='fake', data_cache_dir=str(tmp_path), timeframe='1h',
+            start_date='2023-01-01', end_date='2023-02-01'
+        )
+        full = DataManager(config).get_market_data()
+        compact = DataManager(config.replace(compact_dtypes=True)).get_market_data()
+        assert set(compact.dtypes) == {np.dtype(np.float32)}
+        assert memory_bytes(compact) < 0.6 * memory_bytes(full)
+        pd.testing.assert_frame_equal(compact, full.astype(np.float32))
+        
+        features = StraddleStrategy(config).compute_signal_features(full)
+        packed = StraddleStrategy(config.replace(compact_dtypes=True)).compute_signal_features(compact)
+        assert packed['signal_flags'].dtype == np.uint8 and 'should_enter' not in packed
+        for name in SIGNAL_FLAGS:
+            assert (signal_flag(packed, name) == features[name].to_numpy()).mean() > 0.99
+    
+    def test_memory_mapped_bar_store(self, tmp_path):
+        """Colonnes mappées: fenêtres sans copie, ajouts en fin sans réécriture"""
+        hour = 3600000
+        bars = lambda start, n: [[ts, 100.0, 101.0, 99.0, 100.5, float(ts // hour)]
+                                 for ts in range(start, start + n * hour, hour)]
+        cache = OHLCVCache(str(tmp_path), 'binance', 'BTC/USDT', '1h')
+        cache.append(bars(0, 100), 0, 100 * hour)
+        assert cache.manifest['format'] == 'mmap' and cache.manifest['generation'] == 1
+        
+        window = cache.read(10 * hour, 20 * hour)
+        assert len(window) == 10 and window['volume'].iloc[0] == 10
+        assert np.shares_memory(window['volume'].to_numpy(), cache.load()['volume'].to_numpy())
+        
+        # Ajout interrompu (octets hors manifeste) puis ajout en fin de série
+        with open(cache._column_path('volume', 1), 'ab') as f:
+            f.write(b'\0' * 24)
+        reopened = OHLCVCache(str(tmp_path), 'binance', 'BTC/USDT', '1h')
+        assert len(reopened.load()) == 100
+        reopened.append(bars(100 * hour, 50), 100 * hour, 150 * hour)
+        assert reopened.manifest['generation'] == 1
+        assert reopened.read(0, 2**62)['volume'].tolist() == list(range(150))
+        
+        # Barres antérieures: nouvelle génération, anciens fichiers supprimés
+        reopened.append(bars(-10 * hour, 10), -10 * hour, 0)
+        assert reopened.manifest['generation'] == 2
+        assert not reopened._column_path('volume', 1).exists()
+        assert reopened.read(-2**62, 2**62)['volume'].tolist() == list(range(-10, 150))
+        assert window['volume'].iloc[0] == 10
+    
+    def test_timeframes_resampled_from_base_series(self, tmp_path):
+        """Série 1m téléchargée une fois, timeframes plus longs agrégés sans réseau"""
+        config = StrategyConfig(
+            exchange_id='fake', data_cache_dir=str(tmp_path), timeframe='1h',
+            start_date='2023-01-01', end_date='2023-01-08'
+        )
+        # Sans série de base (défaut): le timeframe de la configuration est en cache
+        assert DataManager(config).ohlcv_cache.timeframe == '1h'
+        
+        config = config.replace(base_timeframe='1m')
+        dm = DataManager(config)
+        hourly = dm._fetch_ohlcv_data()
+        assert dm.ohlcv_cache.timeframe == '1m' and len(hourly) == 7 * 24
+        
+        base = dm.ohlcv_cache.read(0, 2**62)
+        first_hour = base.iloc[:60]
+        assert hourly.iloc[0].tolist() == pytest.approx([
+            first_hour['open'].iloc[0], first_hour['high'].max(), first_hour['low'].min(),
+            first_hour['close'].iloc[-1], first_hour['volume'].sum()
+        ])
+        
+        # Changement de timeframe: aucune requête, vue mémorisée
+        for timeframe, n_bars in (('4h', 7 * 6), ('1d', 7), ('15m', 7 * 96)):
+            dm = DataManager(config.replace(timeframe=timeframe))
+            dm.exchange = None
+            assert len(dm._fetch_ohlcv_data()) == n_bars
+        assert dm.ohlcv_cache.read(0, 2**62, '1d') is not dm.ohlcv_cache.read(0, 2**62, '1d')
+        
+        # Barre partielle au bord d'une plage couverte écartée
+        partial = resample_ohlcv(dm.ohlcv_cache.load(), '1h', '1m', start_ms=base.index[0].value // 10**6 + 60000)
+        assert partial.index[0] == base.index[60]
+
+class TestOHLCVDownloader:
+    """Tests du téléchargement concurrent de l'historique"""
+    
+    class FakeAsyncExchange:
+        """Exchange local: barres 1m, latence, erreurs réseau et pages courtes"""
+        rateLimit = 1
+        
+        def __init__(self, first_ms, last_ms, page_size=1000, failures=0):
+            self.first_ms = first_ms
+            self.last_ms = last_ms
+            self.page_size = page_size
+            self.failures = failures
+            self.calls = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+        
+        async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=1000):
+            import asyncio
+            import ccxt
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.002)
+                if self.failures:
+                    self.failures -= 1
+                    raise ccxt.RateLimitExceeded('429')
+                start = max(self.first_ms, -(-since // 60000) * 60000)
+                stop = min(self.last_ms, start + min(limit, self.page_size) * 60000)
+                return [[ts, 1.0, 2.0, 0.5, 1.5, 3.0] for ts in range(start, stop, 60000)]
+            finally:
+                self.in_flight -= 1
+    
+    def test_concurrent_download_is_complete_and_ordered(self):
+        """Fenêtres concurrentes recousues sans trou ni doublon, sans limite de barres"""
+        start_ms = int(pd.Timestamp('2023-01-01').timestamp() * 1000)
+        end_ms = start_ms + 150_000 * 60000
+        exchange = self.FakeAsyncExchange(start_ms, end_ms + 10 * 60000, page_size=600, failures=3)
+        
+        rows, reached = download_ohlcv(
+            exchange, 'BTC/USDT', '1m', start_ms, end_ms, concurrency=16, backoff=0.001
+        )
+        
+        assert reached == end_ms
+        assert [row[0] for row in rows] == list(range(start_ms, end_ms, 60000))
+        assert exchange.max_in_flight > 1
+        assert exchange.calls >= 2 * 150 + 3
+    
+    def test_failed_window_limits_coverage(self):
+        """Une fenêtre en échec après les nouvelles tentatives borne la plage couverte"""
+        start_ms = 0
+        exchange = self.FakeAsyncExchange(0, 10**12, failures=100)
+        rows, reached = download_ohlcv(
+            exchange, 'BTC/USDT', '1m', start_ms, 3000 * 60000, max_retries=1, backoff=0.001
+        )
+        assert rows == [] and reached == start_ms
+    
+    def test_token_bucket_rate(self):
+        """Le token bucket limite le débit après la rafale initiale"""
+        import asyncio
+        
+        async def acquire_all(bucket, n):
+            for _ in range(n):
+                await bucket.acquire()
+        
+        start = time.perf_counter()
+        asyncio.run(acquire_all(TokenBucket(rate=200, capacity=5), 25))
+        assert time.perf_counter() - start >= 0.09
+
+class TestFakeExchange:
+    """Tests de l'exchange local hors ligne"""
+    
+    def test_data_manager_offline_replay(self):
+        """DataManager sélectionne l'exchange local par son id, barres déterministes"""
+        config = StrategyConfig(
+            exchange_id='fake', use_data_cache=False, start_date='2023-01-01', end_date='2023-03-01'
+        )
+        dm = DataManager(config)
+        assert isinstance(dm.exchange, FakeExchange)
+        first = dm._fetch_ohlcv_data()
+        assert len(first) == 59 * 24
+        assert (first['high'] >= first[['open', 'close']].max(axis=1)).all()
+        assert (first['low'] <= first[['open', 'close']].min(axis=1)).all()
+        pd.testing.assert_frame_equal(DataManager(config)._fetch_ohlcv_data(), first)
+    
+    def test_orders_update_balances(self):
+        """Ordres market exécutés sur l'order book, ordres limit qui bloquent les fonds"""
+        exchange = create_exchange('fake', {'balances': {'USDT': 10000}})
+        book = exchange.fetch_order_book('BTC/USDT', 5)
+        assert book['bids'][0][0] < book['asks'][0][0]
+        
+        order = exchange.create_market_buy_order('BTC/USDT', 0.01)
+        assert order['status'] == 'closed' and order['average'] >= book['asks'][0][0] * 0.99
+        balance = exchange.fetch_balance()
+        assert balance['BTC']['free'] == pytest.approx(0.01)
+        assert balance['USDT']['free'] == pytest.approx(10000 - order['cost'] * 1.001)
+        
+        exchange.create_limit_buy_order('BTC/USDT', 0.01, 1000)
+        assert len(exchange.fetch_open_orders('BTC/USDT')) == 1
+        assert exchange.fetch_balance()['USDT']['used'] == pytest.approx(10.01)
+        exchange.cancel_all_orders('BTC/USDT')
+        assert exchange.fetch_balance()['USDT']['used'] == pytest.approx(0)
+    
+    def test_latency_throughput_and_watch_order_book(self):
+        """Latence par requête, débit limité et cadence des mises à jour websocket"""
+        import asyncio
+        import ccxt
+        
+        exchange = create_exchange('fake', {'max_requests_per_second': 3})
+        for _ in range(3):
+            exchange.fetch_ticker('ETH/USDT')
+        with pytest.raises(ccxt.RateLimitExceeded):
+            exchange.fetch_ticker('ETH/USDT')
+        
+        async def watch(exchange, n):
+            books = [await exchange.watch_order_book('ETH/USDT') for _ in range(n)]
+            await exchange.close()
+            return books
+        
+        exchange = create_exchange('fake_a', {'latency_ms': 5, 'order_book_updates_per_second': 100}, asynchronous=True)
+        start = time.perf_counter()
+        books = asyncio.run(watch(exchange, 10))
+        assert time.perf_counter() - start >= 0.09
+        assert all(book['bids'][0][0] < book['asks'][0][0] for book in books)
+
+class TestStreamingIndicators:
+    """Tests des indicateurs incrémentaux"""
+    
+    @staticmethod
+    def create_bars(n=1500):
+        rng = np.random.default_rng(7)
+        close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        close[300:330] = close[300]  # Plateau: variance nulle, RSI indéfini
+        return pd.DataFrame({
+            'open': close * (1 + rng.normal(0, 0.002, n)),
+            'high': close * (1 + rng.uniform(0.001, 0.01, n)),
+            'low': close * (1 - rng.uniform(0.001, 0.01, n)),
+            'close': close,
+            'volume': rng.uniform(10, 100, n)
+        }, index=pd.date_range('2023-01-01', periods=n, freq='h'))
+    
+    def test_matches_batch_indicators(self):
+        """Mise à jour barre par barre identique au calcul vectorisé du DataManager"""
+        bars = self.create_bars()
+        batch = DataManager(StrategyConfig(use_data_cache=False))._add_technical_indicators(bars.copy())
+        
+        stream = StreamingIndicators.from_bars(bars.iloc[:1000])
+        rows = [stream.update(*bar) for bar in bars.iloc[1000:].itertuples(index=False)]
+        streamed = pd.concat([
+            StreamingIndicators().update_frame(bars.iloc[:1000]),
+            pd.DataFrame(rows, index=bars.index[1000:])
+        ])
+        
+        assert list(batch.columns) == list(INDICATOR_COLUMNS)
+        pd.testing.assert_frame_equal(streamed, batch, check_exact=False, rtol=1e-9, atol=1e-9)
+        assert stream.ready()
+    
+    def test_rolling_order_statistics(self):
+        """Rangs et percentiles glissants identiques à pandas et np.percentile"""
+        values = np.random.default_rng(3).random(2000)
+        values[:20] = np.nan
+        values[500:510] = np.nan
+        values[900:950] = 0.5  # Ex aequo
+        
+        expected_rank = pd.Series(values).rolling(100).rank(pct=True).to_numpy()
+        np.testing.assert_array_equal(rolling_rank(values, 100), expected_rank)
+        
+        thresholds = rolling_percentile(values, 100, 75, include_current=False)
+        for i in (100, 520, 960, 1999):
+            history = values[i - 100:i]
+            assert thresholds[i] == np.percentile(history[~np.isnan(history)], 75)
+        assert np.isnan(thresholds[:100]).all()
+        
+        stats = RollingOrderStatistics(3)
+        for value in (3.0, 1.0, 2.0, 5.0):
+            stats.push(value)
+        assert stats.rank() == 1.0 and stats.percentile(50) == 2.0
 
 class TestStraddleStrategy:
     """Tests de la stratégie straddle"""
@@ -171,6 +616,27 @@ class TestStraddleStrategy:
         assert 'confidence' in signal_info
         assert signal_info['confidence'] in ['LOW', 'MEDIUM', 'HIGH']
     
+    def test_signal_features_match_per_bar(self):
+        """Test de cohérence signaux vectorisés / calcul barre par barre"""
+        np.random.seed(42)
+        strategy = StraddleStrategy()
+        test_data = create_test_market_data(300)
+        
+        features = strategy.compute_signal_features(test_data)
+        assert len(features) == len(test_data)
+        
+        for i in range(100, len(test_data)):
+            should_enter, signal_info = strategy.calculate_signal_quality(test_data.iloc[:i+1])
+            
+            assert features['should_enter'].iloc[i] == should_enter
+            assert features['signal_quality'].iloc[i] == signal_info['signal_quality']
+            assert features['confidence'].iloc[i] == signal_info['confidence']
+            for name in SIGNAL_CRITERIA:
+                assert features[name].iloc[i] == signal_info['criteria_details'][name]
+        
+        # Pas d'entrée avant 100 barres d'historique
+        assert not features['should_enter'].iloc[:99].any()
+    
     def test_hedge_decision(self):
         """Test de décision de hedge"""
         strategy = StraddleStrategy()
@@ -220,10 +686,200 @@ class TestStraddleStrategy:
         )
         
         # Doit retourner une action valide
-        from straddle_strategy import TradeAction
+        from src.straddle_strategy import TradeAction
         assert action in TradeAction
         assert isinstance(info, dict)
 
+def reference_straddle(spot, strike, volatility, time_to_expiry, rate):
+    """Black-Scholes scalaire de référence (math.erf)"""
+    cdf = lambda x: 0.5 * (1 + math.erf(x / math.sqrt(2)))
+    d1 = (math.log(spot / strike) + (rate + 0.5 * volatility ** 2) * time_to_expiry) / (volatility * math.sqrt(time_to_expiry))
+    d2 = d1 - volatility * math.sqrt(time_to_expiry)
+    call = spot * cdf(d1) - strike * math.exp(-rate * time_to_expiry) * cdf(d2)
+    put = strike * math.exp(-rate * time_to_expiry) * cdf(-d2) - spot * cdf(-d1)
+    return call, put
+
+class TestPricing:
+    """Tests du noyau de pricing vectorisé"""
+    
+    def test_norm_cdf_exact(self):
+        """La CDF doit être exacte (erf) et non approchée"""
+        for x in [-6, -2.5, -1, -0.3, 0, 0.3, 1, 2.5, 6]:
+            assert abs(norm_cdf(x) - 0.5 * (1 + math.erf(x / math.sqrt(2)))) < 1e-15
+    
+    def test_prices_match_reference(self):
+        """Prix call/put identiques à l'implémentation scalaire de référence"""
+        rng = np.random.default_rng(0)
+        n = 500
+        spot = rng.uniform(10, 100000, n)
+        strike = spot * rng.uniform(0.5, 1.5, n)
+        volatility = rng.uniform(0.05, 3.0, n)
+        time_to_expiry = rng.uniform(0.001, 2.0, n)
+        
+        pricing = price_straddles(spot, strike, volatility, time_to_expiry, 0.02)
+        
+        for k in range(n):
+            call, put = reference_straddle(spot[k], strike[k], volatility[k], time_to_expiry[k], 0.02)
+            tolerance = 1e-9 * spot[k]
+            assert abs(pricing['call_price'][k] - call) < tolerance
+            assert abs(pricing['put_price'][k] - put) < tolerance
+            assert abs(pricing['straddle_price'][k] - (call + put)) < 2 * tolerance
+    
+    def test_put_call_parity(self):
+        """C - P = S - K·exp(-rT)"""
+        spot = np.linspace(20000, 80000, 50)
+        pricing = price_straddles(spot, 50000, 0.6, 0.25, 0.02)
+        parity = spot - 50000 * np.exp(-0.02 * 0.25)
+        assert np.allclose(pricing['call_price'] - pricing['put_price'], parity, rtol=0, atol=1e-8)
+    
+    def test_greeks_match_finite_differences(self):
+        """Delta, gamma, vega et theta cohérents avec des différences finies"""
+        spot, strike, volatility, time_to_expiry, rate = 50000.0, 48000.0, 0.55, 0.2, 0.02
+        price = lambda s, v, t: price_straddles(s, strike, v, t, rate)['straddle_price'][()]
+        greeks = price_straddles(spot, strike, volatility, time_to_expiry, rate)
+        
+        h = 1.0
+        delta = (price(spot + h, volatility, time_to_expiry) - price(spot - h, volatility, time_to_expiry)) / (2 * h)
+        gamma = (price(spot + h, volatility, time_to_expiry) - 2 * price(spot, volatility, time_to_expiry)
+                 + price(spot - h, volatility, time_to_expiry)) / h ** 2
+        vega = (price(spot, volatility + 1e-4, time_to_expiry) - price(spot, volatility - 1e-4, time_to_expiry)) / 2e-4
+        theta = -(price(spot, volatility, time_to_expiry + 1e-5) - price(spot, volatility, time_to_expiry - 1e-5)) / 2e-5
+        
+        assert abs(greeks['delta'] - delta) < 1e-6
+        assert abs(greeks['gamma'] - gamma) / gamma < 1e-3
+        assert abs(greeks['vega'] - vega) / vega < 1e-6
+        assert abs(greeks['theta'] - theta) / abs(theta) < 1e-5
+    
+    def test_expired_contracts(self):
+        """À l'expiration: valeur intrinsèque, greeks de maturité"""
+        pricing = price_straddles([55000, 45000], 50000, 0.5, [0.0, -1.0])
+        assert np.array_equal(pricing['straddle_price'], [5000, 5000])
+        assert np.array_equal(pricing['time_value'], [0, 0])
+        assert np.array_equal(pricing['delta'], [1, -1])
+        assert not pricing['gamma'].any() and not pricing['vega'].any()
+    
+    def test_book_pricing_matches_single_pricing(self):
+        """La revalorisation groupée doit égaler le pricing position par position"""
+        strategy = StraddleStrategy()
+        strikes = [48000, 50000, 52000]
+        times = [0.08, 0.05, 0.0]
+        book = strategy.price_straddle_book(50000, strikes, 0.5, times)
+        for k in range(3):
+            single = strategy.simulate_straddle_price(50000, strikes[k], 0.5, times[k])
+            # Chemin scalaire (math) et vectorisé (NumPy): égaux à l'arrondi près
+            assert single['straddle_price'] == pytest.approx(book['straddle_price'][k], rel=1e-12)
+            assert single['time_value'] == pytest.approx(book['time_value'][k], rel=1e-9, abs=1e-9)
+
+class TestPositionBook:
+    """Tests du carnet de positions en colonnes"""
+    
+    def _fill(self, book, n):
+        for k in range(n):
+            book.append(
+                entry_time=k * 10**9, expiry_time=(k + 7 * 86400) * 10**9,
+                entry_price=100.0 + k, strike=100.0 + k, contracts=1 + k,
+                premium_paid=10.0 + k, entry_volatility=0.5, confidence='HIGH' if k % 2 else 'LOW'
+            )
+    
+    def test_append_grows_capacity(self):
+        """L'ajout au-delà de la capacité double les colonnes sans perte"""
+        book = PositionBook(capacity=2)
+        self._fill(book, 5)
+        
+        assert len(book) == 5
+        assert book.capacity >= 5
+        assert book.contracts[:5].tolist() == [1, 2, 3, 4, 5]
+        assert book.current_value[:5].tolist() == [10.0, 11.0, 12.0, 13.0, 14.0]
+    
+    def test_swap_remove_keeps_opening_order(self):
+        """Le swap-remove déplace la dernière position; seq conserve l'ordre d'ouverture"""
+        book = PositionBook()
+        self._fill(book, 4)
+        book.remove_slots([0, 2])
+        
+        assert len(book) == 2
+        assert book.seq[book.ordered_slots()].tolist() == [1, 3]
+        assert book.total_value() == 11.0 + 13.0
+        with pytest.raises(IndexError):
+            book.swap_remove(2)
+    
+    def test_exits_match_manage_position(self):
+        """Les actions du carnet sont celles de manage_position position par position"""
+        strategy = StraddleStrategy()
+        book = PositionBook()
+        positions = []
+        start = pd.Timestamp('2024-01-01')
+        rng = np.random.default_rng(3)
+        for k in range(50):
+            entry_time = start - pd.Timedelta(hours=int(rng.integers(0, 60)))
+            entry_price = float(rng.uniform(40, 60))
+            position = StraddlePosition(
+                entry_time=entry_time,
+                expiry_time=entry_time + pd.Timedelta(days=int(rng.integers(1, 10))),
+                entry_price=entry_price,
+                strike=entry_price,
+                entry_volatility=float(rng.uniform(0.3, 1.5)),
+                contracts=int(rng.integers(1, 5)),
+                premium_paid=float(rng.uniform(2, 15)),
+                entry_confidence=('LOW', 'MEDIUM', 'HIGH')[k % 3]
+            )
+            positions.append(position)
+            book.append(
+                position.entry_time.value, position.expiry_time.value, position.entry_price,
+                position.strike, position.contracts, position.premium_paid,
+                position.entry_volatility, position.entry_confidence
+            )
+        
+        for consecutive_losses in (0, 2):
+            strategy.consecutive_losses = consecutive_losses
+            pricing = book.revalue(50.0, start.value, 0.4, strategy.price_straddle_book)
+            actions = book.evaluate_exits(pricing, 0.4, consecutive_losses)
+            for slot, position in enumerate(positions):
+                action, _ = strategy.manage_position(position, 50.0, start, 0.4)
+                assert EXIT_REASONS[actions[slot]] == action.value
+                assert book.current_value[slot] == pytest.approx(position.current_value)
+
+class TestDailyMetrics:
+    """Tests de l'accumulateur de métriques quotidiennes"""
+    
+    def test_append_and_export(self):
+        """Les barres ajoutées ressortent en dicts et en DataFrame"""
+        metrics = DailyMetrics(capacity=2, initial_capital=1000)
+        timestamps = pd.date_range('2024-01-01', periods=5, freq='h', tz='UTC')
+        for k, timestamp in enumerate(timestamps):
+            metrics.append(timestamp, 900.0 + k, 50.0, k % 3, k % 2)
+        
+        assert len(metrics) == 5
+        assert metrics[1] == {
+            'timestamp': timestamps[1], 'capital': 901.0, 'positions_value': 50.0,
+            'total_value': 951.0, 'total_pnl': -49.0, 'num_positions': 1, 'num_hedges': 1
+        }
+        assert list(metrics)[-1] == metrics[-1]
+        
+        df = metrics.to_dataframe()
+        assert list(df.columns) == list(DAILY_METRICS_COLUMNS)
+        assert (df['timestamp'] == timestamps).all()
+        assert df['total_value'].tolist() == [950.0, 951.0, 952.0, 953.0, 954.0]
+        with pytest.raises(IndexError):
+            metrics[5]
+    
+    def test_extend_columns_matches_append(self):
+        """Le transfert en bloc équivaut aux ajouts barre par barre"""
+        timestamps = pd.date_range('2024-01-01', periods=10, freq='h')
+        appended = DailyMetrics()
+        for k, timestamp in enumerate(timestamps):
+            appended.append(timestamp, 100.0 * k, 1.5 * k, k, 0)
+        
+        block = DailyMetrics()
+        block.extend_columns(
+            timestamps.asi8, 100.0 * np.arange(10), 1.5 * np.arange(10),
+            np.arange(10), np.zeros(10, dtype=int)
+        )
+        
+        assert block == appended
+        assert block == list(appended)
+        assert not DailyMetrics()
+
 class TestStraddlePosition:
     """Tests de la classe StraddlePosition"""
     
@@ -244,13 +900,36 @@ class TestStraddlePosition:
         assert position.contracts == 1
         assert position.premium_paid == 1000
         assert len(position.hedge_positions) == 0
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="slots des dataclasses: Python 3.10+")
+    def test_records_are_slotted(self):
+        """Positions, hedges et trades n'ont pas de __dict__; les trades sont immuables"""
+        now = datetime.now()
+        position = StraddlePosition(
+            entry_time=now, expiry_time=now + timedelta(days=30), entry_price=50000,
+            strike=50000, entry_volatility=0.5, contracts=1, premium_paid=1000
+        )
+        hedge = HedgePosition(
+            direction=HedgeDirection.LONG, entry_time=now, entry_price=50000,
+            size_ratio=0.1, parent_position_id='0'
+        )
+        trade = TradeResult(
+            entry_time=now, exit_time=now, entry_price=50000, exit_price=51000, strike=50000,
+            premium_paid=1000, exit_value=1100, pnl=100, pnl_percentage=10, contracts=1,
+            exit_reason='TAKE_PROFIT', holding_time_hours=1.0
+        )
+        
+        for record in (position, hedge, trade):
+            assert not hasattr(record, '__dict__')
+        position.current_value = 1200
+        with pytest.raises(AttributeError):
+            trade.pnl = 0
 
-def create_test_market_data(length=200):
+def create_test_market_data(length=200, price_base=50000):
     """Crée des données de marché pour les tests"""
     dates = pd.date_range(start='2023-01-01', periods=length, freq='1H')
     
     # Simulation d'un mouvement de prix
-    price_base = 50000
     price_changes = np.random.normal(0, 0.02, length)
     prices = [price_base]
     
@@ -308,6 +987,217 @@ class TestIntegration:
         assert 'final_capital' in metrics
         assert 'total_return' in metrics
 
+    def test_precomputed_signals_same_entries(self):
+        """Les deux chemins de signaux doivent produire les mêmes entrées"""
+        np.random.seed(7)
+        # Prix bas pour que la prime d'un contrat tienne dans le risque par trade
+        test_data = create_test_market_data(800, price_base=50)
+        # Seuil abaissé pour garantir des entrées sur données aléatoires
+        config = StrategyConfig(min_signal_quality=0.5)
+        
+        fast = StraddleStrategy(config).run_backtest(test_data, precompute_signals=True, engine='pandas')
+        slow = StraddleStrategy(config).run_backtest(test_data, precompute_signals=False, engine='pandas')
+        
+        assert len(fast['positions_log']) > 0
+        assert fast['positions_log'] == slow['positions_log']
+        assert fast['trades'] == slow['trades']
+        assert fast['performance_metrics'] == slow['performance_metrics']
+
+    def test_numpy_engine_matches_pandas_engine(self):
+        """Le moteur NumPy doit produire exactement les résultats du moteur pandas"""
+        np.random.seed(7)
+        test_data = create_test_market_data(800, price_base=50)
+        config = StrategyConfig(min_signal_quality=0.5)
+        
+        arrays = StraddleStrategy(config).run_backtest(test_data, engine='numpy')
+        reference = StraddleStrategy(config).run_backtest(test_data, engine='pandas')
+        
+        assert len(arrays['trades']) > 0
+        assert arrays['trades'] == reference['trades']
+        assert arrays['positions_log'] == reference['positions_log']
+        assert arrays['daily_pnl'] == reference['daily_pnl']
+        assert arrays['performance_metrics'] == reference['performance_metrics']
+    
+    def test_position_book_engine_many_positions(self):
+        """Carnet de plusieurs positions: mêmes trades et hedges que le moteur pandas"""
+        np.random.seed(11)
+        test_data = create_test_market_data(1500, price_base=50)
+        config = StrategyConfig(min_signal_quality=0.5, max_positions=8)
+        
+        arrays_strategy = StraddleStrategy(config)
+        arrays = arrays_strategy.run_backtest(test_data, engine='numpy')
+        reference_strategy = StraddleStrategy(config)
+        reference = reference_strategy.run_backtest(test_data, engine='pandas')
+        
+        assert max(day['num_positions'] for day in arrays['daily_pnl']) > 1
+        assert arrays['trades'] == reference['trades']
+        assert arrays['daily_pnl'] == reference['daily_pnl']
+        assert arrays['performance_metrics'] == reference['performance_metrics']
+        assert len(arrays_strategy.hedge_positions) == len(reference_strategy.hedge_positions)
+    
+    def test_unknown_engine(self):
+        """Un moteur inconnu doit lever une erreur"""
+        strategy = StraddleStrategy()
+        with pytest.raises(ValueError):
+            strategy.run_backtest(create_test_market_data(200), engine='cython')
+
+class TestParameterSweep:
+    """Tests du balayage parallèle de paramètres"""
+    
+    def test_expand_grid(self):
+        """La grille est développée en produit cartésien"""
+        param_sets = expand_grid({'TAKE_PROFIT_MULTIPLIER': [1.2, 1.5], 'HEDGE_THRESHOLD': [0.02, 0.03, 0.04]})
+        
+        assert len(param_sets) == 6
+        assert param_sets[0] == {'TAKE_PROFIT_MULTIPLIER': 1.2, 'HEDGE_THRESHOLD': 0.02}
+        assert param_sets[-1] == {'TAKE_PROFIT_MULTIPLIER': 1.5, 'HEDGE_THRESHOLD': 0.04}
+        assert set(profile_param_sets()) == set(PROFILES)
+    
+    def test_unknown_parameter(self):
+        """Un paramètre hors de SWEEP_PARAMETERS doit lever une erreur"""
+        with pytest.raises(ValueError):
+            run_parameter_sweep(create_test_market_data(200), [{'SYMBOL': 'ETH/USDT'}], workers=1)
+    
+    def test_parallel_sweep_matches_sequential(self):
+        """Le pool de processus reproduit les backtests lancés un par un"""
+        np.random.seed(7)
+        test_data = create_test_market_data(800, price_base=50)
+        grid = {'MIN_SIGNAL_QUALITY': [0.5, 0.6], 'TAKE_PROFIT_MULTIPLIER': [1.2, 1.5]}
+        
+        table = run_parameter_sweep(test_data, grid, workers=2)
+        pickled = run_parameter_sweep(test_data, grid, workers=2, shared_memory=False)
+        pd.testing.assert_frame_equal(table, pickled)
+        
+        assert len(table) == 4
+        assert table['total_trades'].sum() > 0
+        for row, params in zip(table.to_dict('records'), expand_grid(grid)):
+            config = StrategyConfig().replace(**params)
+            expected = StraddleStrategy(config).run_backtest(test_data)['performance_metrics']
+            assert {key: row[key] for key in expected} == pytest.approx(expected)
+    
+    def test_threaded_backtests(self):
+        """Des configurations différentes tournent en parallèle dans un même processus"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        np.random.seed(7)
+        test_data = create_test_market_data(800, price_base=50)
+        configs = [StrategyConfig(min_signal_quality=quality) for quality in (0.5, 0.6, 0.7, 0.5)]
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            threaded = list(executor.map(
+                lambda config: StraddleStrategy(config).run_backtest(test_data)['performance_metrics'], configs
+            ))
+        
+        sequential = [StraddleStrategy(config).run_backtest(test_data)['performance_metrics'] for config in configs]
+        assert threaded == sequential
+        assert threaded[0] == threaded[3]
+
+class TestBatchBacktest:
+    """Tests du backtest groupé de plusieurs configurations"""
+    
+    def test_batch_matches_single_backtests(self):
+        """Chaque configuration du lot reproduit exactement son backtest individuel"""
+        np.random.seed(11)
+        test_data = create_test_market_data(1500, price_base=50)
+        base = StrategyConfig(min_signal_quality=0.5, max_positions=8)
+        configs = [base.replace(**params) for params in expand_grid({
+            'MIN_SIGNAL_QUALITY': [0.5, 0.72],
+            'TAKE_PROFIT_MULTIPLIER': [1.1, 1.5],
+            'STOP_LOSS_MULTIPLIER': [0.3, 0.6],
+            'TRADE_TIMEOUT_HOURS': [6, 48]
+        })]
+        
+        batch = run_batch_backtest(test_data, configs)
+        
+        assert len(batch) == len(configs)
+        assert sum(len(result['trades']) for result in batch) > 0
+        for config, result in zip(configs, batch):
+            expected = StraddleStrategy(config).run_backtest(test_data)
+            assert result['trades'] == expected['trades']
+            assert result['performance_metrics'] == expected['performance_metrics']
+    
+    def test_batch_matches_single_backtests_through_loss_streaks(self):
+        """Sorties lues sur les chemins partagés malgré les bascules du stop loss strict"""
+        np.random.seed(3)
+        test_data = create_test_market_data(1200, price_base=50)
+        # Sans arrêt du trading: les séries de pertes basculent le régime de stop loss
+        base = StrategyConfig(min_signal_quality=0.5, max_consecutive_losses=10**9, max_daily_loss=1.0)
+        configs = [base.replace(**params) for params in expand_grid({
+            'TAKE_PROFIT_MULTIPLIER': [1.05, 2.0],
+            'STOP_LOSS_MULTIPLIER': [0.2, 0.5],
+            'TRADE_TIMEOUT_HOURS': [3, 100]
+        })]
+        
+        batch = run_batch_backtest(test_data, configs)
+        
+        assert any(trade.exit_reason == 'STOP_LOSS' for result in batch for trade in result['trades'])
+        for config, result in zip(configs, batch):
+            expected = StraddleStrategy(config).run_backtest(test_data)
+            assert result['trades'] == expected['trades']
+            assert result['performance_metrics'] == expected['performance_metrics']
+    
+    def test_batch_rejects_mixed_configs(self):
+        """Seuls les paramètres de BATCH_PARAMETERS peuvent différer dans un lot"""
+        configs = [StrategyConfig(), StrategyConfig(risk_per_trade=0.02)]
+        with pytest.raises(ValueError):
+            run_batch_backtest(create_test_market_data(200), configs)
+    
+    def test_batch_sweep_matches_sweep(self):
+        """Le balayage en mode batch regroupe les jeux et conserve leur ordre"""
+        np.random.seed(7)
+        test_data = create_test_market_data(800, price_base=50)
+        grid = {
+            'RISK_PER_TRADE': [0.012, 0.02],
+            'MIN_SIGNAL_QUALITY': [0.5, 0.6],
+            'TAKE_PROFIT_MULTIPLIER': [1.2, 1.5]
+        }
+        
+        assert len(group_param_sets(expand_grid(grid))) == 2
+        batched = run_parameter_sweep(test_data, grid, workers=1, batch=True)
+        pooled = run_parameter_sweep(test_data, grid, workers=2, batch=True)
+        reference = run_parameter_sweep(test_data, grid, workers=1)
+        pd.testing.assert_frame_equal(batched, reference)
+        pd.testing.assert_frame_equal(pooled, reference)
+
+class TestSharedMarketData:
+    """Tests des données de marché en mémoire partagée"""
+    
+    def test_attach_is_zero_copy_and_read_only(self):
+        """Le DataFrame attaché lit le segment sans copie et refuse l'écriture"""
+        data = create_test_market_data(300)
+        data.index = data.index.tz_localize('UTC')
+        
+        with SharedMarketData(data) as shared:
+            attached = attach_market_data(shared.handle)
+            
+            pd.testing.assert_frame_equal(attached, data.astype(np.float64), check_freq=False)
+            assert attach_market_data(shared.handle) is attached
+            close = attached['close'].to_numpy()
+            assert not close.flags.writeable
+            segment = np.frombuffer(shared_module._attached[shared.handle.name][0].buf, dtype=np.uint8)
+            assert np.shares_memory(close, segment)
+            with pytest.raises(ValueError):
+                close[0] = 0.0
+            
+            del close, attached, segment
+            detach_market_data(shared.handle)
+    
+    def test_compact_data_stays_float32(self):
+        """Données entièrement float32 (mode compact) publiées sans conversion"""
+        data = compact_frame(create_test_market_data(300).astype(np.float64))
+        
+        with SharedMarketData(data) as shared:
+            assert shared.handle.dtype == 'float32'
+            attached = attach_market_data(shared.handle)
+            pd.testing.assert_frame_equal(attached, data, check_freq=False)
+            del attached
+            detach_market_data(shared.handle)
+    
+    def test_requires_datetime_index(self):
+        """Un index non temporel est refusé"""
+        with pytest.raises(ValueError):
+            SharedMarketData(pd.DataFrame({'close': [1.0, 2.0]}))
+
 # Fixtures pytest
 @pytest.fixture
 def sample_market_data():
@@ -338,6 +1228,55 @@ class TestPerformance:
         assert execution_time < 30
         print(f"Temps d'exécution backtest: {execution_time:.2f}s")
     
+    def test_numpy_engine_speedup(self):
+        """Le moteur NumPy doit être nettement plus rapide que le moteur pandas"""
+        import time
+        import gc
+        
+        np.random.seed(3)
+        # Données qui tradent (prix bas, arrêts de trading désactivés): le
+        # carnet est revalorisé sur la plupart des barres
+        data = create_test_market_data(20000, price_base=50)
+        config = StrategyConfig(max_consecutive_losses=10**9, max_daily_loss=1.0)
+        
+        timings = {}
+        trades = {}
+        gc.disable()
+        try:
+            for engine in ('numpy', 'pandas'):
+                strategy = StraddleStrategy(config)
+                start_time = time.perf_counter()
+                trades[engine] = strategy.run_backtest(data, engine=engine)['trades']
+                timings[engine] = time.perf_counter() - start_time
+        finally:
+            gc.enable()
+        
+        assert len(trades['numpy']) > 0 and trades['numpy'] == trades['pandas']
+        speedup = timings['pandas'] / timings['numpy']
+        print(f"Accélération moteur NumPy: {speedup:.1f}x")
+        # Marge pour les machines de CI chargées (tools/benchmark_backtest.py vise 10x sur 100k barres)
+        assert speedup > 5
+    
+    def test_pricing_kernel_speed(self):
+        """Le noyau de pricing doit valoriser 1M de contrats en un appel rapide"""
+        import time
+        
+        rng = np.random.default_rng(1)
+        n = 1_000_000
+        spot = rng.uniform(20000, 80000, n)
+        strike = rng.uniform(20000, 80000, n)
+        volatility = rng.uniform(0.1, 2.0, n)
+        time_to_expiry = rng.uniform(0.001, 0.25, n)
+        
+        start_time = time.perf_counter()
+        pricing = price_straddles(spot, strike, volatility, time_to_expiry, 0.02)
+        execution_time = time.perf_counter() - start_time
+        
+        assert pricing['straddle_price'].shape == (n,)
+        assert np.isfinite(pricing['straddle_price']).all()
+        assert execution_time < 5
+        print(f"Pricing 1M contrats: {execution_time:.2f}s")
+    
     def test_memory_usage(self):
         """Test d'utilisation mémoire"""
         import psutil
@@ -357,6 +1296,44 @@ class TestPerformance:
         # Ne doit pas utiliser plus de 500MB
         assert memory_used < 500
         print(f"Mémoire utilisée: {memory_used:.1f}MB")
+        
+        # Métriques quotidiennes de 1M de barres: colonnes vs un dict par barre
+        import tracemalloc
+        
+        n_bars = 1_000_000
+        n_sample = 100_000  # dicts mesurés sur un échantillon puis extrapolés
+        timestamps = pd.date_range('2020-01-01', periods=n_bars, freq='min')
+        capital = np.random.uniform(9000, 11000, n_bars)
+        
+        tracemalloc.start()
+        metrics = DailyMetrics()
+        metrics.extend_columns(
+            timestamps.asi8, capital, np.zeros(n_bars), np.zeros(n_bars, dtype=int), np.zeros(n_bars, dtype=int)
+        )
+        columnar_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        
+        tracemalloc.start()
+        rows = [
+            {
+                'timestamp': timestamp,
+                'capital': bar_capital,
+                'positions_value': 0.0,
+                'total_value': bar_capital + 0.0,
+                'total_pnl': bar_capital - INITIAL_CAPITAL,
+                'num_positions': 0,
+                'num_hedges': 0
+            }
+            for timestamp, bar_capital in zip(timestamps[:n_sample], capital[:n_sample].tolist())
+        ]
+        dict_bytes = tracemalloc.get_traced_memory()[0] * (n_bars // n_sample)
+        tracemalloc.stop()
+        del rows
+        
+        print(f"Métriques 1M barres: {columnar_bytes / 2**20:.0f}MB en colonnes "
+              f"vs ~{dict_bytes / 2**20:.0f}MB en dicts")
+        assert len(metrics) == n_bars
+        assert columnar_bytes * 5 < dict_bytes
 
 if __name__ == "__main__":
     # Lancer les tests
@@ -0,0 +1,121 @@
+# Benchmark des moteurs de backtest (pandas vs numpy) et du backtest groupé
+# (coût de BATCH_SIZE configurations rapporté à celui d'une seule)
+import gc
+import sys
+import time
+import logging
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from src.data_manager import DataManager
+from src.straddle_strategy import StraddleStrategy
+from src.batch_backtest import run_batch_backtest
+from src.parameter_sweep import expand_grid
+from src.config import StrategyConfig
+
+N_BARS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+MIN_SPEEDUP = 10.0
+
+# Grille de 500 configurations (5 x 5 x 5 x 4) sur les paramètres de lot
+BATCH_GRID = {
+    'MIN_SIGNAL_QUALITY': [0.5, 0.55, 0.6, 0.65, 0.7],
+    'TAKE_PROFIT_MULTIPLIER': [1.1, 1.2, 1.3, 1.5, 2.0],
+    'STOP_LOSS_MULTIPLIER': [0.3, 0.4, 0.5, 0.6, 0.7],
+    'TRADE_TIMEOUT_HOURS': [24, 48, 72, 168],
+}
+BATCH_SAMPLE = 20
+
+# Comparaison des moteurs: arrêts de trading désactivés pour que les
+# positions s'enchaînent sur toute la série
+ENGINE_CONFIG = StrategyConfig().replace(MAX_CONSECUTIVE_LOSSES=10**9, MAX_DAILY_LOSS=1.0)
+
+
+def create_synthetic_data(n_bars: int, seed: int = 42, price_base: float = 50000) -> pd.DataFrame:
+    """Génère des barres OHLCV synthétiques enrichies des indicateurs du DataManager"""
+    rng = np.random.default_rng(seed)
+    # 300 barres de plus pour absorber le warm-up des indicateurs
+    total = n_bars + 300
+    close = price_base * np.exp(np.cumsum(rng.normal(0, 0.004, total)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.002, total)) * close
+
+    df = pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.uniform(100, 1000, total)
+    }, index=pd.date_range('2020-01-01', periods=total, freq='5min'))
+
+    data_manager = DataManager()
+    df = data_manager._add_technical_indicators(df)
+    df = data_manager._validate_and_clean_data(df)
+    return df.tail(n_bars)
+
+
+def time_backtest(data: pd.DataFrame, engine: str, config: StrategyConfig = None):
+    """Chronomètre un backtest, GC désactivé comme timeit"""
+    strategy = StraddleStrategy(config)
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        results = strategy.run_backtest(data, engine=engine)
+        return time.perf_counter() - start, results
+    finally:
+        gc.enable()
+
+
+def time_batch(data: pd.DataFrame, configs):
+    """Chronomètre un backtest groupé, GC désactivé comme timeit"""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        results = run_batch_backtest(data, configs)
+        return time.perf_counter() - start, results
+    finally:
+        gc.enable()
+
+
+if __name__ == "__main__":
+    print("⏱️ BENCHMARK MOTEURS DE BACKTEST")
+    print("=" * 45)
+
+    # Prix de base bas: primes sous le risque maximal par trade, des positions
+    # s'ouvrent (à 50000 aucune ne passe le dimensionnement: zéro trade)
+    data = create_synthetic_data(N_BARS, price_base=50)
+    logging.getLogger('src.straddle_strategy').setLevel(logging.WARNING)
+    print(f"📊 {len(data)} barres synthétiques")
+
+    numpy_time, numpy_results = time_backtest(data, 'numpy', ENGINE_CONFIG)
+    pandas_time, pandas_results = time_backtest(data, 'pandas', ENGINE_CONFIG)
+    speedup = pandas_time / numpy_time
+
+    print(f"💼 {len(numpy_results['trades'])} trades")
+    print(f"🐼 pandas: {pandas_time:.2f}s")
+    print(f"🔢 numpy:  {numpy_time:.2f}s")
+    print(f"🚀 Accélération: {speedup:.1f}x (objectif ≥ {MIN_SPEEDUP:.0f}x)")
+
+    identical = (numpy_results['trades'] == pandas_results['trades'] and
+                 numpy_results['daily_pnl'] == pandas_results['daily_pnl'])
+    print(f"✅ Résultats identiques" if identical else "❌ Résultats divergents")
+
+    configs = [StrategyConfig().replace(**params) for params in expand_grid(BATCH_GRID)]
+    # K=1: moyenne sur un échantillon de la grille (certaines configurations
+    # s'arrêtent tôt après des pertes consécutives, d'autres tradent jusqu'au bout)
+    sample = configs[::len(configs) // BATCH_SAMPLE]
+    single_time = np.mean([time_backtest(data, 'numpy', config)[0] for config in sample])
+    first_time = np.mean([time_batch(data, [config])[0] for config in sample])
+    batch_time, batch_results = time_batch(data, configs)
+    mean_trades = np.mean([len(result['trades']) for result in batch_results])
+
+    print(f"\n🧮 BACKTEST GROUPÉ ({len(configs)} configurations, {mean_trades:.0f} trades en moyenne)")
+    print(f"🔢 K=1, run_backtest numpy:  {single_time:.2f}s (moyenne de {len(sample)} configurations)")
+    print(f"🧮 K=1, run_batch_backtest:  {first_time:.2f}s")
+    print(f"🧮 K={len(configs)}, run_batch_backtest: {batch_time:.2f}s")
+    print(f"📐 K={len(configs)} / K=1: {batch_time / single_time:.1f}x "
+          f"(séquentiel: {len(configs) * single_time:.0f}s, {len(configs) * single_time / batch_time:.0f}x plus lent)")
@@ -0,0 +1,56 @@
+# Benchmark du mode compact (float32 / bitsets) contre float64
+#
+# Usage: python tools/benchmark_compact_dtypes.py [n_barres]
+# Mémoire des données de marché et des signaux, puis dérive des métriques
+# du backtest (moteur numpy) par rapport aux données float64.
+import sys
+import logging
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.config import StrategyConfig
+from src.compact_dtypes import compact_frame, memory_bytes
+from src.straddle_strategy import StraddleStrategy, signal_flag
+from benchmark_backtest import create_synthetic_data
+
+N_BARS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+METRICS = ('total_trades', 'win_rate', 'avg_pnl', 'total_return', 'final_capital', 'sharpe_ratio', 'total_hedges')
+
+
+if __name__ == "__main__":
+    logging.getLogger('src.straddle_strategy').setLevel(logging.WARNING)
+    print("⏱️ BENCHMARK MODE COMPACT (float32 / bitsets)")
+    print("=" * 60)
+
+    data = create_synthetic_data(N_BARS)
+    compact = compact_frame(data)
+    # Seuil permissif, capital à l'échelle des prix synthétiques (~50000) et
+    # sans arrêt du trading: assez de trades pour mesurer la dérive
+    config = StrategyConfig(
+        min_signal_quality=0.5, max_positions=8, initial_capital=1_000_000,
+        max_daily_loss=1.0, max_consecutive_losses=10**9
+    )
+    compact_config = config.replace(compact_dtypes=True)
+
+    features = StraddleStrategy(config).compute_signal_features(data)
+    compact_features = StraddleStrategy(compact_config).compute_signal_features(compact)
+
+    print(f"📊 {len(data)} barres x {data.shape[1]} colonnes")
+    print(f"{'':>18} {'float64':>10} {'compact':>10} {'gain':>7}")
+    for label, full, small in (('Données', data, compact), ('Signaux', features, compact_features)):
+        full_mb, small_mb = memory_bytes(full) / 2**20, memory_bytes(small) / 2**20
+        print(f"{label:>18} {full_mb:>8.1f}MB {small_mb:>8.1f}MB {1 - small_mb / full_mb:>6.0%}")
+
+    entries = signal_flag(features, 'should_enter')
+    compact_entries = signal_flag(compact_features, 'should_enter')
+    print(f"\n🎯 Signaux d'entrée identiques: {np.mean(entries == compact_entries):.4%} des barres "
+          f"({int(np.sum(entries != compact_entries))} différents)")
+
+    results = StraddleStrategy(config).run_backtest(data)['performance_metrics']
+    compact_results = StraddleStrategy(compact_config).run_backtest(compact)['performance_metrics']
+    print(f"\n{'métrique':>18} {'float64':>14} {'compact':>14} {'écart':>10}")
+    for name in METRICS:
+        full_value, small_value = results.get(name, np.nan), compact_results.get(name, np.nan)
+        print(f"{name:>18} {full_value:>14.6g} {small_value:>14.6g} {small_value - full_value:>10.3g}")
@@ -0,0 +1,75 @@
+# Benchmark du partage des données de marché entre workers (pickle vs mémoire partagée)
+#
+# Usage: python tools/benchmark_shared_data.py [n_barres] [workers,...]
+# Contexte 'spawn' (défaut Windows/macOS): sans mémoire partagée, chaque
+# worker reçoit et désérialise sa propre copie du DataFrame.
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import psutil
+
+from src.shared_market_data import SharedMarketData, SharedMarketDataHandle, attach_market_data
+
+N_BARS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+WORKER_COUNTS = [int(n) for n in sys.argv[2].split(',')] if len(sys.argv) > 2 else [4, 16, 64]
+
+_data = None
+
+
+def create_market_frame(n_bars: int, n_columns: int = 30) -> pd.DataFrame:
+    """DataFrame float64 de la taille des données enrichies du DataManager"""
+    rng = np.random.default_rng(0)
+    columns = ['close'] + [f'indicator_{k}' for k in range(n_columns - 1)]
+    return pd.DataFrame(
+        rng.normal(size=(n_bars, n_columns)),
+        index=pd.date_range('2020-01-01', periods=n_bars, freq='min'),
+        columns=columns
+    )
+
+
+def _init_worker(data):
+    global _data
+    _data = attach_market_data(data) if isinstance(data, SharedMarketDataHandle) else data
+
+
+def _probe(_):
+    """Lit toutes les données puis renvoie la mémoire propre (USS) du worker"""
+    time.sleep(0.2)
+    checksum = float(_data.to_numpy().sum())
+    return psutil.Process().memory_full_info().uss, checksum
+
+
+def run_pool(payload, workers: int):
+    """Démarre un pool, attend que chaque worker ait lu les données"""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(payload,)
+    ) as executor:
+        probes = list(executor.map(_probe, range(workers), chunksize=1))
+    elapsed = time.perf_counter() - start
+    return elapsed, max(uss for uss, _ in probes) / 2**20
+
+
+if __name__ == "__main__":
+    print("⏱️ BENCHMARK DONNÉES PARTAGÉES ENTRE WORKERS")
+    print("=" * 60)
+
+    data = create_market_frame(N_BARS)
+    print(f"📊 {N_BARS} barres x {data.shape[1]} colonnes ({data.memory_usage().sum() / 2**20:.0f}MB)")
+    print(f"{'workers':>8} {'pickle (s)':>11} {'USS max':>9} {'partagé (s)':>12} {'USS max':>9}")
+
+    with SharedMarketData(data) as shared:
+        for workers in WORKER_COUNTS:
+            pickled_time, pickled_uss = run_pool(data, workers)
+            shared_time, shared_uss = run_pool(shared.handle, workers)
+            print(f"{workers:>8} {pickled_time:>11.2f} {pickled_uss:>7.0f}MB "
+                  f"{shared_time:>12.2f} {shared_uss:>7.0f}MB")
@@ -0,0 +1,59 @@
+# Balayage parallèle des paramètres de la stratégie (sans modifier config.py)
+#
+# Usage:
+#   python tools/run_sweep.py               # données de backtest (DataManager)
+#   python tools/run_sweep.py 20000         # 20000 barres synthétiques
+#   python tools/run_sweep.py 20000 --batch # jeux regroupés en backtests groupés
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.config import *
+from src.data_manager import DataManager
+from src.parameter_sweep import DEFAULT_GRID, expand_grid, profile_param_sets, run_parameter_sweep
+from src.straddle_strategy import StraddleStrategy
+from benchmark_backtest import create_synthetic_data
+
+ARGS = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+N_SYNTHETIC_BARS = int(ARGS[0]) if ARGS else 0
+BATCH = '--batch' in sys.argv
+
+
+if __name__ == "__main__":
+    print("🔁 BALAYAGE DES PARAMÈTRES")
+    print("=" * 45)
+
+    profiles = profile_param_sets()
+    param_sets = list(profiles.values()) + expand_grid(DEFAULT_GRID)
+
+    if N_SYNTHETIC_BARS:
+        data = create_synthetic_data(N_SYNTHETIC_BARS)
+    else:
+        # Indicateurs lus par au moins un jeu de paramètres, chauffe minimale
+        features = {
+            name for params in param_sets
+            for name in StraddleStrategy(StrategyConfig().replace(**params)).required_features()
+        }
+        data = DataManager().get_backtest_data(sorted(features))
+    if data.empty:
+        print("❌ Aucune donnée pour le balayage")
+        sys.exit(1)
+
+    print(f"📊 {len(data)} barres, {len(param_sets)} jeux de paramètres")
+
+    start = time.perf_counter()
+    table = run_parameter_sweep(data, param_sets, batch=BATCH)
+    elapsed = time.perf_counter() - start
+    table.insert(0, 'profile', list(profiles) + [''] * (len(param_sets) - len(profiles)))
+
+    print(f"⏱️ {elapsed:.1f}s ({elapsed / len(param_sets) * 1000:.0f}ms par backtest)")
+    print("\n🏆 Meilleurs jeux de paramètres:")
+    print(table.sort_values('total_return', ascending=False).head(10).to_string(index=False))
+
+    output_dir = Path(OUTPUT_DIR)
+    output_dir.mkdir(exist_ok=True)
+    output_file = output_dir / f"parameter_sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    table.to_csv(output_file, index=False)
+    print(f"\n✅ Résultats sauvegardés: {output_file}")
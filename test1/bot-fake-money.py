@@ -1,4 +1,5 @@
-from asyncio import gather, run, sleep
+from asyncio import ensure_future, gather, run, sleep
+import math
 import time
 import ccxt.pro
 import ccxt
@@ -7,11 +8,10 @@ from colorama import Fore, Back, Style,init
 import threading
 init()
 from exchange_config import *
-bid_prices = {}
-ask_prices = {}
+from lib.consolidated_book import ConsolidatedBook
+from lib.opportunity_journal import OpportunityJournal
+from lib.depth_sizing import best_fill, fill_price
 total_change_usd = 0
-prec_ask_price = 0
-prec_bid_price = 0
 i=0
 z=0
 
@@ -23,7 +23,7 @@ def listen_for_exit():
     stop_requested = True
 
 if len(sys.argv) != 6:
-    print(f" \nIncorrect usage, this is what it has to look like: $ {python_command} bot-classic.py [pair] [total_usdt_investment] [stop.delay.minutes] [tlgrm.msg.title] [ex_list]\n ")
+    print(f" \nIncorrect usage, this is what it has to look like: $ {python_command} bot-classic.py [pair(s)] [total_usdt_investment] [stop.delay.minutes] [tlgrm.msg.title] [ex_list]\n ")
     print(f" \n This is the list of args you wrote: {sys.argv}")
     sys.exit(1)
 print(" ")
@@ -32,39 +32,91 @@ if first_orders_fill_timeout <= 0:
 
 for e in sys.argv[5].split(','):
     if e not in list(ex.keys()):
-        ex[e] = getattr(ccxt,e)()
+        ex[e] = create_exchange(e)
 echanges = [ex[sys.argv[5].split(',')[i]] for i in range(len(sys.argv[5].split(',')))]
 echanges_str = [sys.argv[5].split(',')[i] for i in range(len(sys.argv[5].split(',')))]
-currentPair = str(sys.argv[1]).upper()
+currentPair = str(sys.argv[1]).upper() # one pair, a comma-separated list, or */USDT for every USDT pair
 criteria_usd = str(criteria_usd)
 howmuchusd = float(sys.argv[2])
 inputtimeout = int(sys.argv[3])*60
 indicatif = str(sys.argv[4])
-endPair = currentPair.split('/')[1]
+endPair = currentPair.split(',')[0].split('/')[1]
+
+markets = {ech:ex[ech].load_markets() for ech in echanges_str}
+
+def get_fees(market):
+    """Taker fee paid in base and in quote currency on one market"""
+    if 'feeSide' not in market:
+        return {'base': 0, 'quote': market['taker']}
+    return {'base': market['taker'] if market['feeSide']=='base' else 0, 'quote': market['taker'] if market['feeSide']!='base' else 0}
+
+if currentPair.startswith('*/'):
+    # every spot pair quoted in endPair: the overlap of the exchanges' markets
+    candidates = sorted({symbol for ech in echanges_str for symbol, market in markets[ech].items() if symbol.endswith('/'+endPair) and market.get('spot', True) and market.get('active') is not False})
+else:
+    candidates = currentPair.split(',')
+if any(pair.split('/')[1] != endPair for pair in candidates):
+    printerror(m=f"All pairs must be quoted in {endPair}: {candidates}")
+    sys.exit(1)
 
-fees = {n:0 for n in echanges_str}
+# a pair is watched on every exchange listing it, and only if at least two do
+pair_venues = {pair:[ech for ech in echanges_str if pair in markets[ech]] for pair in candidates}
+pairs = [pair for pair in candidates if len(pair_venues[pair]) >= 2]
+if pairs == []:
+    printerror(m=f"None of {candidates} is listed on at least two of {echanges_str}.")
+    sys.exit(1)
 
-for ech in fees:
-    markets = ex[ech].load_markets()
-    fees[ech] = {'base': (0 if markets['BTC/USDT']['feeSide']!='base' else markets['BTC/USDT']['taker']) if list(markets['BTC/USDT'].keys()).count('feeSide')!=0 else 0, 'quote': (markets['BTC/USDT']['taker'] if markets['BTC/USDT']['feeSide']!='base' else 0) if list(markets['BTC/USDT'].keys()).count('feeSide')!=0 else markets['BTC/USDT']['taker']}
+class PairSession:
+    """Fake-money balances, fee table and consolidated book of one pair"""
+    def __init__(self, pair, venues, budget):
+        self.pair = pair
+        self.base = pair.split('/')[0]
+        self.venues = venues
+        self.budget = budget
+        self.fees = {ech:get_fees(markets[ech][pair]) for ech in venues}
+        self.usd = {ech:(budget/2)/len(venues) for ech in venues}
+        self.crypto = {ech:0 for ech in venues}
+        self.total_crypto = 0
+        self.crypto_per_transaction = 0
+        self.average_first_buy_price = 0
+        self.prec_ask_price = 0
+        self.prec_bid_price = 0
+        self.total_change_usd = 0
+        self.book = None
+        self.orderbooks = {} # latest L2 book of every exchange, walked to size opportunities
+
+    def first_buy(self, prices):
+        """Half of the budget bought at the average price of all exchanges, split evenly"""
+        self.average_first_buy_price = moy(prices)
+        self.total_crypto = (self.budget/2)/self.average_first_buy_price
+        self.crypto = {ech:self.total_crypto/len(self.venues) for ech in self.venues}
+        self.crypto_per_transaction = self.total_crypto/len(self.venues)
+        # best bid/ask of every exchange, best feasible (buy, sell) pair in O(log n) per update
+        # fake money: an exchange can buy as long as its USD balance is positive
+        self.book = ConsolidatedBook(self.venues, self.crypto_per_transaction, self.fees, quote_coverage=0)
+        for ech in self.venues:
+            self.book.set_balances(ech, self.crypto[ech], self.usd[ech])
+
+sessions = {pair:PairSession(pair, pair_venues[pair], howmuchusd/len(pairs)) for pair in pairs}
+pairs_by_exchange = {ech:[pair for pair in pairs if ech in pair_venues[pair]] for ech in echanges_str}
+
+def fetch_last_prices():
+    """Last price of every watched pair, one request per exchange when it supports fetchTickers"""
+    prices = {}
+    for ech in echanges_str:
+        if pairs_by_exchange[ech] == []:
+            continue
+        if ex[ech].has.get('fetchTickers'):
+            tickers = ex[ech].fetch_tickers(pairs_by_exchange[ech])
+        else:
+            tickers = {pair:ex[ech].fetch_ticker(pair) for pair in pairs_by_exchange[ech]}
+        prices[ech] = {pair:tickers[pair]['last'] for pair in pairs_by_exchange[ech]}
+    return prices
 
 async def fetch_orderbook(exchange_instance, pair):
-    try:
-        orderbook = await exchange_instance.watch_order_book(pair)
-    except Exception as e:
-        printerror(m=f"Error while fetching orderbook on {exchange_instance.id}. {e}")
-        sys.stdout.write("\033[F")
-        sys.stdout.write("\033[K")
-        id_ = exchange_instance.id
-        await exchange_instance.close()
-        new_instance = getattr(ccxt.pro,id_)({'enableRateLimit':True})
-        try:
-            orderbook = await new_instance.watch_order_book(pair)
-        except Exception as e:
-            printerror(m=f"Error while fetching orderbook on {exchange_instance.id}. {e}")
-            sys.stdout.write("\033[F")
-            sys.stdout.write("\033[K")
-            sys.exit()
+    # the client is shared by every pair of the exchange: never close it here (exchange_loop owns it)
+    orderbook = await exchange_instance.watch_order_book(pair)
+    pair_failures[exchange_instance.id, pair] = 0
     return orderbook
 def emergency_convert(pair_to_sell):
     i=0
@@ -97,95 +149,85 @@ def emergency_convert_list(pair_to_sell,exlist):
         except Exception as e:
             print(f'{Style.DIM}[{time.strftime("%H:%M:%S", time.gmtime(time.time()))}]{Style.RESET_ALL} Problem on {echange}. Error:    {e}')
 
-s=0
-
-ordersFilled = 0
-
-while ordersFilled != len(echanges):
-
-    if s==1:
-        sys.exit(1)
-    usd = {exchange:(howmuchusd/2)/len(echanges) for exchange in echanges_str}
-
-    total_usd = 0
-    for exc in echanges_str:
-        total_usd+=usd[exc]
-
-    all_tickers = []
-
-    try:
-        printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Fetching the global average price for {currentPair}...")
-        for n in echanges:
-            ticker = n.fetch_ticker(currentPair)
-            all_tickers.append(ticker['last'])
-        average_first_buy_price = moy(all_tickers)
-        total_crypto = (howmuchusd/2)/average_first_buy_price
-        printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Average {currentPair} price in {endPair}: {average_first_buy_price}")
-
-    except Exception as e:
-        print(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Error while fetching average prices. Error: {e}")
-        for exc in echanges_str:
-            ex[exc].close()
 
-    crypto = {exchange:total_crypto/len(echanges) for exchange in echanges_str}
+try:
+    printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Fetching the global average price for {len(pairs)} pair(s): {', '.join(pairs[:10])}{'...' if len(pairs)>10 else ''}")
+    first_prices = fetch_last_prices()
+except Exception as e:
+    print(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Error while fetching average prices. Error: {e}")
+    sys.exit(1)
 
-    crypto_per_transaction = (total_crypto/len(echanges_str))
+for state in sessions.values():
+    state.first_buy([first_prices[ech][state.pair] for ech in state.venues])
+    print(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Average {state.pair} price in {endPair}: {state.average_first_buy_price}")
 
-    i=0
-    for n in echanges:
-        time.sleep(0.7)
-        printandtelegram(f'{Style.DIM}{get_time()}{Style.RESET_ALL} Buy limit order of {round(total_crypto/len(echanges),3)} {currentPair.split("/")[0]} at {average_first_buy_price} sent to {echanges_str[i]}.')
-        i+=1
+for ech in echanges_str:
+    time.sleep(0.7)
+    for pair in pairs_by_exchange[ech]:
+        state = sessions[pair]
+        print(f'{Style.DIM}{get_time()}{Style.RESET_ALL} Buy limit order of {round(state.crypto[ech],3)} {state.base} at {state.average_first_buy_price} sent to {ech}.')
 
-    printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} All orders sent.")
+printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} All orders sent.")
 
-    already_filled = []
-    for zz in range(len(echanges)):
-        time.sleep(2.1)
-        printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} {echanges_str[zz]} order filled.")
-        ordersFilled+=1
-        already_filled.append(exc)
+for ech in echanges_str:
+    time.sleep(2.1)
+    printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} {ech} orders filled ({len(pairs_by_exchange[ech])} pair(s)).")
 
 time.sleep(1)
 printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Starting program with parameters: {[n for n in sys.argv]}")
-prec_time = '0000000'
 
-min_ask_price = 0
 timeout = time.time() + inputtimeout
+reconnect_interval = 3600 # seconds between two reconnections of an exchange's client
+max_reconnects = 3 # consecutive errors before a pair (or, for connection errors, the whole exchange) is dropped
+pair_failures = {} # (exchange, pair): consecutive order book errors of that pair alone
+dropped_pairs = set() # (exchange, pair) given up after max_reconnects pair errors
 total_change_usd=0
-async def pair_loop(exchange, pair):
-    global total_change_usd,crypto_per_transaction,i,z,prec_time,t,time1,bid_prices,ask_prices,min_ask_price,max_bid_price,prec_ask_price,prec_bid_price,timeout,profit_usd,total_crypto
-    while time.time() <= timeout:
+# append-only binary journal, one file per day, written in batches by a background thread
+journal = OpportunityJournal('logs/opportunities')
+async def pair_loop(exchange, pair, reconnect_at):
+    global total_change_usd,i,z,timeout
+    state = sessions[pair]
+    book = state.book
+    crypto, usd, fees = state.crypto, state.usd, state.fees
+    while time.time() <= reconnect_at:
         if stop_requested:
             sys.stdout.write("\033[F")
             sys.stdout.write("\033[K")
             sys.stdout.write("\033[F")
             sys.stdout.write("\033[K")
             print(f"{get_time()} Manual rebalance requested. Breaking.")
-            await exchange.close()
             append_new_line('logs/logs.txt',f"{get_time_blank()} INFO: Manual rebalance requested. Breaking.")
             timeout -= 100000000000
             break
         orderbook = await fetch_orderbook(exchange,pair)
         now = exchange.milliseconds()
-        bid_prices[exchange.id] = orderbook["bids"][0][0]
-        ask_prices[exchange.id] = orderbook["asks"][0][0]
-        min_ask_ex = min(ask_prices, key=ask_prices.get)
-        max_bid_ex = max(bid_prices, key=bid_prices.get)
-        for u in echanges_str:
-            if crypto[u] < crypto_per_transaction:
-                min_ask_ex = u
-            if usd[u] <= 0: # should not happen
-                max_bid_ex = u
-        min_ask_price = ask_prices[min_ask_ex]
-        max_bid_price = bid_prices[max_bid_ex]
+        if orderbook["bids"] == [] or orderbook["asks"] == []: # one side empty: keep the last quotes
+            continue
+        state.orderbooks[exchange.id] = orderbook
+        book.update(exchange.id, orderbook["bids"][0][0], orderbook["asks"][0][0])
+        best_pair = book.best_pair()
+        if best_pair is None: # not enough quotes yet, or no exchange can sell / buy
+            continue
+        min_ask_ex, max_bid_ex = best_pair
+        top_ask_price = book.ask(min_ask_ex)
+        top_bid_price = book.bid(max_bid_ex)
+        # walk both L2 books: most profitable size after fees, within the balances, at volume-weighted prices
+        fill = best_fill(state.orderbooks[min_ask_ex]['asks'], state.orderbooks[max_bid_ex]['bids'], fees[min_ask_ex], fees[max_bid_ex], max_amount=crypto[max_bid_ex], max_cost=max(usd[min_ask_ex],0))
+        if fill.amount > 0:
+            crypto_per_transaction = fill.amount
+            min_ask_price = fill.buy_price
+            max_bid_price = fill.sell_price
+        else: # nothing profitable: show the top of book at the usual size
+            crypto_per_transaction = state.crypto_per_transaction
+            min_ask_price = top_ask_price
+            max_bid_price = top_bid_price
 
         theoritical_min_ask_usd_bal = usd[min_ask_ex] - (crypto_per_transaction / (1-fees[min_ask_ex]['quote'])) * min_ask_price * (1+fees[min_ask_ex]['base'])
         theoritical_max_bid_usd_bal = usd[max_bid_ex] + (crypto_per_transaction / (1+fees[max_bid_ex]['base']) * max_bid_price * (1-fees[max_bid_ex]['quote']))
 
         change_usd = (theoritical_min_ask_usd_bal+theoritical_max_bid_usd_bal)-(usd[max_bid_ex]+usd[min_ask_ex])
 
-        if max_bid_ex != min_ask_ex and change_usd > float(criteria_usd) and (abs(min_ask_price-max_bid_price))/((max_bid_price+min_ask_price)/2)*100>=criteria_pct and prec_ask_price != min_ask_price and prec_bid_price != max_bid_price:
+        if max_bid_ex != min_ask_ex and change_usd > float(criteria_usd) and (abs(min_ask_price-max_bid_price))/((max_bid_price+min_ask_price)/2)*100>=criteria_pct and state.prec_ask_price != top_ask_price and state.prec_bid_price != top_bid_price:
             i+=1
             
             fees_crypto = crypto_per_transaction * (fees[min_ask_ex]['quote']) + crypto_per_transaction * (fees[max_bid_ex]['base'])
@@ -196,18 +238,20 @@ async def pair_loop(exchange, pair):
             print("-----------------------------------------------------\n")
             
             ex_balances = ""
-            for exc in echanges_str:
-                ex_balances+=f"\n➝ {exc}: {round(crypto[exc],3)} {currentPair.split('/')[0]} / {round(usd[exc],2)} {endPair}"
-            print(f"{Style.RESET_ALL}Opportunity n°{i} detected! ({min_ask_ex} {min_ask_price}   ->   {max_bid_price} {max_bid_ex})\n \nExcepted profit: {Fore.GREEN}+{round(change_usd,4)} {endPair}{Style.RESET_ALL}\n \nSession total profit: {Fore.GREEN}+{round(total_change_usd,4)} {endPair}{Style.RESET_ALL}\n \nFees paid: {Fore.RED}-{round(fees_usd,4)} {endPair}      -{round(fees_crypto,4)} {currentPair.split('/')[0]}\n \n{Style.RESET_ALL}{Style.DIM} {ex_balances}\n \n{Style.RESET_ALL}Time elapsed since the beginning of the session: {time.strftime('%H:%M:%S', time.gmtime(time.time()-st))}\n \n{Style.RESET_ALL}-----------------------------------------------------\n \n")
-            send_to_telegram(f"[{indicatif} Trade n°{i}]\n \nOpportunity detected!\n \nExcepted profit: {round(change_usd,4)} {endPair}\n \n{min_ask_ex} {min_ask_price}   ->   {max_bid_price} {max_bid_ex}\nTime elapsed: {time.strftime('%H:%M:%S', time.gmtime(time.time()-st))}\nSession total profit: {round(total_change_usd,4)} % ({round(total_change_usd,4)} {endPair})\nFees paid: {round(fees_usd,4)} {endPair}      {round(fees_crypto,4)} {currentPair.split('/')[0]}\n \n--------BALANCES---------\n \n {ex_balances}")
+            for exc in state.venues:
+                ex_balances+=f"\n➝ {exc}: {round(crypto[exc],3)} {state.base} / {round(usd[exc],2)} {endPair}"
+            print(f"{Style.RESET_ALL}Opportunity n°{i} detected on {pair}! ({min_ask_ex} {min_ask_price}   ->   {max_bid_price} {max_bid_ex})\n \nExcepted profit: {Fore.GREEN}+{round(change_usd,4)} {endPair}{Style.RESET_ALL}\n \nSession total profit: {Fore.GREEN}+{round(total_change_usd,4)} {endPair}{Style.RESET_ALL}\n \nFees paid: {Fore.RED}-{round(fees_usd,4)} {endPair}      -{round(fees_crypto,4)} {state.base}\n \n{Style.RESET_ALL}{Style.DIM} {ex_balances}\n \n{Style.RESET_ALL}Time elapsed since the beginning of the session: {time.strftime('%H:%M:%S', time.gmtime(time.time()-st))}\n \n{Style.RESET_ALL}-----------------------------------------------------\n \n")
+            send_to_telegram(f"[{indicatif} Trade n°{i}]\n \nOpportunity detected on {pair}!\n \nExcepted profit: {round(change_usd,4)} {endPair}\n \n{min_ask_ex} {min_ask_price}   ->   {max_bid_price} {max_bid_ex}\nTime elapsed: {time.strftime('%H:%M:%S', time.gmtime(time.time()-st))}\nSession total profit: {round(total_change_usd,4)} % ({round(total_change_usd,4)} {endPair})\nFees paid: {round(fees_usd,4)} {endPair}      {round(fees_crypto,4)} {state.base}\n \n--------BALANCES---------\n \n {ex_balances}")
 
+            expected_change_usd = change_usd
             if demo_fake_delay:
                 ts = time.time()
                 await sleep(demo_fake_delay_ms/1000)
-                ob_min_ask = await fetch_orderbook(getattr(ccxt, min_ask_ex)(),pair)
-                ob_max_bid = await fetch_orderbook(getattr(ccxt, max_bid_ex)(),pair)
-                min_ask_price = ob_min_ask['asks'][0][0]
-                max_bid_price = ob_max_bid['bids'][0][0]
+                # the books kept up to date by both exchanges' own streams during the delay: no extra client
+                ob_min_ask = state.orderbooks[min_ask_ex]
+                ob_max_bid = state.orderbooks[max_bid_ex]
+                min_ask_price = fill_price(ob_min_ask['asks'], crypto_per_transaction)
+                max_bid_price = fill_price(ob_max_bid['bids'], crypto_per_transaction)
     
                 actual_min_ask_usd_bal = usd[min_ask_ex] - (crypto_per_transaction / (1-fees[min_ask_ex]['quote'])) * min_ask_price * (1+fees[min_ask_ex]['base'])
                 actual_max_bid_usd_bal = usd[max_bid_ex] + (crypto_per_transaction / (1+fees[max_bid_ex]['base']) * max_bid_price * (1-fees[max_bid_ex]['quote']))
@@ -216,10 +260,10 @@ async def pair_loop(exchange, pair):
                 delay = 1000*(time.time() - ts)
                 printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Now calculating P&L of the opportunity with an added (fake) delay of {int(round(delay,0))}ms")
             
-            printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Sell market order filled on {max_bid_ex} for {crypto_per_transaction} {currentPair.split('/')[0]} at {max_bid_price}.")
-            printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Buy market order filled on {min_ask_ex} for {crypto_per_transaction} {currentPair.split('/')[0]} at {min_ask_price}.")
+            printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Sell market order filled on {max_bid_ex} for {crypto_per_transaction} {state.base} at {max_bid_price}.")
+            printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Buy market order filled on {min_ask_ex} for {crypto_per_transaction} {state.base} at {min_ask_price}.")
 
-            append_list_file('all_opportunities_profits.txt',change_usd)
+            journal.record(pair, min_ask_ex, max_bid_ex, min_ask_price, max_bid_price, crypto_per_transaction, fees_usd, fees_crypto, expected_change_usd, change_usd, timestamp=now)
 
             crypto[min_ask_ex] += crypto_per_transaction
             usd[min_ask_ex] -= (crypto_per_transaction / (1-fees[min_ask_ex]['quote'])) * min_ask_price * (1+fees[min_ask_ex]['base'])
@@ -227,14 +271,19 @@ async def pair_loop(exchange, pair):
             usd[max_bid_ex] += crypto_per_transaction / (1+fees[max_bid_ex]['base']) * max_bid_price * (1-fees[max_bid_ex]['quote'])
 
             total_change_usd+=change_usd
-
-            prec_ask_price = min_ask_price
-            prec_bid_price = max_bid_price
-
-            total_crypto = 0
-            for exc in echanges_str:
-                total_crypto+=crypto[exc]
-            crypto_per_transaction = total_crypto/len(echanges_str)
+            state.total_change_usd+=change_usd
+
+            state.prec_ask_price = top_ask_price
+            state.prec_bid_price = top_bid_price
+
+            state.total_crypto = 0
+            for exc in state.venues:
+                state.total_crypto+=crypto[exc]
+            state.crypto_per_transaction = state.total_crypto/len(state.venues)
+            book.set_balances(min_ask_ex, crypto[min_ask_ex], usd[min_ask_ex])
+            book.set_balances(max_bid_ex, crypto[max_bid_ex], usd[max_bid_ex])
+            if state.crypto_per_transaction != book.amount:
+                book.set_amount(state.crypto_per_transaction)
         
         else:
             for count in range(0,1):
@@ -246,24 +295,59 @@ async def pair_loop(exchange, pair):
                 color = Fore.GREEN
             elif change_usd == 0:
                 color = Fore.WHITE
-            print(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Best opportunity: {color}{round(change_usd,4)} {endPair} {Style.RESET_ALL}(with fees)       buy: {min_ask_ex} at {min_ask_price}     sell: {max_bid_ex} at {max_bid_price}")
-        time1=exchange.iso8601(exchange.milliseconds())
-        if time1[17:19] == "00" and time1[14:16] != prec_time:
-            prec_time = time1[11:13]
-            await exchange.close()
+            print(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Best opportunity on {pair}: {color}{round(change_usd,4)} {endPair} {Style.RESET_ALL}(with fees)       buy: {min_ask_ex} at {min_ask_price}     sell: {max_bid_ex} at {max_bid_price}")
+async def watch_pair(exchange, pair, reconnect_at):
+    # errors of one pair stay with it: counted, retried, and after max_reconnects in a row
+    # the pair alone leaves its book. Connection-level errors (ccxt.NetworkError) go up to
+    # exchange_loop, which reconnects the client shared by every pair of the exchange.
+    while time.time() <= reconnect_at:
+        try:
+            return await pair_loop(exchange, pair, reconnect_at)
+        except ccxt.NetworkError:
+            raise
+        except Exception as e:
+            failures = pair_failures[exchange.id, pair] = pair_failures.get((exchange.id, pair), 0) + 1
+            printerror(m=f"Error on {pair} on {exchange.id} ({failures}/{max_reconnects}). {e}")
+            if failures >= max_reconnects:
+                printerror(m=f"Giving up on {pair} on {exchange.id}, its other pairs and exchanges keep running.")
+                sessions[pair].book.update(exchange.id, math.nan, math.nan)
+                dropped_pairs.add((exchange.id, pair))
+                return
+            await sleep(1)
+
 async def exchange_loop(exchange_id, pairs):
-    exchange = getattr(ccxt.pro, exchange_id)()
-    loops = [pair_loop(exchange, pair) for pair in pairs]
-    await gather(*loops)
-    await exchange.close()
+    # one ccxt.pro client per exchange: every pair is watched over the same connection.
+    # Only this loop closes it: once an hour to reconnect, after a connection error, and at the end.
+    failures = 0
+    while time.time() <= timeout and not stop_requested:
+        pairs = [pair for pair in pairs if (exchange_id, pair) not in dropped_pairs]
+        if pairs == []:
+            return
+        exchange = create_exchange(exchange_id,asynchronous=True)
+        reconnect_at = min(timeout, time.time() + reconnect_interval)
+        loops = [ensure_future(watch_pair(exchange, pair, reconnect_at)) for pair in pairs]
+        try:
+            await gather(*loops)
+            failures = 0
+        except ccxt.NetworkError as e:
+            failures += 1
+            printerror(m=f"Connection lost on {exchange_id} ({failures}/{max_reconnects}). {e}")
+        finally:
+            for loop in loops:
+                loop.cancel()
+            await gather(*loops, return_exceptions=True)
+            await exchange.close()
+        if failures >= max_reconnects:
+            # drop the exchange from the books instead of trading on its stale quotes
+            printerror(m=f"Giving up on {exchange_id}, the other exchanges keep running.")
+            for pair in pairs:
+                sessions[pair].book.update(exchange_id, math.nan, math.nan)
+            return
 
 async def main():
-    exchanges = {
-        echanges_str[i]:[currentPair] for i in range(0,len(echanges))
-    }
     loops = [
-        exchange_loop(exchange_id, pairs)
-        for exchange_id, pairs in exchanges.items()
+        exchange_loop(exchange_id, exchange_pairs)
+        for exchange_id, exchange_pairs in pairs_by_exchange.items() if exchange_pairs
     ]
     await gather(*loops)
 
@@ -271,20 +355,21 @@ st = time.time()
 print(" \n")
 listener_thread = threading.Thread(target=listen_for_exit)
 listener_thread.start()
-run(main())
-
-for exc in crypto:
-    ticker = ex[exc].fetchTicker(currentPair)
-    price = ticker['last']
-    if delta_neutral:
-        usd[exc]+=crypto[exc]*average_first_buy_price
-    else:
-        usd[exc]+=crypto[exc]*price
-    crypto[exc]=0
+try:
+    run(main())
+finally:
+    journal.close() # the writer is a daemon thread: flush queued records on any exit
 
+last_prices = fetch_last_prices()
 total_usdt_balance = 0
-for n in echanges_str:
-    total_usdt_balance += usd[n]
+for state in sessions.values():
+    for exc in state.venues:
+        if delta_neutral:
+            state.usd[exc]+=state.crypto[exc]*state.average_first_buy_price
+        else:
+            state.usd[exc]+=state.crypto[exc]*last_prices[exc][state.pair]
+        state.crypto[exc]=0
+        total_usdt_balance += state.usd[exc]
 
 with open('real_balance.txt', 'r+') as balance_file:
     old_balance = float(balance_file.read())
@@ -292,4 +377,4 @@ with open('real_balance.txt', 'r+') as balance_file:
     balance_file.write(str(total_usdt_balance))
 
 total_session_profit_usd = total_usdt_balance-old_balance
-printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Session with {currentPair} finished.\n{Style.DIM}{get_time()}{Style.RESET_ALL} Total profit: {total_session_profit_usd} {endPair}")
+printandtelegram(f"{Style.DIM}{get_time()}{Style.RESET_ALL} Session with {', '.join(pairs) if len(pairs)<=10 else f'{len(pairs)} pairs'} finished.\n{Style.DIM}{get_time()}{Style.RESET_ALL} Total profit: {total_session_profit_usd} {endPair}")
@@ -1,8 +1,15 @@
 import ccxt as ccxt
-import requests
 import pytz
 from colorama import Style,Fore
+import atexit
 import datetime
+import sys
+from pathlib import Path
+
+# Exchanges locaux hors ligne ('fake', 'fake_<nom>') partagés avec le bot straddle
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'straddle_trading_bot' / 'src'))
+from fake_exchange import create_exchange
+from lib.telegram_notifier import TelegramNotifier
 
 # The bot seems complicated? It's not, just try! (and contact me if you have an error, it's probably a silly one :)
 
@@ -16,6 +23,7 @@ exchanges = {
     'binance':{},
     'okx':{},
     'poloniex':{},
+    # 'fake_a':{'latency_ms':50}, # exchange local hors ligne (tests de charge)
     # 'another_exchange_here':{
     #     'apiKey':'here',
     #     'secret':'here',
@@ -41,32 +49,11 @@ def moy(list1):
     for n in list1:
         moy+=n
     return moy/len(list1)
+# Non-blocking: messages are queued, coalesced and rate-limited by a background thread
+notifier = TelegramNotifier(apiToken, chatID, enabled=telegram_sending)
+atexit.register(notifier.close)
 def send_to_telegram(message):
-    message = message.replace("[2m","")
-    message = message.replace("[0m","")
-    message = message.replace("[2m","")
-    message = message.replace("[32m","")
-    message = message.replace("[31m","")
-    apiURL = f'https://api.telegram.org/bot{apiToken}/sendMessage'
-    try:
-        if telegram_sending:
-            response = requests.post(apiURL, json={'chat_id': chatID, 'text': message}) # put this if you want to send telegram messages.
-        else:
-            pass
-    except Exception as e:
-        print(e)
-def append_list_file(fichier, nouvel_element):
-    import ast
-    try:
-        with open(fichier, 'r') as file:
-            liste = ast.literal_eval(file.read())
-    except FileNotFoundError:
-        liste = []
-
-    liste.append(nouvel_element)
-
-    with open(fichier, 'w') as file:
-        file.write(str(liste))
+    notifier.notify(message)
 def append_new_line(file_name, text_to_append):
     import os
     """Appends a new line to a text file, creating directories if necessary.
@@ -135,7 +122,7 @@ def get_balance(exchange,pair):
     else:
         return 0
     
-ex = {n:getattr(ccxt,n)(exchanges[n]) for n in exchanges}
+ex = {n:create_exchange(n,exchanges[n]) for n in exchanges}
 
 def get_precision_min(pair,exchange_str):
     pair_info = ex[exchange_str].load_markets(pair)
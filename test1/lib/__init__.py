@@ -0,0 +1 @@
+# Composants du bot d'arbitrage (carnet consolidé, profondeur L2, journal, notifications)
@@ -0,0 +1,185 @@
+# Carnet consolidé multi-exchanges (meilleur bid / ask de chaque exchange)
+# Meilleure paire (achat, vente) réalisable en O(log n) par mise à jour
+
+import math
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+INF = math.inf
+
+# Tolérance relative des masques (soldes recalculés par sommes flottantes)
+BALANCE_TOLERANCE = 1e-9
+
+
+class _MinTree:
+    """
+    Arbre de segments (tableau indexé) du minimum de n valeurs
+
+    set() remonte la feuille jusqu'à la racine en O(log n); le minimum
+    global est à la racine et le minimum hors d'une feuille s'obtient en
+    combinant les frères du chemin feuille -> racine, en O(log n) aussi.
+    À égalité, le plus petit indice l'emporte.
+    """
+
+    __slots__ = ('size', 'values', 'index')
+
+    def __init__(self, n: int):
+        self.size = 1
+        while self.size < max(n, 1):
+            self.size *= 2
+        self.values = [INF] * (2 * self.size)
+        self.index = [-1] * (2 * self.size)
+        for i in range(n):
+            self.index[self.size + i] = i
+        for node in range(self.size - 1, 0, -1):
+            self.index[node] = self.index[2 * node]
+
+    def set(self, i: int, value: float):
+        values, index = self.values, self.index
+        node = self.size + i
+        values[node] = value
+        node //= 2
+        while node:
+            left = 2 * node
+            right = left + 1
+            if values[right] < values[left]:
+                values[node], index[node] = values[right], index[right]
+            else:
+                values[node], index[node] = values[left], index[left]
+            node //= 2
+
+    def top(self) -> Tuple[float, int]:
+        """(minimum, indice), minimum INF si aucune valeur finie"""
+        return self.values[1], self.index[1]
+
+    def top_excluding(self, i: int) -> Tuple[float, int]:
+        """(minimum, indice) des valeurs autres que la feuille i"""
+        values, index = self.values, self.index
+        best, best_index = INF, -1
+        node = self.size + i
+        while node > 1:
+            sibling = node ^ 1
+            value = values[sibling]
+            if value < best or (value == best and index[sibling] < best_index):
+                best, best_index = value, index[sibling]
+            node //= 2
+        return best, best_index
+
+
+class ConsolidatedBook:
+    """
+    Meilleur bid / ask de plusieurs exchanges pour une paire
+
+    Les prix sont comparés nets de frais: coût d'achat d'une unité
+    ask * (1 + frais base) / (1 - frais quote), produit de la vente
+    bid * (1 - frais quote) / (1 + frais base). La meilleure paire maximise
+    donc le gain en quote d'un aller-retour de amount unités.
+
+    Masques d'éligibilité: un exchange n'est candidat à la vente (can_sell)
+    que s'il détient au moins amount unités, et à l'achat (can_buy) que si
+    son solde quote est positif et couvre la part quote_coverage de l'achat
+    de amount unités (à l'arrondi près). update() et set_balances()
+    coûtent O(log n), best_pair() O(log n) au pire.
+    """
+
+    def __init__(
+        self,
+        venues: Sequence[str],
+        amount: float = 0.0,
+        fees: Optional[Mapping[str, Mapping[str, float]]] = None,
+        quote_coverage: float = 1.0
+    ):
+        """
+        Args:
+            venues: Exchanges suivis
+            amount: Quantité échangée par opportunité (unités de base)
+            fees: {exchange: {'base': frais, 'quote': frais}} (sans frais par défaut)
+            quote_coverage: Part de l'achat que le solde quote doit couvrir
+                (0: tout solde positif suffit)
+        """
+        self.venues: List[str] = list(venues)
+        self.positions: Dict[str, int] = {venue: i for i, venue in enumerate(self.venues)}
+        n = len(self.venues)
+        fees = fees or {}
+        venue_fees = [fees.get(venue, {}) for venue in self.venues]
+        self.buy_factors = [(1 + f.get('base', 0.0)) / (1 - f.get('quote', 0.0)) for f in venue_fees]
+        self.sell_factors = [(1 - f.get('quote', 0.0)) / (1 + f.get('base', 0.0)) for f in venue_fees]
+
+        self.amount = amount
+        self.quote_coverage = quote_coverage
+        self.bids = [math.nan] * n
+        self.asks = [math.nan] * n
+        self.base_balances = [INF] * n
+        self.quote_balances = [INF] * n
+        self.can_buy = [False] * n
+        self.can_sell = [False] * n
+        # Achat: coût net minimal; vente: produit net maximal (stocké négatif)
+        self._asks = _MinTree(n)
+        self._bids = _MinTree(n)
+
+    def __len__(self) -> int:
+        return len(self.venues)
+
+    def _refresh(self, i: int):
+        """Recalcule l'éligibilité de l'exchange i et ses feuilles"""
+        ask, bid = self.asks[i], self.bids[i]
+        buy_cost = ask * self.buy_factors[i]
+        required = 1 - BALANCE_TOLERANCE
+        quote = self.quote_balances[i]
+        self.can_buy[i] = ask > 0 and quote > 0 and quote >= self.amount * buy_cost * self.quote_coverage * required
+        self.can_sell[i] = bid > 0 and self.base_balances[i] >= self.amount * required
+        self._asks.set(i, buy_cost if self.can_buy[i] else INF)
+        self._bids.set(i, -bid * self.sell_factors[i] if self.can_sell[i] else INF)
+
+    def update(self, venue: str, bid: float, ask: float):
+        """Nouveau meilleur bid / ask de venue"""
+        i = self.positions[venue]
+        self.bids[i] = bid
+        self.asks[i] = ask
+        self._refresh(i)
+
+    def set_balances(self, venue: str, base: float, quote: float):
+        """Soldes de venue (unités de base, quote) pour les masques d'éligibilité"""
+        i = self.positions[venue]
+        self.base_balances[i] = base
+        self.quote_balances[i] = quote
+        self._refresh(i)
+
+    def set_amount(self, amount: float):
+        """Nouvelle quantité par opportunité (tous les masques, O(n log n))"""
+        self.amount = amount
+        for i in range(len(self.venues)):
+            self._refresh(i)
+
+    def bid(self, venue: str) -> float:
+        return self.bids[self.positions[venue]]
+
+    def ask(self, venue: str) -> float:
+        return self.asks[self.positions[venue]]
+
+    def best_pair(self) -> Optional[Tuple[str, str]]:
+        """
+        Meilleure paire réalisable (exchange d'achat, exchange de vente),
+        exchanges distincts; None si aucune paire éligible
+
+        La paire maximise produit net de vente - coût net d'achat, même
+        négatif: l'appelant applique ses seuils de rentabilité.
+        """
+        cost, buy = self._asks.top()
+        proceeds, sell = self._bids.top()
+        if cost == INF or proceeds == INF:
+            return None
+        if buy != sell:
+            return self.venues[buy], self.venues[sell]
+
+        # Même exchange en tête des deux côtés: second meilleur de l'un des deux
+        other_cost, other_buy = self._asks.top_excluding(buy)
+        other_proceeds, other_sell = self._bids.top_excluding(sell)
+        candidates = []
+        if other_cost != INF:
+            candidates.append((-proceeds - other_cost, other_buy, sell))
+        if other_proceeds != INF:
+            candidates.append((-other_proceeds - cost, buy, other_sell))
+        if not candidates:
+            return None
+        _, buy, sell = max(candidates, key=lambda candidate: candidate[0])
+        return self.venues[buy], self.venues[sell]
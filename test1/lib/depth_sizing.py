@@ -0,0 +1,144 @@
+# Taille des opportunités d'arbitrage selon la profondeur des order books
+# Parcours vectorisé des niveaux L2 (asks de l'exchange d'achat, bids de
+# l'exchange de vente): quantité qui maximise le gain net de frais et prix
+# moyens pondérés d'exécution
+
+import bisect
+import math
+from dataclasses import dataclass
+from typing import Mapping, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class DepthFill:
+    """Aller-retour retenu: achat sur les asks, vente sur les bids"""
+    amount: float           # unités de base échangées (0: aucun gain possible)
+    buy_price: float        # prix moyen pondéré d'achat (NaN si amount nul)
+    sell_price: float       # prix moyen pondéré de vente (NaN si amount nul)
+    profit: float           # gain net de frais (quote)
+    buy_levels: int = 0     # niveaux d'asks touchés
+    sell_levels: int = 0    # niveaux de bids touchés
+
+
+NO_FILL = DepthFill(0.0, math.nan, math.nan, 0.0)
+
+
+def book_side(levels) -> np.ndarray:
+    """Niveaux [[prix, quantité, ...], ...] d'un order book ccxt en tableau (n, 2)"""
+    side = np.asarray(levels, dtype=np.float64)
+    if side.size == 0:
+        return np.empty((0, 2))
+    return side[:, :2]
+
+
+def _profitable_levels(asks, bids, buy_factor: float, sell_factor: float):
+    """
+    Niveaux de chaque côté encore rentables face au meilleur niveau opposé
+
+    Au-delà, le gain marginal est négatif quelle que soit la quantité: ces
+    niveaux ne sont jamais atteints par l'optimum. Recherche dichotomique
+    avant conversion, la copie ne porte que sur les niveaux utiles.
+    """
+    if len(asks) == 0 or len(bids) == 0:
+        return asks[:0], bids[:0]
+    top_ask, top_bid = asks[0][0], bids[0][0]
+    n_asks = bisect.bisect_left(asks, sell_factor * top_bid / buy_factor, key=lambda level: level[0])
+    n_bids = bisect.bisect_left(bids, -buy_factor * top_ask / sell_factor, key=lambda level: -level[0])
+    return asks[:n_asks], bids[:n_bids]
+
+
+def _cumulative(side: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Quantités et montants cumulés aux bornes des niveaux (0 en tête)"""
+    side = side[side[:, 1] > 0]
+    amounts = np.concatenate(([0.0], np.cumsum(side[:, 1])))
+    notionals = np.concatenate(([0.0], np.cumsum(side[:, 0] * side[:, 1])))
+    return amounts, notionals
+
+
+def _factors(fees: Optional[Mapping[str, float]]) -> Tuple[float, float]:
+    """(coût net d'une unité achetée, produit net d'une unité vendue) par unité de prix"""
+    fees = fees or {}
+    base, quote = fees.get('base', 0.0), fees.get('quote', 0.0)
+    return (1 + base) / (1 - quote), (1 - quote) / (1 + base)
+
+
+def best_fill(
+    asks,
+    bids,
+    buy_fees: Optional[Mapping[str, float]] = None,
+    sell_fees: Optional[Mapping[str, float]] = None,
+    max_amount: float = math.inf,
+    max_cost: float = math.inf
+) -> DepthFill:
+    """
+    Quantité de l'aller-retour qui maximise le gain net de frais
+
+    Le coût d'achat (asks croissants) est convexe et le produit de vente
+    (bids décroissants) concave par morceaux en la quantité: le gain est
+    concave et son maximum est atteint sur une borne de niveau de l'un des
+    deux côtés ou sur la limite de quantité. Toutes ces bornes sont évaluées
+    d'un coup; seuls les niveaux rentables face au meilleur prix opposé
+    sont convertis et parcourus.
+
+    Args:
+        asks: Niveaux d'asks de l'exchange d'achat (prix croissants)
+        bids: Niveaux de bids de l'exchange de vente (prix décroissants)
+        buy_fees, sell_fees: {'base': frais, 'quote': frais} de chaque
+            exchange, mêmes conventions que ConsolidatedBook
+        max_amount: Quantité maximale (solde de base de l'exchange de vente)
+        max_cost: Coût d'achat maximal frais compris (solde quote de
+            l'exchange d'achat)
+
+    Returns:
+        DepthFill, NO_FILL si aucune quantité n'est rentable
+    """
+    buy_factor, _ = _factors(buy_fees)
+    _, sell_factor = _factors(sell_fees)
+    asks, bids = _profitable_levels(asks, bids, buy_factor, sell_factor)
+    ask_amounts, ask_notionals = _cumulative(book_side(asks))
+    bid_amounts, bid_notionals = _cumulative(book_side(bids))
+
+    limit = min(ask_amounts[-1], bid_amounts[-1], max_amount)
+    if max_cost < math.inf:
+        limit = min(limit, float(np.interp(max_cost, ask_notionals * buy_factor, ask_amounts)))
+    if not limit > 0:
+        return NO_FILL
+
+    sizes = np.sort(np.concatenate((ask_amounts, bid_amounts)))
+    sizes = np.append(sizes[sizes < limit], limit)
+    profits = (sell_factor * np.interp(sizes, bid_amounts, bid_notionals)
+               - buy_factor * np.interp(sizes, ask_amounts, ask_notionals))
+    # À gain égal, la plus petite quantité (premier maximum)
+    best = int(np.argmax(profits))
+    amount = float(sizes[best])
+    if amount <= 0:
+        return NO_FILL
+
+    return DepthFill(
+        amount=amount,
+        buy_price=float(np.interp(amount, ask_amounts, ask_notionals)) / amount,
+        sell_price=float(np.interp(amount, bid_amounts, bid_notionals)) / amount,
+        profit=float(profits[best]),
+        buy_levels=int(np.searchsorted(ask_amounts, amount)),
+        sell_levels=int(np.searchsorted(bid_amounts, amount))
+    )
+
+
+def fill_price(levels, amount: float) -> float:
+    """
+    Prix moyen pondéré d'exécution de amount unités sur un côté du carnet
+
+    Au-delà de la profondeur publiée, le reste est compté au prix du
+    dernier niveau. NaN si amount est nul ou le côté vide.
+    """
+    side = book_side(levels)
+    side = side[side[:, 1] > 0]
+    if not amount > 0 or len(side) == 0:
+        return math.nan
+    amounts, notionals = _cumulative(side)
+    notional = float(np.interp(amount, amounts, notionals))
+    if amount > amounts[-1]:
+        notional += (amount - amounts[-1]) * side[-1, 0]
+    return notional / amount
@@ -0,0 +1,189 @@
+# Journal des opportunités d'arbitrage en ajout seul
+# Enregistrements binaires de taille fixe, un fichier par jour (UTC), écrits
+# par lots depuis un thread: record() ne fait jamais d'entrée/sortie
+
+import datetime
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Un enregistrement par opportunité exécutée (136 octets, little-endian)
+JOURNAL_DTYPE = np.dtype([
+    ('timestamp', '<i8'),       # ms depuis l'epoch (UTC)
+    ('pair', 'S24'),
+    ('buy_venue', 'S24'),
+    ('sell_venue', 'S24'),
+    ('buy_price', '<f8'),
+    ('sell_price', '<f8'),
+    ('amount', '<f8'),          # unités de base échangées
+    ('fees_quote', '<f8'),
+    ('fees_base', '<f8'),
+    ('expected_pnl', '<f8'),    # gain attendu à la détection (quote)
+    ('realized_pnl', '<f8'),    # gain aux prix d'exécution (quote)
+])
+TEXT_FIELDS = ('pair', 'buy_venue', 'sell_venue')
+TEXT_BYTES = JOURNAL_DTYPE['pair'].itemsize
+
+MS_PER_DAY = 86_400_000
+
+DayLike = Union[str, datetime.date, pd.Timestamp, None]
+
+logger = logging.getLogger(__name__)
+
+_CLOSE = object()
+
+
+def journal_path(directory: Union[str, Path], day: DayLike = None) -> Path:
+    """Fichier du journal de day (aujourd'hui UTC par défaut)"""
+    day = pd.Timestamp(day) if day is not None else pd.Timestamp.now(tz='UTC')
+    return Path(directory) / f"opportunities_{day:%Y-%m-%d}.bin"
+
+
+class OpportunityJournal:
+    """
+    Écrivain du journal: record() place l'opportunité dans une file, un
+    thread l'ajoute au fichier du jour par lots (batch_size enregistrements
+    ou flush_interval secondes après le premier en attente)
+
+    Coût constant par opportunité quelle que soit la taille du journal;
+    close() écrit les enregistrements encore en attente. Un arrêt brutal
+    peut laisser un enregistrement partiel en fin de fichier: ignoré par
+    read_journal, il est tronqué avant l'ajout suivant pour que les
+    enregistrements restent alignés.
+    """
+
+    def __init__(self, directory: Union[str, Path], batch_size: int = 256, flush_interval: float = 1.0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.n_written = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name='opportunity-journal', daemon=True)
+        self._writer.start()
+
+    def record(
+        self,
+        pair: str,
+        buy_venue: str,
+        sell_venue: str,
+        buy_price: float,
+        sell_price: float,
+        amount: float,
+        fees_quote: float,
+        fees_base: float,
+        expected_pnl: float,
+        realized_pnl: float,
+        timestamp: Optional[int] = None
+    ):
+        """
+        Ajoute une opportunité (timestamp en ms, maintenant par défaut)
+
+        Les champs sont convertis ici, dans le thread appelant: une valeur
+        invalide lève ValueError sans faire perdre le lot en attente.
+
+        Raises:
+            ValueError: pair ou exchange de plus de TEXT_BYTES octets en
+                UTF-8, ou valeur numérique invalide
+        """
+        if self._closed:
+            raise RuntimeError("Journal fermé")
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        self._queue.put((
+            int(timestamp), _encode(pair), _encode(buy_venue), _encode(sell_venue),
+            float(buy_price), float(sell_price), float(amount), float(fees_quote), float(fees_base),
+            float(expected_pnl), float(realized_pnl)
+        ))
+
+    def close(self):
+        """Écrit les enregistrements en attente et arrête le thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._writer.join()
+
+    def __enter__(self) -> 'OpportunityJournal':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        pending = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _CLOSE:
+                self._write(pending)
+                return
+            if item is not None:
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append(item)
+            if len(pending) >= self.batch_size or (pending and time.monotonic() >= deadline):
+                self._write(pending)
+                pending = []
+
+    def _write(self, pending: list):
+        """Ajoute un lot aux fichiers de ses jours (un write par jour)"""
+        if not pending:
+            return
+        try:
+            records = np.array(pending, dtype=JOURNAL_DTYPE)
+            days = records['timestamp'] // MS_PER_DAY
+            for day in np.unique(days):
+                path = journal_path(self.directory, pd.Timestamp(int(day) * MS_PER_DAY, unit='ms'))
+                with open(path, 'ab') as f:
+                    # Enregistrement partiel d'un arrêt brutal: tronqué pour réaligner l'ajout
+                    size = f.seek(0, 2)
+                    if size % JOURNAL_DTYPE.itemsize:
+                        logger.warning(f"⚠️ Enregistrement partiel tronqué en fin de {path.name}")
+                        f.truncate(size - size % JOURNAL_DTYPE.itemsize)
+                    f.write(records[days == day].tobytes())
+            self.n_written += len(records)
+        except Exception as e:
+            logger.error(f"❌ Écriture du journal impossible ({len(pending)} opportunités perdues): {e}")
+
+
+def _encode(text: str) -> bytes:
+    """Champ texte en UTF-8, ValueError s'il dépasse TEXT_BYTES octets (jamais tronqué)"""
+    encoded = str(text).encode('utf-8')
+    if len(encoded) > TEXT_BYTES:
+        raise ValueError(f"'{text}' dépasse {TEXT_BYTES} octets en UTF-8")
+    return encoded
+
+
+def read_journal(directory: Union[str, Path], day: DayLike = None) -> np.ndarray:
+    """
+    Enregistrements d'un jour en tableau structuré JOURNAL_DTYPE (lecture
+    directe du fichier, enregistrement partiel final ignoré)
+    """
+    path = journal_path(directory, day)
+    if not path.exists():
+        return np.empty(0, dtype=JOURNAL_DTYPE)
+    count = path.stat().st_size // JOURNAL_DTYPE.itemsize
+    return np.fromfile(path, dtype=JOURNAL_DTYPE, count=count)
+
+
+def load_journal(directory: Union[str, Path], day: DayLike = None) -> pd.DataFrame:
+    """Journal d'un jour en DataFrame indexé par date, textes décodés"""
+    records = read_journal(directory, day)
+    df = pd.DataFrame({
+        name: np.char.decode(records[name], 'utf-8') if name in TEXT_FIELDS else records[name]
+        for name in JOURNAL_DTYPE.names if name != 'timestamp'
+    }, index=pd.to_datetime(records['timestamp'], unit='ms'))
+    df.index.name = 'timestamp'
+    return df
@@ -0,0 +1,181 @@
+# Notifications Telegram non bloquantes
+# File bornée vidée par un thread: rafales regroupées en un message, débit
+# limité, messages les plus anciens abandonnés (et résumés) sous pression
+
+import collections
+import json
+import logging
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Deque, List, Optional, Tuple
+
+TELEGRAM_API_URL = 'https://api.telegram.org'
+
+# Longueur maximale d'un message Telegram
+MAX_MESSAGE_LENGTH = 4096
+
+# Codes couleur ANSI des lignes de console (colorama)
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramNotifier:
+    """
+    Envoi de messages Telegram hors du thread appelant
+
+    notify() ajoute le message à une file et rend la main aussitôt: la
+    boucle asyncio des order books n'attend jamais le réseau. Un thread
+    envoie les messages:
+
+    - regroupés: les messages arrivés pendant coalesce_window secondes (ou
+      pendant l'attente du débit) partent en un seul message;
+    - au plus un envoi toutes les min_interval secondes (Telegram limite
+      le débit par conversation), retry_after respecté sur HTTP 429;
+    - au plus max_pending messages en attente: les plus anciens sont
+      abandonnés et leur nombre est signalé en tête de l'envoi suivant.
+    """
+
+    def __init__(
+        self,
+        api_token: str,
+        chat_id: str,
+        enabled: bool = True,
+        api_url: str = TELEGRAM_API_URL,
+        min_interval: float = 1.0,
+        coalesce_window: float = 0.5,
+        max_pending: int = 100,
+        request_timeout: float = 10.0
+    ):
+        self.url = f"{api_url}/bot{api_token}/sendMessage"
+        self.chat_id = chat_id
+        self.enabled = enabled
+        self.min_interval = min_interval
+        self.coalesce_window = coalesce_window
+        self.request_timeout = request_timeout
+
+        self.n_sent = 0         # messages remis (regroupés ou non)
+        self.n_requests = 0     # requêtes sendMessage réussies
+        self.n_dropped = 0      # messages abandonnés sous pression
+        self.n_failed = 0       # messages perdus sur erreur réseau / HTTP
+
+        self._pending: Deque[Tuple[float, str]] = collections.deque(maxlen=max_pending)
+        self._unreported_drops = 0
+        self._in_flight = False
+        self._closed = False
+        self._next_send = 0.0
+        self._condition = threading.Condition()
+        self._sender: Optional[threading.Thread] = None
+
+    def notify(self, message: str):
+        """Ajoute message à la file (codes ANSI retirés), sans attente"""
+        if not self.enabled or self._closed:
+            return
+        text = ANSI_ESCAPE.sub('', message).strip()
+        if not text:
+            return
+        with self._condition:
+            if len(self._pending) == self._pending.maxlen:
+                self.n_dropped += 1
+                self._unreported_drops += 1
+            self._pending.append((time.monotonic(), text))
+            if self._sender is None:
+                self._sender = threading.Thread(target=self._run, name='telegram-notifier', daemon=True)
+                self._sender.start()
+            self._condition.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Attend l'envoi des messages en file; False si timeout écoulé avant"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Envoie les messages en file (au plus timeout secondes) puis arrête le thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._sender is not None:
+            self._sender.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                # Regroupement: attente de la fenêtre et du débit (sauf à la fermeture)
+                while not self._closed:
+                    ready_at = max(self._pending[0][0] + self.coalesce_window, self._next_send)
+                    delay = ready_at - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                batch, count = self._take_batch()
+                self._in_flight = True
+
+            delivered = self._post('\n\n'.join(batch))
+            with self._condition:
+                self._in_flight = False
+                self._next_send = time.monotonic() + self.min_interval
+                if delivered:
+                    self.n_requests += 1
+                    self.n_sent += count
+                else:
+                    self.n_failed += count
+                self._condition.notify_all()
+
+    def _take_batch(self) -> Tuple[List[str], int]:
+        """
+        Retire de la file les messages du prochain envoi (verrou tenu)
+
+        Returns:
+            Tuple (lignes de l'envoi, nombre de messages de la file)
+        """
+        batch = []
+        if self._unreported_drops:
+            batch.append(f"⚠️ {self._unreported_drops} messages non envoyés (file pleine)")
+            self._unreported_drops = 0
+        length = sum(len(line) + 2 for line in batch)
+        count = 0
+        while self._pending:
+            text = self._pending[0][1][:MAX_MESSAGE_LENGTH]
+            if count and length + len(text) > MAX_MESSAGE_LENGTH:
+                break
+            self._pending.popleft()
+            batch.append(text)
+            length += len(text) + 2
+            count += 1
+        return batch, count
+
+    def _post(self, text: str) -> bool:
+        """Un appel sendMessage, une nouvelle tentative après un HTTP 429"""
+        payload = json.dumps({'chat_id': self.chat_id, 'text': text[:MAX_MESSAGE_LENGTH]}).encode('utf-8')
+        for attempt in range(2):
+            request = urllib.request.Request(self.url, data=payload, headers={'Content-Type': 'application/json'})
+            try:
+                with urllib.request.urlopen(request, timeout=self.request_timeout):
+                    return True
+            except urllib.error.HTTPError as e:
+                if e.code == 429 and attempt == 0:
+                    try:
+                        retry_after = json.loads(e.read())['parameters']['retry_after']
+                    except Exception:
+                        retry_after = self.min_interval
+                    time.sleep(retry_after)
+                    continue
+                logger.error(f"❌ Telegram: HTTP {e.code}")
+                return False
+            except Exception as e:
+                logger.error(f"❌ Telegram: {e}")
+                return False
+        return False
@@ -37,7 +37,7 @@ if mode!='fake-money':
     real_balance=0
     for ex_str in ex_list.split(','):
         bal = ex[ex_str].fetchBalance()
-        real_balance+=float(bal[pair.split('/')[1]]['total'])
+        real_balance+=float(bal[pair.split(',')[0].split('/')[1]]['total'])
     with open(f"real_balance.txt","w") as f:
         f.write(str(real_balance))
 else:
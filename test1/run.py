@@ -15,7 +15,7 @@ def clear():
 
 try:
     if len(sys.argv) < 3:
-        input_list = ["mode (fake-money or real)", "renewal period (in minutes)", "balance to use", "pair", "exchanges list separated without space with commas (,)"]
+        input_list = ["mode (fake-money or real)", "renewal period (in minutes)", "balance to use", "pair(s) separated with commas (,) or */USDT for all", "exchanges list separated without space with commas (,)"]
         if not renewal:
             input_list.remove("renewal period (in minutes)")
         output = []
@@ -39,7 +39,7 @@ try:
             real_balance=0
             for ex_str in ex_list.split(','):
                 bal = ex[ex_str].fetchBalance()
-                real_balance+=float(bal[pair.split('/')[1]]['total'])
+                real_balance+=float(bal[pair.split(',')[0].split('/')[1]]['total'])
             with open(f"real_balance.txt","w") as f:
                 f.write(str(real_balance))
 
@@ -73,7 +73,7 @@ try:
             real_balance=0
             for ex_str in ex_list.split(','):
                 bal = ex[ex_str].fetchBalance()
-                real_balance+=float(bal[pair.split('/')[1]]['total'])
+                real_balance+=float(bal[pair.split(',')[0].split('/')[1]]['total'])
             with open(f"real_balance.txt","w") as f:
                 f.write(str(real_balance))
         else:
@@ -123,7 +123,8 @@ except KeyboardInterrupt:
             append_new_line('logs/logs.txt',f"{get_time_blank()} INFO: ctrl+c was pressed.")
             if inp.lower() == "y" or inp.lower() == "yes":
                 answered = True
-                emergency_convert_list(pair,[ex_list.split(',')[i] for i in range(len(ex_list.split(',')))])
+                for pair_to_sell in [p for p in pair.split(',') if not p.startswith('*/')]:
+                    emergency_convert_list(pair_to_sell,[ex_list.split(',')[i] for i in range(len(ex_list.split(',')))])
                 sys.exit(1)
             if inp.lower() == "n" or inp.lower() == "no":
                 answered = True
@@ -0,0 +1,235 @@
+# Tests unitaires des composants du bot d'arbitrage (lib/)
+# Carnet consolidé, profondeur L2, journal des opportunités, notifications
+
+import sys
+import time
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+# Ajouter le répertoire du bot au path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from lib.consolidated_book import ConsolidatedBook
+from lib.depth_sizing import NO_FILL, best_fill, fill_price
+from lib.opportunity_journal import JOURNAL_DTYPE, OpportunityJournal, journal_path, load_journal, read_journal
+from lib.telegram_notifier import TelegramNotifier
+
+
+class TestConsolidatedBook:
+    """Tests du carnet consolidé multi-exchanges"""
+    
+    def test_best_feasible_pair(self):
+        """Meilleure paire nette de frais, exchanges sans solde exclus"""
+        book = ConsolidatedBook(['a', 'b', 'c'], amount=1.0, fees={'c': {'base': 0, 'quote': 0.03}})
+        assert book.best_pair() is None
+        book.update('a', 99.0, 100.0)
+        assert book.best_pair() is None  # un seul exchange coté
+        book.update('b', 101.0, 102.0)
+        book.update('c', 103.0, 104.0)
+        assert book.best_pair() == ('a', 'b')  # vente sur c: 103 * 0.97 < 101
+        
+        book.set_balances('b', 0.5, 1000.0)
+        assert not book.can_sell[1] and book.best_pair() == ('a', 'c')
+        book.set_balances('a', 2.0, 50.0)
+        assert not book.can_buy[0] and book.best_pair() == ('b', 'c')
+        book.quote_coverage = 0.0
+        book.set_balances('a', 2.0, 50.0)
+        assert book.can_buy[0]
+        book.quote_coverage = 1.0
+        
+        # Même exchange en tête des deux côtés: second meilleur d'un côté
+        book.set_balances('a', 2.0, 1000.0)
+        book.update('a', 110.0, 100.0)
+        assert book.best_pair() == ('b', 'a')
+    
+    def test_matches_full_scan(self):
+        """Même gain que l'examen de toutes les paires, mises à jour aléatoires"""
+        import random
+        rng = random.Random(0)
+        venues = [f"v{i}" for i in range(7)]
+        book = ConsolidatedBook(venues, amount=1.0, fees={v: {'base': 0.001 * (i % 2), 'quote': 0.002}
+                                                          for i, v in enumerate(venues)})
+        gain = lambda i, j: book.bids[j] * book.sell_factors[j] - book.asks[i] * book.buy_factors[i]
+        for _ in range(500):
+            venue = rng.choice(venues)
+            if rng.random() < 0.3:
+                book.set_balances(venue, rng.choice([0, 1, 2]), rng.choice([0, 500]))
+            else:
+                mid = 100 + rng.randint(-3, 3)
+                book.update(venue, mid - rng.randint(0, 2), mid + rng.randint(0, 2))
+            feasible = [gain(i, j) for i in range(7) for j in range(7)
+                        if i != j and book.can_buy[i] and book.can_sell[j]]
+            pair = book.best_pair()
+            if not feasible:
+                assert pair is None
+            else:
+                assert gain(*(book.positions[v] for v in pair)) == pytest.approx(max(feasible))
+
+class TestDepthSizing:
+    """Tests du dimensionnement des opportunités sur la profondeur L2"""
+    
+    def test_best_fill_walks_levels(self):
+        """Quantité optimale nette de frais et prix moyens pondérés"""
+        asks = np.array([[100.0, 1.0], [100.2, 2.0], [100.6, 5.0]])
+        bids = np.array([[100.5, 0.5], [100.4, 1.0], [100.3, 4.0]])
+        fill = best_fill(asks, bids)
+        # Gain marginal par tranche: 0.5, 0.4, 0.2, 0.1 puis négatif (asks à 100.6)
+        assert fill.amount == pytest.approx(3.0)
+        assert fill.buy_price == pytest.approx((100.0 + 2 * 100.2) / 3)
+        assert fill.sell_price == pytest.approx((0.5 * 100.5 + 100.4 + 1.5 * 100.3) / 3)
+        assert fill.profit == pytest.approx(0.5 * 0.5 + 0.5 * 0.4 + 0.5 * 0.2 + 1.5 * 0.1)
+        assert (fill.buy_levels, fill.sell_levels) == (2, 3)
+        assert fill_price(asks, fill.amount) == pytest.approx(fill.buy_price)
+        assert fill_price(asks, 10.0) == pytest.approx((100.0 + 200.4 + 7 * 100.6) / 10)
+        
+        # Frais, soldes et niveaux ccxt (listes, colonnes en plus)
+        fees = {'base': 0.0, 'quote': 0.004}
+        assert best_fill(asks, bids, fees, fees).amount == 0
+        assert best_fill(asks.tolist(), bids.tolist(), max_amount=0.8).amount == pytest.approx(0.8)
+        limited = best_fill([[100.0, 1.0, 7], [100.2, 2.0, 3]], bids, max_cost=150.1)
+        assert limited.amount == pytest.approx(1.5) and limited.buy_levels == 2
+        assert best_fill([], bids) is NO_FILL
+    
+    def test_best_fill_matches_brute_force(self):
+        """Gain optimal égal au maximum sur une grille fine de quantités"""
+        rng = np.random.default_rng(7)
+        buy_fees, sell_fees = {'base': 0.001, 'quote': 0.0}, {'base': 0.0, 'quote': 0.001}
+        buy_factor, sell_factor = 1.001, 0.999
+        
+        def notional(side, amount):
+            filled = np.minimum(np.cumsum(side[:, 1]), amount)
+            return float(np.sum(np.diff(filled, prepend=0.0) * side[:, 0]))
+        
+        for _ in range(50):
+            n, m = rng.integers(1, 12, size=2)
+            asks = np.column_stack([100 + np.cumsum(rng.uniform(0, 0.5, n)), rng.uniform(0.1, 3, n)])
+            bids = np.column_stack([101 - np.cumsum(rng.uniform(0, 0.5, m)), rng.uniform(0.1, 3, m)])
+            max_amount = rng.uniform(0.5, 20)
+            fill = best_fill(asks, bids, buy_fees, sell_fees, max_amount=max_amount)
+            
+            grid = np.linspace(0, min(asks[:, 1].sum(), bids[:, 1].sum(), max_amount), 2001)
+            brute = max(sell_factor * notional(bids, q) - buy_factor * notional(asks, q) for q in grid)
+            assert fill.profit >= brute - 1e-9
+            if fill.amount > 0:
+                assert fill.profit == pytest.approx(
+                    fill.amount * (sell_factor * fill.sell_price - buy_factor * fill.buy_price))
+
+class TestOpportunityJournal:
+    """Tests du journal binaire des opportunités"""
+    
+    def test_batched_records_read_back_by_day(self, tmp_path):
+        """Lots écrits par le thread, un fichier par jour, relus en DataFrame"""
+        day = int(pd.Timestamp('2024-03-01').timestamp() * 1000)
+        with OpportunityJournal(tmp_path, batch_size=4, flush_interval=60) as journal:
+            for k in range(10):
+                journal.record('BTC/USDT', 'fake_a', 'fake_b', 100.0 + k, 101.0 + k, 0.5, 0.1, 0.0,
+                               0.4, 0.3, timestamp=day + k * 3_600_000)
+            journal.record('ETH/USDT', 'fake_c', 'fake_a', 10.0, 11.0, 1.0, 0.0, 0.0, 1.0, 1.0,
+                           timestamp=day - 1)
+        assert journal.n_written == 11
+        
+        records = read_journal(tmp_path, '2024-03-01')
+        assert records.dtype == JOURNAL_DTYPE and len(records) == 10
+        frame = load_journal(tmp_path, '2024-03-01')
+        assert frame['buy_venue'].iloc[0] == 'fake_a' and frame['buy_price'].tolist() == [100.0 + k for k in range(10)]
+        assert frame.index[-1] == pd.Timestamp('2024-03-01 09:00')
+        assert load_journal(tmp_path, '2024-02-29')['pair'].tolist() == ['ETH/USDT']
+        
+        # Enregistrement partiel (arrêt brutal) ignoré, jour absent vide
+        with open(journal_path(tmp_path, '2024-03-01'), 'ab') as f:
+            f.write(b'\0' * 10)
+        assert len(read_journal(tmp_path, '2024-03-01')) == 10
+        assert len(load_journal(tmp_path, '2024-03-02')) == 0
+        with pytest.raises(RuntimeError):
+            journal.record('BTC/USDT', 'a', 'b', 1, 1, 1, 0, 0, 0, 0)
+    
+    def test_append_realigned_and_fields_validated(self, tmp_path):
+        """Ajout après un enregistrement partiel réaligné, champs invalides refusés à l'appel"""
+        day = int(pd.Timestamp('2024-03-01').timestamp() * 1000)
+        with OpportunityJournal(tmp_path, batch_size=2) as journal:
+            journal.record('BTC/USDT', 'fake_a', 'fake_b', 100.0, 101.0, 0.5, 0.1, 0.0, 0.4, 0.3, timestamp=day)
+        with open(journal_path(tmp_path, '2024-03-01'), 'ab') as f:
+            f.write(b'\0' * 10)
+        
+        with OpportunityJournal(tmp_path, batch_size=2) as journal:
+            with pytest.raises(ValueError):
+                journal.record('BTC/USDT', 'x' * 25, 'fake_b', 1, 1, 1, 0, 0, 0, 0, timestamp=day)
+            with pytest.raises(ValueError):
+                journal.record('BTC/USDT', 'fake_a', 'fake_b', 'prix', 1, 1, 0, 0, 0, 0, timestamp=day)
+            journal.record('BTC/USDT', 'börse_ü', 'fake_b', 102.0, 103.0, 1.0, 0.0, 0.0, 1.0, 1.0, timestamp=day + 1)
+            journal.record('ETH/USDT', 'fake_a', 'fake_c', 10.0, 11.0, 1.0, 0.0, 0.0, 1.0, 1.0, timestamp=day + 2)
+        assert journal.n_written == 2
+        
+        path = journal_path(tmp_path, '2024-03-01')
+        assert path.stat().st_size == 3 * JOURNAL_DTYPE.itemsize
+        frame = load_journal(tmp_path, '2024-03-01')
+        assert frame['buy_venue'].tolist() == ['fake_a', 'börse_ü', 'fake_a']
+        assert frame['buy_price'].tolist() == [100.0, 102.0, 10.0]
+
+class TestTelegramNotifier:
+    """Tests des notifications Telegram non bloquantes (serveur HTTP local)"""
+    
+    @pytest.fixture
+    def telegram_server(self):
+        """Faux sendMessage: enregistre les requêtes, répond après 0.2 s"""
+        import http.server
+        import json
+        import threading
+        received = []
+        
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                received.append((self.path, json.loads(body)))
+                time.sleep(0.2)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(b'{"ok": true}')
+            
+            def log_message(self, *args):
+                pass
+        
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f"http://127.0.0.1:{server.server_address[1]}", received
+        server.shutdown()
+        server.server_close()
+    
+    def test_burst_coalesced_without_blocking(self, telegram_server):
+        """Rafale regroupée en un envoi, notify() n'attend pas le réseau"""
+        api_url, received = telegram_server
+        notifier = TelegramNotifier('TOKEN', '42', api_url=api_url, min_interval=0.1, coalesce_window=0.1)
+        start = time.perf_counter()
+        for k in range(20):
+            notifier.notify(f"\x1b[32mopportunité {k}\x1b[0m")
+        assert time.perf_counter() - start < 0.1
+        
+        assert notifier.flush(timeout=5)
+        assert notifier.n_requests == 1 and notifier.n_sent == 20
+        path, payload = received[0]
+        assert path == '/botTOKEN/sendMessage' and payload['chat_id'] == '42'
+        assert payload['text'].split('\n\n') == [f"opportunité {k}" for k in range(20)]
+        
+        notifier.close()
+        notifier.notify("après fermeture")
+        assert len(received) == 1
+    
+    def test_backpressure_drops_oldest_with_summary(self, telegram_server):
+        """File pleine: messages les plus anciens abandonnés et signalés"""
+        api_url, received = telegram_server
+        notifier = TelegramNotifier('TOKEN', '42', api_url=api_url, min_interval=0.1,
+                                    coalesce_window=0.1, max_pending=5)
+        for k in range(12):
+            notifier.notify(f"message {k}")
+        notifier.close(timeout=5)
+        
+        assert notifier.n_dropped == 7 and notifier.n_sent == 5
+        lines = received[0][1]['text'].split('\n\n')
+        assert lines[0].startswith('⚠️ 7 messages') and lines[1:] == [f"message {k}" for k in range(7, 12)]
+        
+        disabled = TelegramNotifier('TOKEN', '42', enabled=False, api_url=api_url)
+        disabled.notify("ignoré")
+        assert disabled.flush(timeout=0) and len(received) == 1
@@ -0,0 +1,71 @@
+# Benchmark du carnet consolidé multi-exchanges du bot d'arbitrage
+#
+# Usage: python tools/benchmark_consolidated_book.py [n_ticks]
+# Coût par tick (mise à jour d'un exchange + meilleure paire réalisable)
+# du ConsolidatedBook contre le balayage des dicts de bot-fake-money.py,
+# de 4 à 1000 exchanges.
+import sys
+import time
+import random
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from lib.consolidated_book import ConsolidatedBook
+
+N_TICKS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+VENUE_COUNTS = (4, 20, 100, 1000)
+
+
+def random_ticks(venues, n_ticks: int, seed: int = 42):
+    """Meilleurs bid / ask aléatoires autour de 60000, un exchange par tick"""
+    rng = random.Random(seed)
+    ticks = []
+    for _ in range(n_ticks):
+        mid = 60000 + rng.uniform(-50, 50)
+        spread = rng.uniform(0.5, 5)
+        ticks.append((rng.choice(venues), mid - spread, mid + spread))
+    return ticks
+
+
+def scan_dicts(venues, ticks, crypto, usd, amount):
+    """Boucle d'origine: min / max sur les dicts à chaque tick, O(n)"""
+    bid_prices, ask_prices = {}, {}
+    for venue, bid, ask in ticks:
+        bid_prices[venue] = bid
+        ask_prices[venue] = ask
+        min_ask_ex = min(ask_prices, key=ask_prices.get)
+        max_bid_ex = max(bid_prices, key=bid_prices.get)
+        for u in venues:
+            if crypto[u] < amount:
+                min_ask_ex = u
+            if usd[u] <= 0:
+                max_bid_ex = u
+
+
+def scan_book(venues, ticks, crypto, usd, amount):
+    """ConsolidatedBook: mise à jour et meilleure paire en O(log n)"""
+    book = ConsolidatedBook(venues, amount)
+    for venue in venues:
+        book.set_balances(venue, crypto[venue], usd[venue])
+    for venue, bid, ask in ticks:
+        book.update(venue, bid, ask)
+        book.best_pair()
+
+
+if __name__ == "__main__":
+    print("⏱️ BENCHMARK CARNET CONSOLIDÉ MULTI-EXCHANGES")
+    print("=" * 60)
+    print(f"{'exchanges':>10} {'dicts (µs/tick)':>16} {'carnet (µs/tick)':>17} {'gain':>7}")
+
+    for n_venues in VENUE_COUNTS:
+        venues = [f"venue_{i}" for i in range(n_venues)]
+        ticks = random_ticks(venues, N_TICKS)
+        crypto = {venue: 1.0 for venue in venues}
+        usd = {venue: 100_000.0 for venue in venues}
+
+        timings = []
+        for scan in (scan_dicts, scan_book):
+            start = time.perf_counter()
+            scan(venues, ticks, crypto, usd, 1.0)
+            timings.append((time.perf_counter() - start) / N_TICKS * 1e6)
+        print(f"{n_venues:>10} {timings[0]:>16.2f} {timings[1]:>17.2f} {timings[0] / timings[1]:>6.1f}x")
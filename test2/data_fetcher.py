@@ -1,15 +1,25 @@
+import sys
+import math
+import collections
 import ccxt
 import pandas as pd
 import numpy as np
 import talib
+from pathlib import Path
 from config import TIMEFRAME, DATA_LIMIT, ATR_PERIOD, VOLATILITY_PERIOD
 
+# Exchange local hors ligne ('fake') et indicateurs incrémentaux partagés avec le bot principal
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'straddle_trading_bot' / 'src'))
+from fake_exchange import create_exchange
+from streaming_indicators import StreamingIndicators, WilderAverage
+
 def initialize_exchange(exchange_id, params=None):
     """
     Initialise une connexion à une plateforme d'échange
     
     Args:
-        exchange_id (str): ID de l'échange (ex: 'binance')
+        exchange_id (str): ID de l'échange (ex: 'binance', 'fake' pour
+            l'exchange local hors ligne)
         params (dict): Paramètres additionnels pour l'échange
         
     Returns:
@@ -18,8 +28,7 @@ def initialize_exchange(exchange_id, params=None):
     if params is None:
         params = {'enableRateLimit': True}
     
-    exchange_class = getattr(ccxt, exchange_id)
-    return exchange_class(params)
+    return create_exchange(exchange_id, params)
 
 def fetch_ohlcv(exchange, symbol, timeframe=TIMEFRAME, limit=DATA_LIMIT):
     """
@@ -74,6 +83,87 @@ def prepare_data_for_straddle(df):
     
     return df
 
+class StraddleIndicatorStream:
+    """
+    Version incrémentale de prepare_data_for_straddle pour les boucles temps réel
+    
+    Construite sur StreamingIndicators, le moteur incrémental du bot principal:
+    rendements, volatilité et volume moyen en sont repris, seul l'ATR est
+    lissé à la manière de Wilder (comme talib) à partir de son true range.
+    Chaque barre clôturée coûte O(1); seules les history dernières lignes
+    préparées sont conservées.
+    """
+    
+    COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'returns',
+               'atr', 'atr_pct', 'volatility', 'volume_ma', 'relative_volume']
+    
+    def __init__(self, history=DATA_LIMIT):
+        self.indicators = StreamingIndicators(volatility_window=VOLATILITY_PERIOD)
+        self.atr = WilderAverage(ATR_PERIOD)
+        self.last_timestamp = None
+        self.rows = collections.deque(maxlen=history)
+    
+    @property
+    def prev_close(self):
+        """Clôture de la dernière barre intégrée"""
+        return self.indicators.prev_close
+    
+    def update(self, bar):
+        """
+        Intègre une barre clôturée [timestamp, open, high, low, close, volume]
+        
+        Returns:
+            dict: Ligne préparée, ou None tant que les indicateurs ne sont pas définis
+        """
+        timestamp, open_, high, low, close, volume = bar
+        first_bar = self.indicators.n_bars == 0
+        values = self.indicators.update(open_, high, low, close, volume)
+        self.last_timestamp = timestamp
+        
+        # talib ignore la première barre (pas de clôture précédente)
+        atr = math.nan if first_bar else self.atr.push(self.indicators.true_range.values[-1])
+        
+        row = {
+            'timestamp': pd.Timestamp(timestamp, unit='ms'), 'open': open_, 'high': high, 'low': low,
+            'close': close, 'volume': volume, 'returns': values['returns'], 'atr': atr, 'atr_pct': atr / close,
+            'volatility': self.indicators.returns.std() * np.sqrt(VOLATILITY_PERIOD),
+            'volume_ma': values['volume_sma'], 'relative_volume': values['volume_ratio']
+        }
+        if any(value != value for value in row.values() if isinstance(value, float)):
+            return None
+        self.rows.append(row)
+        return row
+    
+    def to_frame(self):
+        """Lignes préparées conservées, comme prepare_data_for_straddle"""
+        return pd.DataFrame(list(self.rows), columns=self.COLUMNS)
+
+def update_indicator_stream(exchange, stream, symbol, timeframe=TIMEFRAME, limit=DATA_LIMIT):
+    """
+    Récupère uniquement les barres postérieures à la dernière barre intégrée
+    
+    Au premier appel, les limit dernières barres servent au préchauffage.
+    Seules les barres clôturées sont intégrées au flux.
+    
+    Args:
+        exchange (ccxt.Exchange): Instance de l'échange
+        stream (StraddleIndicatorStream): Flux d'indicateurs à mettre à jour
+        symbol (str): Paire de trading (ex: 'BTC/USDT')
+        timeframe (str): Intervalle de temps (ex: '1m', '1h', '1d')
+        limit (int): Nombre maximum de barres par requête
+    
+    Returns:
+        float: Dernier prix (clôture provisoire de la barre en cours)
+    """
+    bar_ms = exchange.parse_timeframe(timeframe) * 1000
+    since = None if stream.last_timestamp is None else stream.last_timestamp + bar_ms
+    data = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
+    now = exchange.milliseconds()
+    for bar in data:
+        if bar[0] + bar_ms <= now and (stream.last_timestamp is None or bar[0] > stream.last_timestamp):
+            stream.update(bar)
+    return data[-1][4] if data else stream.prev_close
+
 def fetch_ticker(exchange, symbol):
     """
     Récupère les informations de ticker pour un symbole
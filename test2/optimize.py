@@ -1,7 +1,9 @@
 # Script d'optimisation pour trouver les meilleurs paramètres de la stratégie
 import numpy as np
 import pandas as pd
+import sys
 import itertools
+from pathlib import Path
 from multiprocessing import Pool, cpu_count
 
 from data_fetcher import initialize_exchange, fetch_ohlcv
@@ -9,6 +11,25 @@ from model_builder import build_pair_regression_model, calculate_spread_statisti
 from signal_generator import generate_trading_signals, calculate_strategy_returns
 from config import EXCHANGE_ID, ENABLE_RATE_LIMIT, SYMBOLS
 
+# Données de marché en mémoire partagée, module partagé avec straddle_trading_bot
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'straddle_trading_bot' / 'src'))
+from shared_market_data import SharedMarketData, attach_market_data
+
+# Prix de clôture des deux actifs, attachés une fois par worker
+_prices = {}
+
+def init_worker(handle1, handle2):
+    """Attache les données publiées par le processus principal (sans copie)"""
+    _prices['asset1'] = attach_market_data(handle1)['close'].to_numpy()
+    _prices['asset2'] = attach_market_data(handle2)['close'].to_numpy()
+
+def fetch_pair_data():
+    """Récupère une seule fois les données OHLCV des deux actifs"""
+    exchange = initialize_exchange(EXCHANGE_ID, {'enableRateLimit': ENABLE_RATE_LIMIT})
+    df1 = fetch_ohlcv(exchange, SYMBOLS['asset1']).set_index('timestamp')
+    df2 = fetch_ohlcv(exchange, SYMBOLS['asset2']).set_index('timestamp')
+    return df1, df2
+
 def run_strategy_with_params(params):
     """
     Exécute la stratégie avec un ensemble de paramètres spécifiques
@@ -29,20 +50,9 @@ def run_strategy_with_params(params):
     config.USE_STOP_LOSS = True if stop_loss_multiplier > 0 else False
     
     try:
-        # Initialisation de l'échange
-        exchange = initialize_exchange(EXCHANGE_ID, {'enableRateLimit': ENABLE_RATE_LIMIT})
-        
-        # Récupération des symboles
-        symbol1 = SYMBOLS['asset1']
-        symbol2 = SYMBOLS['asset2']
-        
-        # Récupération des données historiques
-        df1 = fetch_ohlcv(exchange, symbol1)
-        df2 = fetch_ohlcv(exchange, symbol2)
-        
-        # Extraction des prix de clôture
-        price1 = df1['close'].values
-        price2 = df2['close'].values
+        # Prix de clôture partagés (récupérés une seule fois par le processus principal)
+        price1 = _prices['asset1']
+        price2 = _prices['asset2']
         
         # Construction du modèle de régression et calcul du spread
         beta, alpha, spread = build_pair_regression_model(price1, price2)
@@ -102,9 +112,14 @@ def optimize_strategy():
     
     print(f"Test de {len(param_combinations)} combinaisons de paramètres...")
     
+    # Données récupérées une fois puis publiées en mémoire partagée
+    df1, df2 = fetch_pair_data()
+    
     # Utilisation de multiprocessing pour accélérer l'optimisation
-    with Pool(processes=cpu_count()) as pool:
-        results = pool.map(run_strategy_with_params, param_combinations)
+    with SharedMarketData(df1) as shared1, SharedMarketData(df2) as shared2:
+        with Pool(processes=cpu_count(), initializer=init_worker,
+                  initargs=(shared1.handle, shared2.handle)) as pool:
+            results = pool.map(run_strategy_with_params, param_combinations)
     
     # Conversion des résultats en DataFrame
     results_df = pd.DataFrame(results)
@@ -7,7 +7,7 @@ from datetime import datetime
 
 from config import (EXCHANGE_ID, ENABLE_RATE_LIMIT, SYMBOL, TIMEFRAME, DATA_LIMIT,
                    VOLATILITY_PERIOD, ENTRY_VOLATILITY_PERCENTILE)
-from data_fetcher import initialize_exchange, fetch_ohlcv, prepare_data_for_straddle, fetch_ticker
+from data_fetcher import initialize_exchange, StraddleIndicatorStream, update_indicator_stream, fetch_ticker
 from straddle_strategy import calculate_straddle_levels, is_volatility_high
 from straddle_trader import StraddleTrader
 from straddle_visualization import save_strategy_analysis
@@ -31,6 +31,9 @@ def run_strategy_loop(interval_seconds=300, max_iterations=None, dry_run=True):
     # Initialisation du trader
     trader = StraddleTrader(exchange, SYMBOL, dry_run=dry_run)
     
+    # Indicateurs tenus à jour barre par barre (pas de recalcul de l'historique)
+    stream = StraddleIndicatorStream(history=DATA_LIMIT)
+    
     # Historique des données
     all_data = pd.DataFrame()
     signals_history = []
@@ -43,16 +46,13 @@ def run_strategy_loop(interval_seconds=300, max_iterations=None, dry_run=True):
             print(f"\n[{current_time}] Itération {iteration + 1}")
             
             try:
-                # Récupération des données historiques
+                # Récupération des nouvelles barres et mise à jour des indicateurs
                 print(f"Récupération des données pour {SYMBOL}...")
-                df = fetch_ohlcv(exchange, SYMBOL, timeframe=TIMEFRAME, limit=DATA_LIMIT)
-                
-                # Préparation des données
-                df = prepare_data_for_straddle(df)
+                current_price = update_indicator_stream(exchange, stream, SYMBOL, timeframe=TIMEFRAME, limit=DATA_LIMIT)
+                df = stream.to_frame()
                 
-                # Dernières valeurs
+                # Dernières valeurs (dernière barre clôturée)
                 last_row = df.iloc[-1]
-                current_price = last_row['close']
                 current_volatility = last_row['volatility']
                 current_atr = last_row['atr']
                 
@@ -1,7 +1,13 @@
 # Fonctions pour la stratégie de straddle (strangle)
+import sys
 import numpy as np
 import pandas as pd
 import talib
+from pathlib import Path
+
+# Percentiles glissants partagés avec le bot principal
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'straddle_trading_bot' / 'src'))
+from streaming_indicators import rolling_percentile
 
 def calculate_volatility(prices, period=14, method='std'):
     """
@@ -55,7 +61,20 @@ def calculate_volatility(prices, period=14, method='std'):
     else:
         raise ValueError(f"Méthode de calcul de volatilité '{method}' non reconnue")
 
-def is_volatility_high(volatility, current_idx, percentile=75, lookback=100):
+def volatility_thresholds(volatility, percentile=75, lookback=100):
+    """
+    Seuils de volatilité élevée de toute la série en une passe
+    
+    Percentile des lookback valeurs précédant chaque indice (NaN ignorés),
+    calculé sur une fenêtre triée glissante au lieu d'un np.percentile
+    par barre.
+    
+    Returns:
+        numpy.ndarray: Seuil par indice (NaN avant lookback valeurs)
+    """
+    return rolling_percentile(volatility, lookback, percentile, include_current=False)
+
+def is_volatility_high(volatility, current_idx, percentile=75, lookback=100, thresholds=None):
     """
     Détermine si la volatilité actuelle est élevée par rapport à l'historique récent
     
@@ -64,6 +83,8 @@ def is_volatility_high(volatility, current_idx, percentile=75, lookback=100):
         current_idx (int): Index actuel dans la série
         percentile (float): Percentile à utiliser comme seuil (0-100)
         lookback (int): Période historique à considérer
+        thresholds (numpy.ndarray, optional): Seuils précalculés par
+            volatility_thresholds (mêmes percentile et lookback)
     
     Returns:
         bool: True si la volatilité est élevée, False sinon
@@ -71,8 +92,11 @@ def is_volatility_high(volatility, current_idx, percentile=75, lookback=100):
     if current_idx < lookback:
         return False
     
-    historical_vol = volatility[current_idx-lookback:current_idx]
-    threshold = np.percentile(historical_vol[~np.isnan(historical_vol)], percentile)
+    if thresholds is not None:
+        threshold = thresholds[current_idx]
+    else:
+        historical_vol = volatility[current_idx-lookback:current_idx]
+        threshold = np.percentile(historical_vol[~np.isnan(historical_vol)], percentile)
     
     return volatility[current_idx] > threshold
 
@@ -130,9 +154,11 @@ def generate_straddle_signals(df, volatility_col='volatility', price_col='close'
     signals['short_tp'] = np.nan
     signals['short_sl'] = np.nan
     
+    thresholds = volatility_thresholds(df[volatility_col].values, entry_percentile, volatility_lookback)
+    
     for i in range(volatility_lookback, len(df)):
         signals.loc[df.index[i], 'high_volatility'] = is_volatility_high(
-            df[volatility_col].values, i, entry_percentile, volatility_lookback)
+            df[volatility_col].values, i, entry_percentile, volatility_lookback, thresholds)
         
         if signals.loc[df.index[i], 'high_volatility']:
             # En cas de forte volatilité, préparer pour un straddle
@@ -3,11 +3,17 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import sys
 import warnings
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
 from config import *
 
+# Noyau de pricing partagé avec straddle_trading_bot
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'straddle_trading_bot' / 'src'))
+from pricing import price_straddles
+
 class AdvancedStraddleStrategy:
     """
     Stratégie straddle avancée avec :
@@ -23,38 +29,35 @@ class AdvancedStraddleStrategy:
         self.max_risk_per_trade = INITIAL_CAPITAL * RISK_PER_TRADE
         
     def simulate_straddle_price(self, spot_price, strike, volatility, time_to_expiry, interest_rate=0.02):
-        """Simule le prix d'un straddle selon Black-Scholes simplifié"""
-        if time_to_expiry <= 0:
-            call_value = max(0, spot_price - strike)
-            put_value = max(0, strike - spot_price)
-            return {
-                'call_price': call_value,
-                'put_price': put_value,
-                'straddle_price': call_value + put_value,
-                'time_value': 0
-            }
-        
-        # Black-Scholes simplifié
-        d1 = (np.log(spot_price / strike) + (interest_rate + 0.5 * volatility**2) * time_to_expiry) / (volatility * np.sqrt(time_to_expiry))
-        d2 = d1 - volatility * np.sqrt(time_to_expiry)
-        
-        def norm_cdf(x):
-            return 0.5 * (1 + np.sign(x) * np.sqrt(1 - np.exp(-2 * x**2 / np.pi)))
-        
-        call_price = spot_price * norm_cdf(d1) - strike * np.exp(-interest_rate * time_to_expiry) * norm_cdf(d2)
-        put_price = call_price - spot_price + strike * np.exp(-interest_rate * time_to_expiry)
-        
-        straddle_price = call_price + put_price
-        intrinsic_value = max(0, abs(spot_price - strike))
-        time_value = straddle_price - intrinsic_value
-        
-        return {
-            'call_price': max(0.01, call_price),
-            'put_price': max(0.01, put_price),
-            'straddle_price': max(0.02, straddle_price),
-            'time_value': max(0, time_value),
-            'intrinsic_value': intrinsic_value
-        }
+        """Simule le prix d'un straddle selon Black-Scholes (noyau vectorisé partagé)"""
+        pricing = self.price_straddle_book(spot_price, strike, volatility, time_to_expiry, interest_rate)
+        return {key: float(value) for key, value in pricing.items()}
+    
+    def price_straddle_book(self, spot_price, strikes, volatility, times_to_expiry, interest_rate=0.02):
+        """Valorise un ensemble de straddles en un seul appel (prix minimum 0.01 par jambe, 0.02 le straddle)"""
+        times_to_expiry = np.asarray(times_to_expiry, dtype=np.float64)
+        live = times_to_expiry > 0
+        pricing = price_straddles(spot_price, strikes, volatility, times_to_expiry, interest_rate)
+        
+        pricing['call_price'] = np.where(live, np.maximum(0.01, pricing['call_price']), pricing['call_price'])
+        pricing['put_price'] = np.where(live, np.maximum(0.01, pricing['put_price']), pricing['put_price'])
+        pricing['straddle_price'] = np.where(live, np.maximum(0.02, pricing['straddle_price']), pricing['straddle_price'])
+        return pricing
+    
+    def reprice_open_positions(self, current_price, current_time, current_vol):
+        """Revalorise toutes les positions ouvertes en un seul appel de pricing"""
+        if not self.positions:
+            return []
+        
+        times_to_expiry = [
+            max(0.001, (position['expiry_time'] - current_time).total_seconds() / (365.25 * 24 * 3600))
+            for position in self.positions
+        ]
+        pricing = self.price_straddle_book(
+            current_price, [position['strike'] for position in self.positions], current_vol, times_to_expiry
+        )
+        columns = {key: values.tolist() for key, values in pricing.items()}
+        return [{key: values[j] for key, values in columns.items()} for j in range(len(self.positions))]
     
     def calculate_position_size(self, straddle_price):
         """Calcule la taille de position - risque max = prime payée"""
@@ -121,15 +124,16 @@ class AdvancedStraddleStrategy:
         
         return {'recommended': False}
     
-    def manage_position(self, position, current_price, current_time, current_vol):
+    def manage_position(self, position, current_price, current_time, current_vol, current_straddle=None):
         """Gestion avancée des positions avec hedging"""
         time_elapsed = (current_time - position['entry_time']).total_seconds() / 3600
         time_to_expiry = max(0.001, (position['expiry_time'] - current_time).total_seconds() / (365.25 * 24 * 3600))
         
-        # Valeur actuelle
-        current_straddle = self.simulate_straddle_price(
-            current_price, position['strike'], current_vol, time_to_expiry
-        )
+        # Valeur actuelle (pré-calculée par reprice_open_positions si fournie)
+        if current_straddle is None:
+            current_straddle = self.simulate_straddle_price(
+                current_price, position['strike'], current_vol, time_to_expiry
+            )
         
         current_value = current_straddle['straddle_price'] * position['contracts']
         pnl = current_value - position['premium_paid']
@@ -237,12 +241,13 @@ class AdvancedStraddleStrategy:
             current_price = data.iloc[i]['close']
             current_vol = data.iloc[i]['volatility']
             
-            # Gestion positions existantes
+            # Gestion positions existantes (revalorisées en un seul appel)
             positions_to_close = []
+            book_pricing = self.reprice_open_positions(current_price, current_time, current_vol)
             
             for j, position in enumerate(self.positions):
                 action, exit_info = self.manage_position(
-                    position, current_price, current_time, current_vol
+                    position, current_price, current_time, current_vol, book_pricing[j]
                 )
                 
                 if action != 'HOLD':
@@ -3,11 +3,17 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import sys
 import warnings
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
 from config import *
 
+# Noyau de pricing partagé avec straddle_trading_bot
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'straddle_trading_bot' / 'src'))
+from pricing import price_straddles
+
 class UltraStraddleStrategy:
     """
     Stratégie straddle ultra-optimisée avec :
@@ -187,15 +193,16 @@ class UltraStraddleStrategy:
         
         return hedge_position
     
-    def advanced_position_management(self, position, current_price, current_time, current_vol):
+    def advanced_position_management(self, position, current_price, current_time, current_vol, current_straddle=None):
         """Gestion avancée des positions avec hedging dynamique"""
         time_elapsed = (current_time - position['entry_time']).total_seconds() / 3600
         time_to_expiry = max(0.001, (position['expiry_time'] - current_time).total_seconds() / (365.25 * 24 * 3600))
         
-        # Simulation prix actuel
-        current_straddle = self.simulate_straddle_price(
-            current_price, position['strike'], current_vol, time_to_expiry
-        )
+        # Simulation prix actuel (pré-calculée par reprice_open_positions si fournie)
+        if current_straddle is None:
+            current_straddle = self.simulate_straddle_price(
+                current_price, position['strike'], current_vol, time_to_expiry
+            )
         
         current_value = current_straddle['straddle_price'] * position['contracts']
         pnl = current_value - position['premium_paid']
@@ -276,44 +283,39 @@ class UltraStraddleStrategy:
         return 'HOLD', position
     
     def simulate_straddle_price(self, spot_price, strike, volatility, time_to_expiry, interest_rate=0.02):
-        """Simulation Black-Scholes optimisée"""
-        if time_to_expiry <= 0:
-            call_value = max(0, spot_price - strike)
-            put_value = max(0, strike - spot_price)
-            return {
-                'call_price': call_value,
-                'put_price': put_value,
-                'straddle_price': call_value + put_value,
-                'time_value': 0,
-                'intrinsic_value': call_value + put_value
-            }
-        
-        # Black-Scholes avec ajustements
+        """Simulation Black-Scholes (noyau vectorisé partagé)"""
+        pricing = self.price_straddle_book(spot_price, strike, volatility, time_to_expiry, interest_rate)
+        return {key: float(value) for key, value in pricing.items()}
+    
+    def price_straddle_book(self, spot_price, strikes, volatility, times_to_expiry, interest_rate=0.02):
+        """Valorise un ensemble de straddles en un seul appel (volatilité bornée, 0.01 minimum par jambe)"""
+        times_to_expiry = np.asarray(times_to_expiry, dtype=np.float64)
+        live = times_to_expiry > 0
         volatility = max(MIN_VOLATILITY, min(MAX_VOLATILITY, volatility))
+        pricing = price_straddles(spot_price, strikes, volatility, times_to_expiry, interest_rate)
         
-        d1 = (np.log(spot_price / strike) + (interest_rate + 0.5 * volatility**2) * time_to_expiry) / (volatility * np.sqrt(time_to_expiry))
-        d2 = d1 - volatility * np.sqrt(time_to_expiry)
-        
-        def norm_cdf(x):
-            return 0.5 * (1 + np.sign(x) * np.sqrt(1 - np.exp(-2 * x**2 / np.pi)))
-        
-        call_price = spot_price * norm_cdf(d1) - strike * np.exp(-interest_rate * time_to_expiry) * norm_cdf(d2)
-        put_price = call_price - spot_price + strike * np.exp(-interest_rate * time_to_expiry)
-        
-        call_price = max(0.01, call_price)
-        put_price = max(0.01, put_price)
-        straddle_price = call_price + put_price
-        
-        intrinsic_value = max(0, abs(spot_price - strike))
-        time_value = straddle_price - intrinsic_value
-        
-        return {
-            'call_price': call_price,
-            'put_price': put_price,
-            'straddle_price': straddle_price,
-            'time_value': max(0, time_value),
-            'intrinsic_value': intrinsic_value
-        }
+        pricing['call_price'] = np.where(live, np.maximum(0.01, pricing['call_price']), pricing['call_price'])
+        pricing['put_price'] = np.where(live, np.maximum(0.01, pricing['put_price']), pricing['put_price'])
+        pricing['straddle_price'] = pricing['call_price'] + pricing['put_price']
+        pricing['time_value'] = np.where(
+            live, np.maximum(0, pricing['straddle_price'] - pricing['intrinsic_value']), 0
+        )
+        return pricing
+    
+    def reprice_open_positions(self, current_price, current_time, current_vol):
+        """Revalorise toutes les positions ouvertes en un seul appel de pricing"""
+        if not self.positions:
+            return []
+        
+        times_to_expiry = [
+            max(0.001, (position['expiry_time'] - current_time).total_seconds() / (365.25 * 24 * 3600))
+            for position in self.positions
+        ]
+        pricing = self.price_straddle_book(
+            current_price, [position['strike'] for position in self.positions], current_vol, times_to_expiry
+        )
+        columns = {key: values.tolist() for key, values in pricing.items()}
+        return [{key: values[j] for key, values in columns.items()} for j in range(len(self.positions))]
     
     def update_performance_stats(self, trade_result):
         """Met à jour les statistiques de performance"""
@@ -378,12 +380,13 @@ class UltraStraddleStrategy:
                 print(f"⚠️ Arrêt du trading: {stop_reason}")
                 break
             
-            # Gestion positions existantes
+            # Gestion positions existantes (revalorisées en un seul appel)
             positions_to_close = []
+            book_pricing = self.reprice_open_positions(current_price, current_time, current_vol)
             
             for j, position in enumerate(self.positions):
                 action, exit_info = self.advanced_position_management(
-                    position, current_price, current_time, current_vol
+                    position, current_price, current_time, current_vol, book_pricing[j]
                 )
                 
                 if action != 'HOLD':
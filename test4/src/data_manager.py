@@ -1,12 +1,19 @@
 # Module simple de récupération des données pour BTC
 
+import sys
 import ccxt
 import pandas as pd
 import numpy as np
 import talib
+from pathlib import Path
 
 from config import *
 
+# Téléchargeur concurrent et exchange local partagés avec le bot principal
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'straddle_trading_bot' / 'src'))
+from ohlcv_downloader import download_ohlcv
+from fake_exchange import create_exchange
+
 class DataManager:
     """Gestionnaire simple des données pour BTC"""
     
@@ -14,9 +21,9 @@ class DataManager:
         self.exchange = self._initialize_exchange()
         
     def _initialize_exchange(self):
-        """Initialise la connexion à Binance"""
+        """Initialise la connexion à l'exchange EXCHANGE_ID ('fake': exchange local)"""
         try:
-            return ccxt.binance({'enableRateLimit': True})
+            return create_exchange(EXCHANGE_ID, {'enableRateLimit': True})
         except Exception as e:
             print(f"Erreur connexion échange: {e}")
             return None
@@ -39,27 +46,8 @@ class DataManager:
                 start_ts = int(pd.to_datetime(START_DATE).timestamp() * 1000)
                 end_ts = int(pd.to_datetime(END_DATE).timestamp() * 1000)
                 
-                # Récupérer toutes les données pour la période
-                all_data = []
-                current_ts = start_ts
-                
-                while current_ts < end_ts:
-                    # Récupérer par chunks de 1000 (limite API)
-                    data_chunk = self.exchange.fetch_ohlcv(
-                        SYMBOL, TIMEFRAME, since=current_ts, limit=1000
-                    )
-                    
-                    if not data_chunk:
-                        break
-                        
-                    all_data.extend(data_chunk)
-                    current_ts = data_chunk[-1][0] + 1
-                    
-                    # Protection contre les boucles infinies
-                    if len(all_data) > 50000:  # Limite de sécurité
-                        break
-                
-                data = all_data
+                # Récupérer toute la période (chunks de 1000 en parallèle)
+                data, _ = download_ohlcv(self.exchange, SYMBOL, TIMEFRAME, start_ts, end_ts)
             else:
                 # Utiliser les X derniers jours
                 print(f"📅 Récupération des {DAYS_OF_DATA} derniers jours")
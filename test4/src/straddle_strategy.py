@@ -3,11 +3,17 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import sys
 import warnings
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
 from config import *
 
+# Noyau de pricing partagé avec straddle_trading_bot
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'straddle_trading_bot' / 'src'))
+from pricing import price_straddles
+
 class AdvancedStraddleStrategy:
     """
     Stratégie straddle avancée avec :
@@ -24,7 +30,7 @@ class AdvancedStraddleStrategy:
         
     def simulate_straddle_price(self, spot_price, strike, volatility, time_to_expiry, interest_rate=0.02):
         """
-        Simule le prix d'un straddle (call + put) selon Black-Scholes simplifié
+        Simule le prix d'un straddle (call + put) selon Black-Scholes
         
         Args:
             spot_price: Prix actuel du sous-jacent
@@ -36,42 +42,25 @@ class AdvancedStraddleStrategy:
         Returns:
             dict: Prix du call, put et straddle total
         """
-        if time_to_expiry <= 0:
-            # À l'expiration, valeur intrinsèque seulement
-            call_value = max(0, spot_price - strike)
-            put_value = max(0, strike - spot_price)
-            return {
-                'call_price': call_value,
-                'put_price': put_value,
-                'straddle_price': call_value + put_value,
-                'time_value': 0
-            }
-        
-        # Calcul Black-Scholes simplifié
-        d1 = (np.log(spot_price / strike) + (interest_rate + 0.5 * volatility**2) * time_to_expiry) / (volatility * np.sqrt(time_to_expiry))
-        d2 = d1 - volatility * np.sqrt(time_to_expiry)
-        
-        # Fonction de répartition normale
-        def norm_cdf(x):
-            return 0.5 * (1 + np.sign(x) * np.sqrt(1 - np.exp(-2 * x**2 / np.pi)))
-        
-        # Prix du call
-        call_price = spot_price * norm_cdf(d1) - strike * np.exp(-interest_rate * time_to_expiry) * norm_cdf(d2)
-        
-        # Prix du put (parité call-put)
-        put_price = call_price - spot_price + strike * np.exp(-interest_rate * time_to_expiry)
-        
-        straddle_price = call_price + put_price
-        intrinsic_value = max(0, abs(spot_price - strike))
-        time_value = straddle_price - intrinsic_value
+        pricing = self.price_straddle_book(spot_price, strike, volatility, time_to_expiry, interest_rate)
+        return {key: float(value) for key, value in pricing.items()}
+    
+    def price_straddle_book(self, spot_price, strikes, volatility, times_to_expiry, interest_rate=0.02):
+        """
+        Valorise un ensemble de straddles en un seul appel au noyau vectorisé
         
-        return {
-            'call_price': max(0.01, call_price),  # Prix minimum pour éviter 0
-            'put_price': max(0.01, put_price),
-            'straddle_price': max(0.02, straddle_price),
-            'time_value': max(0, time_value),
-            'intrinsic_value': intrinsic_value
-        }
+        Returns:
+            dict: Arrays de prix et greeks (prix minimum 0.01 par jambe, 0.02 le straddle)
+        """
+        times_to_expiry = np.asarray(times_to_expiry, dtype=np.float64)
+        live = times_to_expiry > 0
+        pricing = price_straddles(spot_price, strikes, volatility, times_to_expiry, interest_rate)
+        
+        # Prix minimum pour éviter 0 (avant expiration)
+        pricing['call_price'] = np.where(live, np.maximum(0.01, pricing['call_price']), pricing['call_price'])
+        pricing['put_price'] = np.where(live, np.maximum(0.01, pricing['put_price']), pricing['put_price'])
+        pricing['straddle_price'] = np.where(live, np.maximum(0.02, pricing['straddle_price']), pricing['straddle_price'])
+        return pricing
     
     def calculate_position_size(self, straddle_price):
         """